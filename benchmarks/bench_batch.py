@@ -0,0 +1,32 @@
+"""
+Time of running many small commands as single EXEC messages compared to one
+BATCH message.
+
+Usage: python benchmarks/bench_batch.py [--repeat N] [--output FILE]
+"""
+
+from common import example_client, measure, parser, report
+
+EXEC_ARGS = {"command": "increase", "value_change": 1}
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    with example_client(persistent=True) as client:
+        for size in [10, 100, 1000]:
+            batch = [EXEC_ARGS] * size
+
+            def single() -> None:
+                for exec_args in batch:
+                    client.execute(exec_args)
+
+            results[f"exec, items={size}"] = measure(single, args.repeat)
+            results[f"batch, items={size}"] = measure(
+                lambda: client.execute_many(batch), args.repeat
+            )
+    report("batch", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
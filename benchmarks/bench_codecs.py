@@ -0,0 +1,42 @@
+"""
+Size and throughput of the message codecs for small and large 'exec_args'.
+
+Usage: python benchmarks/bench_codecs.py [--repeat N] [--output FILE]
+"""
+
+from common import measure, parser, report
+from bgpy.core.message import Message, MessageType
+from bgpy.core.serialize import CODECS, serialize, deserialize
+from typing import Dict
+
+PAYLOADS: Dict[str, dict] = {
+    "small": {"command": "increase", "value_change": 10},
+    "large": {
+        "command": "store",
+        "values": [float(i) for i in range(100_000)],
+        "labels": [f"label-{i}" for i in range(10_000)],
+    },
+}
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    for payload, exec_args in PAYLOADS.items():
+        msg = Message(MessageType.EXEC, args=exec_args)
+        for codec in CODECS:
+            data = serialize(msg, codec)
+            encode = measure(lambda: serialize(msg, codec), args.repeat)
+            decode = measure(lambda: deserialize(data), args.repeat)
+            results[f"{payload}, {codec}"] = {
+                "bytes": len(data),
+                "encode_mean": encode["mean"],
+                "decode_mean": decode["mean"],
+                "encode_mb_per_s": len(data) / encode["mean"] / 1e6,
+                "decode_mb_per_s": len(data) / decode["mean"] / 1e6,
+            }
+    report("codecs", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
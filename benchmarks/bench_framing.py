@@ -0,0 +1,36 @@
+"""
+Latency of a message round trip with length-prefix framing compared to the
+fixed 'BUFFER_TIME' delays of bgpy <= 0.3.1.
+
+Usage: python benchmarks/bench_framing.py [--repeat N] [--output FILE]
+"""
+
+from common import echo_pair, measure, parser, report
+from bgpy.core.message import Message, MessageType
+
+LEGACY_BUFFER_TIME = 0.1
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    for label, buffer_time in [
+        ("length-prefix", 0.0),
+        ("legacy-sleep", LEGACY_BUFFER_TIME),
+    ]:
+        with echo_pair(buffer_time=buffer_time) as cs:
+            for await_response in [False, True]:
+
+                def round_trip() -> None:
+                    cs.send(
+                        Message(MessageType.EXEC, args={"value": 1}),
+                        await_response=await_response,
+                    )
+
+                case = f"{label}, await_response={await_response}"
+                results[case] = measure(round_trip, args.repeat)
+    report("framing", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Import time of the package ('python -X importtime') for a plain import, a
+client-only import, the server and the CLI, and the wall clock time of
+starting the CLI ('bgpy version').
+
+Usage: python benchmarks/bench_import.py [--repeat N] [--output FILE]
+"""
+
+from common import measure, parser, report
+from statistics import mean, median
+from subprocess import run
+from sys import executable
+
+STATEMENTS = {
+    "import bgpy": "import bgpy",
+    "client": "from bgpy import Client",
+    "server": "from bgpy import Server",
+    "cli": "import bgpy.cli",
+}
+
+
+def importtime(statement: str) -> list:
+    """
+    Modules imported by the statement with their indentation (depth) and
+    cumulative import time in microseconds.
+    """
+    lines = run(
+        [executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr.splitlines()
+    modules = []
+    for line in lines[1:]:
+        _, cumulative, name = line.split("|")
+        depth = len(name) - len(name.lstrip())
+        modules.append((depth, int(cumulative), name.strip()))
+    return modules
+
+
+STARTUP_MODULES = {name for _, _, name in importtime("pass")}
+
+
+def import_time(statement: str) -> float:
+    """
+    Cumulative import time in seconds of the top-level modules imported by
+    the statement, without the modules imported at interpreter startup.
+    """
+    modules = importtime(statement)
+    top = min(depth for depth, _, _ in modules)
+    return sum(
+        cumulative
+        for depth, cumulative, name in modules
+        if depth == top and name not in STARTUP_MODULES
+    ) / 1e6
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    for case, statement in STATEMENTS.items():
+        times = [import_time(statement) for _ in range(args.repeat)]
+        results[f"importtime, {case}"] = {
+            "repeat": args.repeat,
+            "mean": mean(times),
+            "median": median(times),
+            "min": min(times),
+            "max": max(times),
+        }
+    results["cli, bgpy version"] = measure(
+        lambda: run(["bgpy", "version"], capture_output=True, check=True),
+        args.repeat,
+    )
+    report("import", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Cost of logging per connection: Creating the 'Log' of a new connection and
+writing messages to a log file synchronously, asynchronously (background
+thread) and below the log level (not formatted).
+
+Usage: python benchmarks/bench_log.py [--repeat N] [--output FILE] 2> /dev/null
+
+The messages are also written to STDERR, which should be discarded.
+"""
+
+from common import measure, parser, report
+from bgpy.core.log import Log
+from bgpy.core.message import Message, MessageType
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+MESSAGES = 1000
+
+
+def log_messages(log: Log, level: str) -> None:
+    msg = Message(MessageType.EXEC, args={"value": 1})
+    write = getattr(log, level)
+    for _ in range(MESSAGES):
+        write("Received '%s'", msg)
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    with TemporaryDirectory() as tmp:
+        file = Path(tmp) / "bench.log"
+        results = {
+            "new log": measure(
+                lambda: Log("bench", "WARNING", "Server", file), args.repeat
+            ),
+            f"{MESSAGES} messages, below level": measure(
+                lambda: log_messages(Log("bench", "WARNING"), "info"),
+                args.repeat,
+            ),
+        }
+        for asynchronous in [False, True]:
+            log = Log("bench", "WARNING", file=file, asynchronous=asynchronous)
+            results[f"{MESSAGES} messages, async={asynchronous}"] = measure(
+                lambda: log_messages(log, "warning"), args.repeat
+            )
+    report("log", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Time of sending many EXEC messages with a persistent connection, one round
+trip per message, and with a pipelined connection.
+
+Usage: python benchmarks/bench_pipeline.py [--repeat N] [--output FILE]
+"""
+
+from common import example_client, measure, parser, report
+
+REQUESTS = 1000
+EXEC_ARGS = {"command": "increase", "value_change": 1}
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    with example_client(persistent=True) as client:
+
+        def sequential() -> None:
+            for _ in range(REQUESTS):
+                client.execute(EXEC_ARGS)
+
+        def pipelined() -> None:
+            with client.pipeline() as pipe:
+                futures = [pipe.execute(EXEC_ARGS) for _ in range(REQUESTS)]
+            for future in futures:
+                future.result()
+
+        results = {
+            f"sequential, requests={REQUESTS}": measure(
+                sequential, args.repeat
+            ),
+            f"pipelined, requests={REQUESTS}": measure(
+                pipelined, args.repeat
+            ),
+        }
+    report("pipeline", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Throughput of receiving messages from 100 B up to 100 MB, with the chunk
+size of bgpy <= 0.3.1 (2 KiB) and the default 'BUFFER_SIZE'.
+
+Usage: python benchmarks/bench_recv.py [--repeat N] [--output FILE]
+"""
+
+from common import echo_pair, measure, parser, report
+from bgpy.core.environment import BUFFER_SIZE
+from bgpy.core.message import Message, MessageType
+
+LEGACY_BUFFER_SIZE = 1024 * 2
+SIZES = [100, 10_000, 1_000_000, 100_000_000]
+MAX_BYTES = 1_000_000_000  # Limits the repetitions of large messages
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    for buffer_size in [LEGACY_BUFFER_SIZE, BUFFER_SIZE]:
+        with echo_pair(buffer_size=buffer_size, codec="pickle") as cs:
+            for size in SIZES:
+                msg = Message(MessageType.EXEC, args={"payload": bytes(size)})
+                repeat = max(2, min(args.repeat, MAX_BYTES // size))
+                stats = measure(lambda: cs.send(msg), repeat)
+                stats["mb_per_s"] = size / stats["mean"] / 1e6
+                results[f"buffer_size={buffer_size}, size={size}"] = stats
+    report("recv", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Round trip latency of 'Client.execute' with and without awaiting the
+response, throughput of tiny and large payloads and of concurrent clients
+on a local server.
+
+Usage: python benchmarks/bench_roundtrip.py [--repeat N] [--output FILE]
+"""
+
+from common import example_client, measure, parser, report
+from bgpy.client import Client
+from threading import Thread
+from typing import List, Tuple
+
+PAYLOADS = {"tiny": 100, "large": 10_000_000}
+CLIENTS = [1, 4, 16]
+REQUESTS = 50  # Requests per concurrent client
+INCREASE = {"command": "increase", "value_change": 1}
+GET = {"command": "get"}
+LATENCY: List[Tuple[bool, dict]] = [(False, INCREASE), (True, GET)]
+
+
+def latency(results: dict, repeat: int) -> None:
+    for persistent in [False, True]:
+        with example_client(persistent=persistent) as client:
+            for await_response, exec_args in LATENCY:
+                case = (
+                    f"latency, await_response={await_response}, "
+                    + f"persistent={persistent}"
+                )
+                results[case] = measure(
+                    lambda: client.execute(exec_args, await_response), repeat
+                )
+
+
+def payloads(results: dict, repeat: int) -> None:
+    with example_client(persistent=True) as client:
+        for name, size in PAYLOADS.items():
+            exec_args = dict(GET, payload=bytes(size))
+            stats = measure(lambda: client.execute(exec_args, True), repeat)
+            stats["bytes_per_second"] = size / stats["median"]
+            results[f"payload, {name}, size={size}"] = stats
+
+
+def concurrent(results: dict, repeat: int) -> None:
+    server = {"concurrency": "thread", "pool_size": max(CLIENTS)}
+    with example_client(server=server) as client:
+        for count in CLIENTS:
+            clients = [
+                Client(
+                    client.host,
+                    client.port,
+                    log_level="WARNING",
+                    persistent=True,
+                )
+                for _ in range(count)
+            ]
+
+            def requests(c: Client) -> None:
+                for _ in range(REQUESTS):
+                    c.execute(INCREASE)
+
+            def run() -> None:
+                threads = [Thread(target=requests, args=(c,)) for c in clients]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            stats = measure(run, repeat)
+            stats["requests_per_second"] = count * REQUESTS / stats["median"]
+            results[f"concurrent, clients={count}"] = stats
+            for c in clients:
+                c.close()
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results: dict = {}
+    latency(results, args.repeat)
+    payloads(results, args.repeat)
+    concurrent(results, args.repeat)
+    report("roundtrip", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
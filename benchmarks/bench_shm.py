@@ -0,0 +1,32 @@
+"""
+Throughput of echoing large messages from 1 MB up to 100 MB through the
+socket ('pickle' codec) and through shared memory ('shm' codec).
+
+Usage: python benchmarks/bench_shm.py [--repeat N] [--output FILE]
+"""
+
+from common import echo_pair, measure, parser, report
+from bgpy.core.message import Message, MessageType
+
+SIZES = [1_000_000, 10_000_000, 100_000_000]
+MAX_BYTES = 1_000_000_000  # Limits the repetitions of large messages
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    for codec in ["pickle", "shm"]:
+        with echo_pair(codec=codec) as cs:
+            for size in SIZES:
+                msg = Message(MessageType.EXEC, args={"payload": bytes(size)})
+                repeat = max(2, min(args.repeat, MAX_BYTES // size))
+                stats = measure(
+                    lambda: cs.send(msg, await_response=True), repeat
+                )
+                stats["mb_per_s"] = 2 * size / stats["mean"] / 1e6
+                results[f"codec={codec}, size={size}"] = stats
+    report("shm", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
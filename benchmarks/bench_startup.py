@@ -0,0 +1,44 @@
+"""
+Time until a new server is ready: A 'bgpy' CLI process started by
+'run_background', a forked child process and a daemon thread started by
+'start'.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--output FILE]
+"""
+
+from common import measure, parser, report
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+
+HOST = "127.0.0.1"
+
+
+def start_background() -> None:
+    server = Server(HOST, 0, log_level="WARNING")
+    server.run_background()
+    Client(HOST, server.port, log_level="WARNING").terminate()
+
+
+def start_handle(mode: str) -> None:
+    with Server(HOST, 0, log_level="WARNING").start(mode) as handle:
+        client = Client(HOST, handle.port, log_level="WARNING")
+        client.initialize(init_task, exec_task, exit_task)
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {
+        "run_background": measure(start_background, args.repeat),
+        "start, mode=process": measure(
+            lambda: start_handle("process"), args.repeat
+        ),
+        "start, mode=thread": measure(
+            lambda: start_handle("thread"), args.repeat
+        ),
+    }
+    report("startup", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
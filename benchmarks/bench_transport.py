@@ -0,0 +1,31 @@
+"""
+Latency of requests to a server on the same host over the TCP loopback and
+over a Unix domain socket.
+
+Usage: python benchmarks/bench_transport.py [--repeat N] [--output FILE]
+"""
+
+from common import example_client, measure, parser, report
+
+REQUESTS = 100
+EXEC_ARGS = {"command": "increase", "value_change": 1}
+
+
+def main() -> None:
+    args = parser(__doc__).parse_args()
+    results = {}
+    for transport, unix in [("tcp", False), ("unix", True)]:
+        for persistent in [False, True]:
+            with example_client(unix=unix, persistent=persistent) as client:
+
+                def requests() -> None:
+                    for _ in range(REQUESTS):
+                        client.execute(EXEC_ARGS)
+
+                case = f"{transport}, persistent={persistent}"
+                results[case] = measure(requests, args.repeat)
+    report("transport", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
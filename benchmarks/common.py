@@ -0,0 +1,131 @@
+"""Shared helpers for the bgpy benchmarks."""
+
+from bgpy.core.message import Message, MessageType
+from bgpy.core.sockets import ClientSocket
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.client import Client
+from bgpy.server import Server
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from json import dumps
+from os import getpid
+from pathlib import Path
+from platform import python_version
+from socket import socket
+from statistics import mean, median, stdev
+from tempfile import gettempdir
+from threading import Thread
+from time import perf_counter
+from typing import Callable, Iterator, Optional
+
+
+def parser(description: str) -> ArgumentParser:
+    """
+    Argument parser with the options shared by all benchmarks.
+    """
+    p = ArgumentParser(description=description)
+    p.add_argument(
+        "--repeat", type=int, default=20, help="Repetitions per case"
+    )
+    p.add_argument(
+        "--output", type=Path, default=None, help="Write results as JSON"
+    )
+    return p
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> dict:
+    """
+    Time repeated calls of a function.
+
+    Returns
+    -------
+    dict
+        Statistics of the wall clock times in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        times.append(perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "mean": mean(times),
+        "median": median(times),
+        "min": min(times),
+        "max": max(times),
+        "stdev": stdev(times) if repeat > 1 else 0.0,
+    }
+
+
+def report(name: str, results: dict, output: Optional[Path]) -> dict:
+    """
+    Print the results and optionally write them to a JSON file.
+    """
+    for case, stats in results.items():
+        line = ", ".join(
+            f"{k}={v:.6g}" if isinstance(v, float) else f"{k}={v}"
+            for k, v in stats.items()
+        )
+        print(f"{name} [{case}] {line}")
+    document = {
+        "benchmark": name,
+        "python": python_version(),
+        "results": results,
+    }
+    if output is not None:
+        output.write_text(dumps(document, indent=2))
+    return document
+
+
+@contextmanager
+def echo_pair(**kwargs) -> Iterator[ClientSocket]:
+    """
+    Connected client socket with a remote socket in a thread, which confirms
+    every message and responds with the arguments if a response is awaited.
+    Keyword arguments are passed to both client sockets.
+    """
+    listener = socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+
+    def serve() -> None:
+        sock, _ = listener.accept()
+        with ClientSocket(sock=sock, **kwargs) as remote:
+            while True:
+                msg = remote.recv()
+                if msg is None:
+                    return
+                args = msg.get_args()
+                if args.get("await_response"):
+                    remote.send(Message(MessageType.OK, args=args))
+
+    thread = Thread(target=serve, daemon=True)
+    thread.start()
+    with ClientSocket(**kwargs) as cs:
+        cs.connect(*listener.getsockname())
+        yield cs
+    thread.join()
+    listener.close()
+
+
+@contextmanager
+def example_client(
+    unix: bool = False, server: Optional[dict] = None, **kwargs
+) -> Iterator[Client]:
+    """
+    Client of a server running the example tasks in a thread, which is
+    terminated afterwards. The server listens on the TCP loopback or, if
+    'unix' is set, on a Unix domain socket file. The dict 'server' is passed
+    to the server and further keyword arguments to the client.
+    """
+    host = "127.0.0.1"
+    if unix:
+        host = f"unix://{gettempdir()}/bgpy-bench-{getpid()}.sock"
+    handle = Server(host, 0, log_level="WARNING", **(server or {})).start()
+    with Client(host, handle.port, log_level="WARNING", **kwargs) as client:
+        client.initialize(init_task, exec_task, exit_task)
+        yield client
+        client.terminate()
+    handle.join()
@@ -0,0 +1,134 @@
+"""
+Run the benchmarks and write all results to one JSON document with the
+version of bgpy, the git commit, Python and the platform, so the results of
+releases can be compared. With a baseline document, the cases which are
+slower than the baseline by more than the threshold are reported as
+regressions and the exit code is 1.
+
+Usage: python benchmarks/suite.py [--repeat N] [--output FILE]
+           [--only NAME ...] [--baseline FILE] [--threshold RATIO]
+"""
+
+from common import parser
+from datetime import datetime, timezone
+from json import dumps, loads
+from pathlib import Path
+from platform import platform, python_version
+from subprocess import DEVNULL, run
+from sys import executable, exit
+from tempfile import TemporaryDirectory
+from typing import List, Optional
+
+try:
+    from importlib.metadata import version as get_version
+except ImportError:  # pragma: no cover
+    from importlib_metadata import version as get_version  # type: ignore
+
+BENCHMARKS = Path(__file__).parent
+THRESHOLD = 0.2  # Relative slowdown reported as regression
+TIME_KEYS = ("median", "encode_mean", "decode_mean")  # Lower is better
+
+
+def names() -> List[str]:
+    """
+    Names of the benchmarks ('bench_<name>.py').
+    """
+    return sorted(p.stem[len("bench_"):] for p in BENCHMARKS.glob("bench_*"))
+
+
+def run_benchmark(name: str, repeat: int, tmp: Path) -> dict:
+    """
+    Run a benchmark in its own interpreter and read its results.
+    """
+    output = tmp / f"{name}.json"
+    run(
+        [
+            executable,
+            str(BENCHMARKS / f"bench_{name}.py"),
+            f"--repeat={repeat}",
+            f"--output={output}",
+        ],
+        stderr=DEVNULL,  # Logs of the servers
+        check=True,
+    )
+    return loads(output.read_text())["results"]
+
+
+def commit() -> Optional[str]:
+    res = run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=BENCHMARKS,
+        capture_output=True,
+        text=True,
+    )
+    return res.stdout.strip() if res.returncode == 0 else None
+
+
+def regressions(document: dict, baseline: dict, threshold: float) -> list:
+    """
+    Cases, which are slower than in the baseline by more than the threshold.
+
+    Returns
+    -------
+    list
+        Tuples of benchmark, case, key and the ratio to the baseline.
+    """
+    slower = []
+    for name, results in document["benchmarks"].items():
+        base_results = baseline.get("benchmarks", {}).get(name, {})
+        for case, stats in results.items():
+            base = base_results.get(case, {})
+            for key in TIME_KEYS:
+                if key in stats and base.get(key):
+                    ratio = stats[key] / base[key]
+                    if ratio > 1 + threshold:
+                        slower.append((name, case, key, ratio))
+    return slower
+
+
+def main() -> None:
+    p = parser(__doc__)
+    p.add_argument(
+        "--only", nargs="+", choices=names(), help="Benchmarks to run"
+    )
+    p.add_argument(
+        "--baseline", type=Path, default=None, help="Results to compare to"
+    )
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=THRESHOLD,
+        help="Relative slowdown reported as regression",
+    )
+    args = p.parse_args()
+    document = {
+        "bgpy": get_version("bgpy"),
+        "commit": commit(),
+        "python": python_version(),
+        "platform": platform(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "repeat": args.repeat,
+        "benchmarks": {},
+    }
+    with TemporaryDirectory() as tmp:
+        for name in args.only or names():
+            document["benchmarks"][name] = run_benchmark(
+                name, args.repeat, Path(tmp)
+            )
+    if args.output is not None:
+        args.output.write_text(dumps(document, indent=2))
+    if args.baseline is None:
+        return
+    baseline = loads(args.baseline.read_text())
+    slower = regressions(document, baseline, args.threshold)
+    for name, case, key, ratio in slower:
+        print(f"Regression: {name} [{case}] {key} x{ratio:.2f}")
+    print(
+        f"{len(slower)} regressions compared to bgpy {baseline.get('bgpy')} "
+        + f"({baseline.get('commit')})"
+    )
+    exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
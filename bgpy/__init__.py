@@ -1,7 +1,47 @@
 """Top-level package for bgpy."""
 
-from .client import Client
-from .server import Server, respond
-from .core.token import token_create
+from importlib import import_module
+from sys import version_info
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["Client", "Server", "respond", "token_create"]
+__all__ = [
+    "Client",
+    "Server",
+    "respond",
+    "token_create",
+]
+if version_info >= (3, 7):  # The module 'bgpy.aio' requires 'asyncio.run'
+    __all__ += ["AsyncClient", "AsyncServer"]
+
+# Modules of the public names, which are imported on first access, so a
+# client does not import the server, asyncio or the CLI dependencies
+_MODULES = {
+    "Client": ".client",
+    "Server": ".server",
+    "respond": ".server",
+    "AsyncClient": ".aio",
+    "AsyncServer": ".aio",
+    "token_create": ".core.token",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
+
+
+if TYPE_CHECKING or version_info < (3, 7):  # No module '__getattr__'
+    from .client import Client
+    from .server import Server, respond
+    from .core.token import token_create
+if TYPE_CHECKING:
+    from .aio import AsyncClient, AsyncServer
@@ -0,0 +1,466 @@
+from .core.environment import BACKLOG_SIZE, LOG_LEVEL, CODEC
+from .core.log import Log
+from .core.message import Message, MessageType
+from .core.serialize import negotiate_codec
+from .core.sockets import ServerSocket
+from .core.streams import StreamSocket
+from .core.tasks import load_tasks
+from .core.token import token_getenv
+from asyncio import (
+    AbstractServer,
+    Event,
+    run,
+    start_server,
+    start_unix_server,
+)
+from inspect import isawaitable
+from pathlib import Path
+from typing import Any, Callable, Optional, Set
+
+
+async def _call(task: Callable, *args) -> Any:
+    result = task(*args)
+    if isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncServer:
+    """
+    Server based on asyncio streams, which receives INIT, EXEC and EXIT
+    messages from clients and responds with messages of type OK or ERROR.
+
+    The tasks may be coroutine functions. Every connection is served by its
+    own coroutine, so many concurrent connections can be handled by one
+    process as long as the tasks do not block the event loop. The calls of
+    coroutine tasks interleave at their 'await' points and all of them
+    operate on the same 'init_args'; the return value of the last completed
+    'exec_task' call becomes the new state.
+    """
+
+    __slots__ = [
+        "host",
+        "port",
+        "token",
+        "log_level",
+        "log_file",
+        "init_file",
+        "backlog",
+        "log",
+        "_token",
+        "_initialized",
+        "_exited",
+        "_connections",
+        "_init_task",
+        "_exec_task",
+        "_exit_task",
+        "_init_args",
+    ]
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        token: Optional[str] = None,
+        log_level: str = LOG_LEVEL,
+        log_file: Optional[Path] = None,
+        init_file: Optional[Path] = None,
+        backlog: int = BACKLOG_SIZE,
+    ) -> None:
+        """
+        Initializes a object of type 'AsyncServer'.
+
+        Parameters
+        ----------
+        host : str
+            Address of the host to run the server on, or 'unix:///path' to
+            listen on a Unix domain socket file.
+        port : int
+            Port where the server will listen.
+        token : str, optional
+            Token to check authentification of the client, by default None
+            (the token is read from the environment).
+        log_level : str, optional
+            The level to log on (DEBUG, INFO, WARNING, ERROR or CRITICAL),
+            by default LOG_LEVEL.
+        log_file : Optional[Path], optional
+            Path to the file for writing the logs, by default None.
+        init_file : Optional[Path], optional
+            Path to a file containing the 'init_task', 'exec_task' and
+            'exit_task' for the server initialization, by default None.
+        backlog : int, optional
+            Size of the backlog/queue of clients on the server,
+            by default BACKLOG_SIZE.
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+        self.log_level = log_level
+        self.log_file = log_file
+        self.init_file = init_file
+        self.backlog = backlog
+        self.log = Log(__name__, log_level, "Server", log_file, True)
+
+    def __repr__(self) -> str:
+        return (
+            f"AsyncServer({self.host!r}, {self.port!r}, "
+            + f"{self.log_level!r}, {self.log_file!r},"
+            + f"{self.token!r}, {self.init_file!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            "Asynchronous server with context for running at "
+            + f"'{self.host}:{self.port}'"
+        )
+
+    def run(self) -> None:
+        """
+        Run the server in a new event loop until an EXIT message is received.
+        """
+        run(self.serve())
+
+    async def serve(self, ready: Optional[Event] = None) -> None:
+        """
+        Serve clients in the running event loop until an EXIT message is
+        received.
+
+        Parameters
+        ----------
+        ready : Optional[Event], optional
+            Event, which is set as soon as the server is listening and, if an
+            'init_file' is set, initialized. With port 0 the port chosen by
+            the system is set before, by default None.
+        """
+        self._initialized = False
+        self._exited = Event()
+        self._connections: Set[StreamSocket] = set()
+        self._token = self.token if self.token else token_getenv()
+
+        # Initialize from file
+        if self.init_file is not None:
+            try:
+                self.log.info(f"Loading tasks from '{self.init_file}'")
+                tasks = load_tasks(self.init_file)
+            except Exception as e:
+                self.log.exception("Unable to load tasks from file")
+                raise e
+            self._init_task, self._exec_task, self._exit_task = tasks
+            self.log.info("Executing 'init_task'")
+            self._init_args = await _call(self._init_task)
+            self.log.info("Initialization successful")
+            self._initialized = True
+
+        with ServerSocket(
+            self.host,
+            self.port,
+            backlog=self.backlog,
+            log_level=self.log_level,
+            log_file=self.log_file,
+        ) as ss:
+            start = start_server if ss.path is None else start_unix_server
+            server: AbstractServer = await start(
+                self._serve_connection, sock=ss.sock, backlog=self.backlog
+            )
+            if self._token is not None:
+                self.log.info("Authentication token is set")
+            if ss.path is None:
+                self.port = ss.sock.getsockname()[1]
+            if ready is not None:
+                ready.set()
+            try:
+                await self._exited.wait()
+            finally:
+                server.close()
+                for stream in list(self._connections):
+                    self._connections.discard(stream)
+                    await stream.close()
+                await server.wait_closed()
+                self.log.info("Server closed")
+
+    async def _serve_connection(self, reader, writer) -> None:
+        stream = StreamSocket(reader, writer, self.log)
+        self._connections.add(stream)
+        authenticated = False
+        try:
+            while not self._exited.is_set():
+                msg = await stream.recv()
+                if msg is None:
+                    break
+                authenticated = await self._handle(stream, msg, authenticated)
+        except Exception:
+            self.log.exception("Handling message failed, closing connection")
+        finally:
+            if stream in self._connections:
+                self._connections.discard(stream)
+                await stream.close()
+
+    async def _handle(
+        self, stream: StreamSocket, msg: Message, authenticated: bool
+    ) -> bool:
+
+        # Message type: AUTH
+        if msg.type is MessageType.AUTH:
+            token = msg.get_args()["token"]
+            if token == self._token or self._token is None:
+                auth_msg = "Authentication successful"
+                codec = negotiate_codec(msg.get_args().get("codecs", []))
+                self.log.info("%s, codec '%s'", auth_msg, codec)
+                await respond(
+                    stream, {"message": f"{auth_msg}.", "codec": codec}
+                )
+                stream.codec = codec
+                return True
+            auth_msg = "Invalid client authentication"
+            self.log.warning(auth_msg)
+            await respond(stream, {"message": f"{auth_msg}."}, error=True)
+            return False
+
+        if not authenticated:
+            self.log.warning(
+                "Unauthorized access attempt of type " + f"'{msg.type.name}'"
+            )
+            return False
+
+        # Message type: INIT
+        if msg.type is MessageType.INIT:
+            await self._handle_init(stream, msg)
+
+        # Message type: EXIT
+        elif msg.type is MessageType.EXIT:
+            if self._initialized:
+                self.log.info("Executing 'exit_task'")
+                await _call(
+                    self._exit_task, stream, self._init_args, msg.get_args()
+                )
+            self._exited.set()
+
+        elif msg.type in (
+            MessageType.STATS,
+            MessageType.PROFILE,
+            MessageType.JOB,
+        ):
+            await self._handle_unsupported(stream, msg)
+
+        elif not self._initialized:
+            self.log.warning("Not yet initialized")
+
+        # Message type: EXEC
+        elif msg.type is MessageType.EXEC:
+            self.log.info("Executing 'exec_task'")
+            self._init_args = await _call(
+                self._exec_task, stream, self._init_args, msg.get_args()
+            )
+
+        # Other message types (BATCH, STREAM)
+        else:
+            await self._handle_unsupported(stream, msg)
+        return True
+
+    async def _handle_unsupported(
+        self, stream: StreamSocket, msg: Message
+    ) -> None:
+        unsupported_msg = f"Message type '{msg.type.name}' is not supported"
+        self.log.warning(unsupported_msg)
+        error_msg = {"message": f"{unsupported_msg}."}
+        if msg.type in (
+            MessageType.BATCH,
+            MessageType.STATS,
+            MessageType.PROFILE,
+            MessageType.JOB,
+        ):
+            await respond(stream, error_msg, error=True)
+        elif msg.type is MessageType.STREAM:
+            await stream.send_frame(Message(MessageType.ERROR, args=error_msg))
+
+    async def _handle_init(self, stream: StreamSocket, msg: Message) -> None:
+        if self._initialized:
+            init_msg = "Already initialized"
+            self.log.warning(init_msg)
+            await respond(stream, {"message": f"{init_msg}."}, error=True)
+            return
+
+        # Set initialized before the first await to avoid second initialization
+        self._initialized = True
+        tasks = msg.get_args()
+        self._init_task = tasks["init_task"]
+        self._exec_task = tasks["exec_task"]
+        self._exit_task = tasks["exit_task"]
+        self.log.info("Executing 'init_task'")
+        self._init_args = await _call(self._init_task)
+        init_msg = "Initialization successful"
+        self.log.info(init_msg)
+        await respond(stream, {"message": f"{init_msg}."})
+
+
+class AsyncClient:
+    """
+    Asynchronous client to send INIT, EXEC and EXIT messages to the server.
+    """
+
+    __slots__ = [
+        "host",
+        "port",
+        "token",
+        "log_level",
+        "log_file",
+        "codec",
+        "log",
+    ]
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        token: Optional[str] = None,
+        log_level: str = LOG_LEVEL,
+        log_file: Optional[Path] = None,
+        codec: str = CODEC,
+    ) -> None:
+        """
+        Initializes an object of type 'AsyncClient'.
+
+        Parameters
+        ----------
+        host : str
+            Address the host where the server runs on, or 'unix:///path' of
+            the socket file of a server on the same host.
+        port : int
+            Port where the server is listening to.
+        token : str, optional
+            Token to authenticate to the server, by default None.
+        log_level : str, optional
+            The level to log on (DEBUG, INFO, WARNING, ERROR or CRITICAL),
+            by default LOG_LEVEL.
+        log_file : Optional[Path], optional
+            Path to the file for writing the logs, by default None.
+        codec : str, optional
+            Codec to serialize the messages ('pickle', 'json' or 'base64'),
+            which is offered to the server in the AUTH handshake,
+            by default CODEC.
+        """
+        self.host = host
+        self.port = port
+        self.token = token
+        self.log_level = log_level
+        self.log_file = log_file
+        self.codec = codec
+        self.log = Log(__name__, log_level, "Client", log_file)
+
+    def __repr__(self) -> str:
+        return (
+            f"AsyncClient({self.host!r}, {self.port!r}, "
+            + f"{self.log_level!r}, {self.log_file!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            "Asynchronous client context for connecting to server at "
+            + f"'{self.host}:{self.port}'"
+        )
+
+    async def initialize(
+        self,
+        init_task: Callable,
+        exec_task: Callable,
+        exit_task: Callable,
+    ) -> Optional[dict]:
+        """
+        Send the tasks to the server in an INIT message (see
+        'Client.initialize'). The tasks may be coroutine functions.
+
+        Returns
+        -------
+        Optional[dict]
+            Response of the server.
+        """
+        msg = Message(
+            MessageType.INIT,
+            args={
+                "init_task": init_task,
+                "exec_task": exec_task,
+                "exit_task": exit_task,
+            },
+        )
+        res = await self._request(msg, await_response=True)
+        return None if res is None else res.get_args()
+
+    async def execute(
+        self, exec_args: dict, await_response: bool = False
+    ) -> Optional[dict]:
+        """
+        Send an EXEC message with custom arguments, which are passed to the
+        'exec_task' (see 'Client.execute').
+
+        Returns
+        -------
+        Optional[dict]
+            Response of the server.
+        """
+        msg = Message(MessageType.EXEC, args=exec_args)
+        res = await self._request(msg, await_response=await_response)
+        return None if res is None else res.get_args()
+
+    async def terminate(
+        self, exit_args: dict = {}, await_response: bool = False
+    ) -> Optional[dict]:
+        """
+        Send an EXIT message to execute the 'exit_task' and to stop the
+        server (see 'Client.terminate').
+
+        Returns
+        -------
+        Optional[dict]
+            Response of the server.
+        """
+        msg = Message(MessageType.EXIT, args=exit_args)
+        res = await self._request(msg, await_response=await_response)
+        return None if res is None else res.get_args()
+
+    async def _request(
+        self, msg: Message, await_response: bool = False
+    ) -> Optional[Message]:
+        stream = await StreamSocket.connect(self.host, self.port, self.log)
+        async with stream:
+            auth = Message(
+                MessageType.AUTH,
+                args={"token": self.token, "codecs": [self.codec]},
+            )
+            res_auth = await stream.send(auth, await_response=True)
+            if res_auth is None or res_auth.type is not MessageType.OK:
+                return res_auth
+            stream.codec = res_auth.get_args().get("codec", stream.codec)
+            return await stream.send(msg, await_response=await_response)
+
+
+async def respond(
+    stream: StreamSocket,
+    response: dict,
+    error: bool = False,
+) -> Optional[Message]:
+    """
+    Respond to the client
+
+    Coroutine to send a message OK or ERROR with custom arguments from a task
+    of an 'AsyncServer' to the client (see 'bgpy.server.respond').
+
+    Parameters
+    ----------
+    stream : StreamSocket
+        Stream socket, which was set up by the server to handle the
+        communication with the client.
+    response : dict
+        Response to send to the client.
+    error : bool
+        Respond with a Message of type ERROR instead of OK, default is False.
+
+    Returns
+    -------
+    Optional[Message]
+        Response of the client.
+    """
+    if error:
+        msg = Message(MessageType.ERROR, args=response)
+    else:
+        msg = Message(MessageType.OK, args=response)
+    return await stream.send(msg)
@@ -1,7 +1,18 @@
-from .server import Server
-from .client import Client
+from .core.environment import (
+    BUFFER_SIZE,
+    JOB_LIMIT,
+    JOB_TTL,
+    JOB_WORKERS,
+    LOG_ASYNC,
+    LOG_BACKUP_COUNT,
+    LOG_COMPRESS,
+    LOG_MAX_BYTES,
+    SCHEDULER_CLIENT_QUEUE_SIZE,
+    SCHEDULER_QUEUE_SIZE,
+    SERVER_WORKERS,
+)
 from .core.token import token_getenv, token_setenv
-from typer import Typer, echo, Abort, Argument, Option, prompt
+from typer import Typer, echo, Abort, Argument, BadParameter, Option, prompt
 from typing import Optional
 from pathlib import Path
 
@@ -15,8 +26,14 @@ app = Typer(add_completion=False)
 
 @app.command("server")
 def run_server(
-    host: str = Argument(..., help="Host address to run the server on"),
-    port: int = Argument(..., help="Port where the server should listen to"),
+    host: str = Argument(
+        ...,
+        help="Host address to run the server on (or unix:///path)",
+    ),
+    port: Optional[int] = Argument(
+        None,
+        help="Port where the server should listen to (not for unix://)",
+    ),
     token: bool = Option(
         False,
         "--token",
@@ -32,6 +49,34 @@ def run_server(
     log_file: Optional[Path] = Option(
         None, "--log-file", "-f", help="Path to a log file"
     ),
+    log_async: bool = Option(
+        LOG_ASYNC,
+        "--log-async",
+        help="Write the logs from a background thread",
+    ),
+    log_max_bytes: int = Option(
+        LOG_MAX_BYTES,
+        "--log-max-bytes",
+        help="Rotate the log file at this size in bytes (0: never)",
+    ),
+    log_backup_count: int = Option(
+        LOG_BACKUP_COUNT,
+        "--log-backup-count",
+        help="Number of rotated log files to keep",
+    ),
+    log_when: Optional[str] = Option(
+        None,
+        "--log-when",
+        help=(
+            "Rotate the log file at time intervals instead of a size "
+            + "(S, M, H, D, midnight or W0-W6)"
+        ),
+    ),
+    log_compress: bool = Option(
+        LOG_COMPRESS,
+        "--log-compress",
+        help="Compress the rotated log files with gzip",
+    ),
     init_file: Optional[Path] = Option(
         None,
         "--init-file",
@@ -41,6 +86,94 @@ def run_server(
             + "and 'exit_task' for the server initialization"
         ),
     ),
+    concurrency: str = Option(
+        "none",
+        "--concurrency",
+        "-c",
+        help=(
+            "Handle messages in the main loop (none), a pool of threads "
+            + "(thread) or run the 'exec_task' in a pool of processes "
+            + "(process)"
+        ),
+    ),
+    pool_size: int = Option(
+        4, "--pool-size", "-p", help="Number of workers in the pool"
+    ),
+    state: str = Option(
+        "shared",
+        "--state",
+        "-s",
+        help=(
+            "Policy for the 'init_args' of concurrent workers: Shared by all "
+            + "workers and guarded by a lock (shared) or a copy per worker "
+            + "(worker)"
+        ),
+    ),
+    buffer_size: int = Option(
+        BUFFER_SIZE,
+        "--buffer-size",
+        "-b",
+        help="Maximum number of bytes read from the network buffer at once",
+    ),
+    workers: int = Option(
+        SERVER_WORKERS,
+        "--workers",
+        "-w",
+        help=(
+            "Number of processes forked after the initialization, which "
+            + "accept connections on the same socket"
+        ),
+    ),
+    metrics_port: Optional[int] = Option(
+        None,
+        "--metrics-port",
+        "-m",
+        help="Serve the metrics for Prometheus via HTTP on this port",
+    ),
+    profile_file: Optional[Path] = Option(
+        None,
+        "--profile-file",
+        help=(
+            "File for the profile statistics of the 'exec_task' calls, "
+            + "profiling is toggled by the signal SIGUSR1"
+        ),
+    ),
+    trace_file: Optional[Path] = Option(
+        None,
+        "--trace-file",
+        help="File to append the traces of traced requests to (JSON lines)",
+    ),
+    job_workers: int = Option(
+        JOB_WORKERS,
+        "--job-workers",
+        help="Number of threads running the submitted jobs",
+    ),
+    job_limit: int = Option(
+        JOB_LIMIT,
+        "--job-limit",
+        help="Maximum number of pending and completed jobs kept",
+    ),
+    job_ttl: float = Option(
+        JOB_TTL,
+        "--job-ttl",
+        help="Seconds for which the result of a completed job is kept",
+    ),
+    queue_size: int = Option(
+        SCHEDULER_QUEUE_SIZE,
+        "--queue-size",
+        help="Maximum number of requests waiting for the exec_task",
+    ),
+    client_queue_size: int = Option(
+        SCHEDULER_CLIENT_QUEUE_SIZE,
+        "--client-queue-size",
+        help="Maximum number of pending requests of a client",
+    ),
+    ready_fd: Optional[int] = Option(
+        None,
+        "--ready-fd",
+        help="File descriptor to write the ports to when ready",
+        hidden=True,
+    ),
 ) -> None:
     """
     Start a bgpy server.
@@ -58,24 +191,53 @@ def run_server(
         log_file = None
     if str(init_file) == "None":
         init_file = None
+    if str(profile_file) == "None":
+        profile_file = None
+    if str(trace_file) == "None":
+        trace_file = None
+    from .core.log import LogRotation
+    from .server import Server  # Imported on use, see 'bgpy.__init__'
+
+    log_rotation = LogRotation(
+        log_max_bytes, log_backup_count, log_when, log_compress
+    )
     server = Server(
         host=host,
-        port=int(port),
+        port=_port(host, port),
         log_level=log_level,
         log_file=log_file,
+        log_async=log_async,
+        log_rotation=log_rotation,
         init_file=init_file,
+        concurrency=concurrency,
+        pool_size=pool_size,
+        state=state,
+        buffer_size=buffer_size,
+        workers=workers,
+        metrics_port=metrics_port,
+        profile_file=profile_file,
+        trace_file=trace_file,
+        job_workers=job_workers,
+        job_limit=job_limit,
+        job_ttl=job_ttl,
+        queue_size=queue_size,
+        client_queue_size=client_queue_size,
     )
     try:
-        server.run()
+        server.run(ready_fd=ready_fd)
     except OSError as e:
         echo(e)
-        Abort()
+        raise Abort()
 
 
 @app.command("terminate")
 def terminate_server(
-    host: str = Argument(..., help="Host address of the server"),
-    port: int = Argument(..., help="Port where the server is listening"),
+    host: str = Argument(
+        ..., help="Host address of the server (or unix:///path)"
+    ),
+    port: Optional[int] = Argument(
+        None, help="Port where the server is listening (not for unix://)"
+    ),
     token: bool = Option(
         False,
         "--token",
@@ -105,9 +267,11 @@ def terminate_server(
         TOKEN = token_getenv()
     if str(log_file) == "None":
         log_file = None
+    from .client import Client  # Imported on use, see 'bgpy.__init__'
+
     client = Client(
         host=host,
-        port=int(port),
+        port=_port(host, port),
         token=TOKEN,
         log_level=log_level,
         log_file=log_file,
@@ -119,6 +283,20 @@ def terminate_server(
         Abort()
 
 
+def _port(host: str, port: Optional[int]) -> int:
+
+    # The port is required for TCP hosts, but not for Unix domain sockets
+    from .core.sockets import unix_path
+
+    if port is None:
+        if unix_path(host) is None:
+            raise BadParameter(
+                "Missing port for a TCP host", param_hint="'PORT'"
+            )
+        return 0
+    return int(port)
+
+
 @app.command("version")
 def version_info():
     """
@@ -1,9 +1,35 @@
-from .core.environment import STARTUP_TIME, LOG_LEVEL
+from .core.environment import (
+    STARTUP_TIME,
+    LOG_LEVEL,
+    POOL_SIZE,
+    CODEC,
+    BUFFER_SIZE,
+    PROFILE_LIMIT,
+    PROFILE_SORT,
+    JOB_POLL_INTERVAL,
+    JOB_POLL_MAX_INTERVAL,
+)
+from .core.jobs import JOB_PENDING
 from .core.message import Message, MessageType
+from .core.pool import ConnectionPool
+from .core.serialize import SharedMemoryCodec
 from .core.sockets import ClientSocket
-from time import sleep
-from typing import Callable, Optional
+from .core.tracing import Trace, Tracer, span
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
 from pathlib import Path
+from time import monotonic, sleep
+from uuid import uuid4
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .core.pipeline import Pipeline
 
 
 class Client:
@@ -11,7 +37,18 @@ class Client:
     Client to send INIT, EXEC and EXIT messages to the the server.
     """
 
-    __slots__ = ["host", "port", "token", "log_level", "log_file"]
+    __slots__ = [
+        "host",
+        "port",
+        "token",
+        "log_level",
+        "log_file",
+        "codec",
+        "buffer_size",
+        "pool",
+        "tracer",
+        "id",
+    ]
 
     def __init__(
         self,
@@ -20,6 +57,11 @@ class Client:
         token: Optional[str] = None,
         log_level: str = LOG_LEVEL,
         log_file: Optional[Path] = None,
+        persistent: bool = False,
+        pool_size: int = POOL_SIZE,
+        codec: str = CODEC,
+        buffer_size: int = BUFFER_SIZE,
+        tracer: Optional[Tracer] = None,
     ) -> None:
         """
         Initializes an object of type 'Client'.
@@ -27,7 +69,8 @@ class Client:
         Parameters
         ----------
         host : str
-            Address the host where the server runs on.
+            Address the host where the server runs on, or 'unix:///path' of
+            the socket file of a server on the same host.
         port : int
             Port where the server is listening to.
         token : str, optional
@@ -37,12 +80,38 @@ class Client:
             by default LOG_LEVEL.
         log_file : Optional[Path], optional
             Path to the file for writing the logs, by default None.
+        persistent : bool, optional
+            Keep the authenticated connections open and reuse them for
+            further requests instead of connecting for every request,
+            by default False.
+        pool_size : int, optional
+            Maximum number of persistent connections, which can be used by
+            different threads at the same time, by default POOL_SIZE.
+        codec : str, optional
+            Codec to serialize the messages ('pickle', 'json', 'shm' or
+            'base64'), which is offered to the server in the AUTH handshake.
+            With 'shm', large messages are passed through shared memory if
+            the server runs on the same host, otherwise 'pickle' is used,
+            by default CODEC.
+        buffer_size : int, optional
+            Maximum number of bytes read from the network buffer at once,
+            by default BUFFER_SIZE.
+        tracer : Optional[Tracer], optional
+            Trace every request and collect the traces with the spans of the
+            client and the server in the tracer, which exports them as JSON
+            lines or Chrome trace events. Requires a server supporting
+            traces, by default None.
         """
         self.host = host
         self.port = port
         self.token = token
         self.log_level = log_level
         self.log_file = log_file
+        self.codec = codec
+        self.buffer_size = buffer_size
+        self.pool = ConnectionPool(pool_size) if persistent else None
+        self.tracer = tracer
+        self.id = uuid4().hex  # Key of the client in the queue of the server
 
     def __repr__(self) -> str:
         return (
@@ -56,6 +125,20 @@ class Client:
             + f"'{self.host}:{self.port}'"
         )
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Close the persistent connections of the client.
+        """
+        if self.pool is not None:
+            self.pool.close()
+
     def initialize(
         self,
         init_task: Callable,
@@ -93,32 +176,27 @@ class Client:
         Optional[dict]
             Response of the server.
         """
-        with ClientSocket(
-            log_level=self.log_level, log_file=self.log_file
-        ) as cs:
-            cs.connect(self.host, self.port)
-            res_auth = self._authenticate(cs)
-            if res_auth.type is MessageType.OK:
-                msg = Message(
-                    MessageType.INIT,
-                    args={
-                        "init_task": init_task,
-                        "exec_task": exec_task,
-                        "exit_task": exit_task,
-                    },
-                )
-                res = cs.send(msg, await_response=True)
-            else:
-                res = res_auth
-            if res is not None:
-                return res.get_args()
-            else:
-                return None
+        msg = Message(
+            MessageType.INIT,
+            args={
+                "init_task": init_task,
+                "exec_task": exec_task,
+                "exit_task": exit_task,
+            },
+        )
+        res = self._request(msg, await_response=True)
+        if res is not None:
+            return res.get_args()
+        else:
+            return None
 
     def execute(
         self,
         exec_args: dict,
         await_response: bool = False,
+        trace: bool = False,
+        await_result: bool = False,
+        priority: Optional[int] = None,
     ) -> dict:
         """
         Send a command to the server
@@ -135,23 +213,334 @@ class Client:
         await_response : bool, optional
             Wait for a second 'custom' response of the server, by default
             False.
+        trace : bool, optional
+            Trace the request and add the timing breakdown to the response
+            as 'trace': The trace 'id', the 'total' time and the seconds per
+            phase in 'phases' (e.g. 'client.connect', 'client.auth',
+            'client.send', 'server.queue', 'server.exec_task'). Without
+            awaiting the response, the server phases end with the
+            confirmation, by default False.
+        await_result : bool, optional
+            Wait for the result of the 'exec_task' in a single round trip:
+            The server replies to the EXEC message after the task has run,
+            with the response sent by the task using 'respond' (an error
+            response or a raised exception as ERROR) instead of a
+            confirmation and a second message. If the task does not
+            respond, the reply is the confirmation. Servers without support
+            (e.g. 'AsyncServer') confirm immediately, by default False.
+        priority : Optional[int], optional
+            Priority of the request in the queue of the server, requests
+            with a higher priority run first. Added to the 'exec_args' as
+            'priority', by default None (SCHEDULER_PRIORITY).
 
         Returns
         -------
         dict
             Response of the server.
+
+        Raises
+        ------
+        ValueError
+            If both the response and the result are awaited.
+        ConnectionError
+            If the connection is closed before the response.
         """
-        with ClientSocket(
-            log_level=self.log_level, log_file=self.log_file
-        ) as cs:
-            cs.connect(self.host, self.port)
+        if await_result:
+            if await_response:
+                raise ValueError("Await either the response or the result")
+            exec_args = dict(exec_args, await_result=True)
+        if priority is not None:
+            exec_args = dict(exec_args, priority=priority)
+        msg = Message(MessageType.EXEC, args=exec_args)
+        request_trace = Trace() if trace else None
+        res = self._request(msg, await_response, request_trace)
+        args = _response_args(res)
+        if request_trace is not None:
+            args["trace"] = request_trace.breakdown()
+        return args
+
+    def execute_many(self, batch: List[dict]) -> dict:
+        """
+        Send many commands to the server at once
+
+        Sends a BATCH message with a list of custom arguments in one frame.
+        The server passes them to the predefined 'exec_task' one by one, in
+        order, and responds once with the results of all calls, which saves
+        the framing and confirmation of every single message.
+
+        Parameters
+        ----------
+        batch : List[dict]
+            Arguments to send to the 'exec_task', one dict per call.
+
+        Returns
+        -------
+        dict
+            Response of the server. The list 'results' contains the
+            arguments of the response sent by the task using 'respond' (or
+            None) and the list 'errors' the arguments of an error response
+            or the raised exception (or None) for every call.
+
+        Raises
+        ------
+        ConnectionError
+            If the connection is closed before the response.
+        """
+        msg = Message(MessageType.BATCH, args={"batch": list(batch)})
+        return _response_args(self._request(msg, await_response=True))
+
+    def execute_stream(self, exec_args: dict) -> Iterator[Any]:
+        """
+        Send a command to the server and iterate over the streamed items
+
+        Sends a STREAM message with custom arguments, which are passed to the
+        predefined 'exec_task'. If the task is a generator function (or
+        returns a generator), every yielded item is sent back in its own
+        message as soon as it is produced, until the end of the stream is
+        marked. The stream uses its own connection, which is closed when the
+        iteration is completed or the iterator is closed.
+
+        Parameters
+        ----------
+        exec_args : dict
+            Arguments to send to the 'exec_task'.
+
+        Returns
+        -------
+        Iterator[Any]
+            Iterator over the items yielded by the 'exec_task'.
+
+        Raises
+        ------
+        ConnectionError
+            If the authentication fails or the connection is closed before
+            the end of the stream.
+        RuntimeError
+            If the task raised an exception or responded with an error.
+        """
+        with self._connect() as cs:
             res_auth = self._authenticate(cs)
-            if res_auth.type is MessageType.OK:
-                msg = Message(MessageType.EXEC, args=exec_args)
-                res = cs.send(msg, await_response=await_response)
-            else:
-                res = res_auth
-            return res.get_args()
+            if res_auth is None or res_auth.type is not MessageType.OK:
+                raise ConnectionError("Authentication failed")
+            msg = Message(MessageType.STREAM, args=exec_args)
+            if cs.send(msg) is None:
+                raise ConnectionError("Connection closed by the server")
+            while True:
+                res = cs.recv_frame()
+                if res is None:
+                    raise ConnectionError("Connection closed by the server")
+                if res.type is MessageType.STREAM:
+                    yield res.get_args()["item"]
+                elif res.type is MessageType.ERROR:
+                    raise RuntimeError(res.get_args().get("message"))
+                else:
+                    return
+
+    def pipeline(self) -> "Pipeline":
+        """
+        Open a pipelined connection
+
+        Opens and authenticates a new connection, on which EXEC messages are
+        sent back to back without waiting for the confirmation of each
+        message. Every message carries a request id and the responses are
+        matched with the requests as they arrive.
+
+        Returns
+        -------
+        Pipeline
+            The pipeline, which should be closed after use (e.g. by using it
+            as context manager).
+
+        Raises
+        ------
+        ConnectionError
+            If the authentication fails or the server does not support
+            pipelining.
+        """
+        cs = self._connect()
+        res_auth = self._authenticate(cs, pipeline=True)
+        if res_auth is None or res_auth.type is not MessageType.OK:
+            cs.close()
+            raise ConnectionError("Authentication failed")
+        if not res_auth.get_args().get("pipeline", False):
+            cs.close()
+            raise ConnectionError("Server does not support pipelining")
+        from .core.pipeline import Pipeline  # Imported on use
+
+        return Pipeline(cs)
+
+    def stats(self) -> dict:
+        """
+        Query the metrics of the server
+
+        Sends a STATS message, the server responds with its metrics: The
+        count, errors and latency histogram ('buckets' of upper bound in
+        seconds and count) per message type and per task, the bytes received
+        and sent and the connections. A server with several workers responds
+        with the metrics of the worker, which accepted the connection.
+
+        Returns
+        -------
+        dict
+            Response of the server.
+
+        Raises
+        ------
+        ConnectionError
+            If the connection is closed before the response.
+        """
+        msg = Message(MessageType.STATS, args={})
+        return _response_args(self._request(msg, await_response=True))
+
+    def profile(
+        self,
+        action: str,
+        sort: str = PROFILE_SORT,
+        limit: int = PROFILE_LIMIT,
+    ) -> dict:
+        """
+        Profile the 'exec_task' calls on the server
+
+        Sends a PROFILE message: The action 'start' profiles the following
+        'exec_task' calls with cProfile (a new profile), 'stop' ends
+        profiling, 'stats' reports the statistics while profiling and 'dump'
+        writes them to the 'profile_file' of the server. Without profiling,
+        the calls are not slowed down.
+
+        Parameters
+        ----------
+        action : str
+            The action: 'start', 'stop', 'stats' or 'dump'.
+        sort : str, optional
+            Sort key of the statistics (see 'pstats.Stats.sort_stats'),
+            by default PROFILE_SORT.
+        limit : int, optional
+            Number of functions in the statistics, by default PROFILE_LIMIT.
+
+        Returns
+        -------
+        dict
+            Response of the server with the number of profiled 'calls',
+            whether profiling is 'enabled' and, on 'stop' and 'stats', the
+            'stats' report.
+
+        Raises
+        ------
+        ConnectionError
+            If the connection is closed before the response.
+        """
+        args = {"action": action, "sort": sort, "limit": limit}
+        msg = Message(MessageType.PROFILE, args=args)
+        return _response_args(self._request(msg, await_response=True))
+
+    def submit(self, exec_args: dict) -> str:
+        """
+        Submit a command to the server as a job
+
+        Sends a JOB message with custom arguments for the predefined
+        'exec_task'. The server replies immediately with the id of the job
+        and runs the task in the background (see 'job_workers' of the
+        server), the response of the task is kept as the result of the job.
+
+        Parameters
+        ----------
+        exec_args : dict
+            Arguments to send to the 'exec_task'.
+
+        Returns
+        -------
+        str
+            Id of the job.
+
+        Raises
+        ------
+        RuntimeError
+            If the server rejects the job (e.g. its queue is full).
+        """
+        res = self._job("submit", exec_args=exec_args)
+        if "job" not in res:
+            raise RuntimeError(res.get("message"))
+        return res["job"]
+
+    def status(self, job_id: str) -> dict:
+        """
+        Query the status of a job
+
+        Parameters
+        ----------
+        job_id : str
+            Id of the job returned by 'submit'.
+
+        Returns
+        -------
+        dict
+            Response of the server with the 'state' of the job ('queued',
+            'running', 'done' or 'failed') and the Unix times 'submitted',
+            'started' and 'finished', or an error message if the job is
+            unknown or has expired.
+        """
+        return self._job("status", job=job_id)
+
+    def result(self, job_id: str, timeout: Optional[float] = None) -> dict:
+        """
+        Wait for the result of a job
+
+        Polls the server until the job is completed, with an interval
+        starting at JOB_POLL_INTERVAL, which is doubled up to
+        JOB_POLL_MAX_INTERVAL. The timeout also limits the time waiting for
+        the responses of the server.
+
+        Parameters
+        ----------
+        job_id : str
+            Id of the job returned by 'submit'.
+        timeout : Optional[float], optional
+            Maximum time to wait in seconds, by default None (no limit).
+
+        Returns
+        -------
+        dict
+            The status of the job (see 'status') with the 'result' (the
+            arguments of the response sent by the task using 'respond' or
+            None) and the 'error' (the arguments of an error response or
+            the raised exception, if the job failed), or an error message
+            if the job is unknown or has expired.
+
+        Raises
+        ------
+        TimeoutError
+            If the job is not completed within the timeout.
+        ConnectionError
+            If the connection is closed before the response.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        interval = JOB_POLL_INTERVAL
+        while True:
+            try:
+                res = self._job("result", deadline, job=job_id)
+            except ConnectionError:
+                if deadline is None or monotonic() < deadline:
+                    raise
+                raise TimeoutError(f"Job '{job_id}' is not completed")
+            if res.get("state") not in JOB_PENDING:
+                return res
+            if deadline is not None:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Job '{job_id}' is not completed")
+                interval = min(interval, remaining)
+            sleep(interval)
+            interval = min(interval * 2, JOB_POLL_MAX_INTERVAL)
+
+    def _job(
+        self, action: str, deadline: Optional[float] = None, **args
+    ) -> dict:
+        msg = Message(MessageType.JOB, args=dict(args, action=action))
+        res = _response_args(
+            self._request(msg, await_response=True, deadline=deadline)
+        )
+        res.pop("await_response", None)  # Set by 'respond' on the server
+        return res
 
     def terminate(
         self,
@@ -162,7 +551,8 @@ class Client:
         Terminate the server
 
         Send an EXIT message to the server in order to execute the 'exit_task'
-        and exit the main loop on the server.
+        and exit the main loop on the server. Returns when the server has
+        closed the connection, but waits at most STARTUP_TIME seconds.
 
         Parameters
         ----------
@@ -176,21 +566,136 @@ class Client:
         -------
         dict
             Response of the server.
+
+        Raises
+        ------
+        ConnectionError
+            If the connection is closed before the response.
         """
-        with ClientSocket(
-            log_level=self.log_level, log_file=self.log_file
-        ) as cs:
-            cs.connect(self.host, self.port)
-            res_auth = self._authenticate(cs)
-            if res_auth.type is MessageType.OK:
-                msg = Message(MessageType.EXIT, args=exit_args)
+        msg = Message(MessageType.EXIT, args=exit_args)
+        with self._connect() as cs:
+            res = self._authenticate(cs)
+            if res is not None and res.type is MessageType.OK:
+                res = cs.send(msg, await_response=await_response)
+
+            # The server closes the remaining connections when exiting
+            if res is not None and res.type is not MessageType.ERROR:
+                cs.wait_closed(STARTUP_TIME)
+        return _response_args(res)
+
+    def _request(
+        self,
+        msg: Message,
+        await_response: bool = False,
+        trace: Optional[Trace] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[Message]:
+        if trace is None and self.tracer is not None:
+            trace = Trace()
+        try:
+            if self.pool is not None:
+                return self._request_persistent(
+                    self.pool, msg, await_response, trace, deadline
+                )
+            with span(trace, "connect"):
+                cs = self._connect(deadline)
+            with cs:
+                with span(trace, "auth"):
+                    res_auth = self._authenticate(cs)
+                if res_auth is None or res_auth.type is not MessageType.OK:
+                    return res_auth
+                cs.trace = trace
+                return cs.send(msg, await_response=await_response)
+        finally:
+            if trace is not None and self.tracer is not None:
+                self.tracer.record(trace)
+
+    def _request_persistent(
+        self,
+        pool: ConnectionPool,
+        msg: Message,
+        await_response: bool = False,
+        trace: Optional[Trace] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[Message]:
+        # Reuse an idle connection of the pool, reconnect once if it fails
+        cs = pool.acquire()
+        try:
+            while True:
+                reused = cs is not None
+                if cs is not None and deadline is not None:
+                    cs.sock.settimeout(_timeout(deadline))
+                if cs is None:
+                    with span(trace, "connect"):
+                        cs = self._connect(deadline)
+                    with span(trace, "auth"):
+                        res_auth = self._authenticate(cs)
+                    if res_auth is None or res_auth.type is not MessageType.OK:
+                        cs.close()
+                        cs = None
+                        return res_auth
+                cs.trace = trace
                 res = cs.send(msg, await_response=await_response)
-                sleep(STARTUP_TIME)
-            else:
-                res = res_auth
-        return res.get_args()
+                cs.trace = None
+                if res is not None:
+                    cs.sock.settimeout(None)  # Kept without deadline
+                    return res
+                cs.close()
+                cs = None
+                if not reused:
+                    return None
+        except BaseException:
+            if cs is not None:
+                cs.close()
+                cs = None
+            raise
+        finally:
+            pool.release(cs)
 
-    def _authenticate(self, cs) -> Message:
-        msg = Message(MessageType.AUTH, args={"token": self.token})
+    def _connect(self, deadline: Optional[float] = None) -> ClientSocket:
+        cs = ClientSocket(
+            log_level=self.log_level,
+            log_file=self.log_file,
+            buffer_size=self.buffer_size,
+        )
+        try:
+            cs.connect(self.host, self.port)
+            if deadline is not None:
+                cs.sock.settimeout(_timeout(deadline))
+        except BaseException:
+            cs.close()
+            raise
+        return cs
+
+    def _authenticate(
+        self, cs, pipeline: bool = False
+    ) -> Optional[Message]:
+        codecs = [self.codec]
+        if self.codec == SharedMemoryCodec.name:
+            codecs.append(CODEC)  # Fallback for remote or older servers
+        args: Dict[str, Any] = {
+            "token": self.token,
+            "codecs": codecs,
+            "client": self.id,
+        }
+        if pipeline:
+            args["pipeline"] = True
+        msg = Message(MessageType.AUTH, args=args)
         res = cs.send(msg, await_response=True)
+
+        # Switch to the codec chosen by the server
+        if res is not None and res.type is MessageType.OK:
+            cs.codec = res.get_args().get("codec", cs.codec)
         return res
+
+
+def _response_args(res: Optional[Message]) -> dict:
+    # The arguments of a response, which must not be missing
+    if res is None:
+        raise ConnectionError("Connection closed by the server")
+    return res.get_args()
+
+
+def _timeout(deadline: float) -> float:
+    # Timeout of a socket until the deadline, which is over at once if passed
+    return max(deadline - monotonic(), 0.0)
@@ -1,20 +1,75 @@
 # Sockets
 HOST = "127.0.0.1"  # IP adress of the Server for testing
 PORT = 54321  # Port used by server for testing
-BACKLOG_SIZE = 3  # Backlog size of the server socket (client queue)
+UNIX_SCHEME = "unix://"  # Prefix of the addresses of Unix domain sockets
+UNIX_SOCKET_MODE = 0o600  # Permissions of the socket file of a server
+BACKLOG_SIZE = 128  # Backlog size of the server socket (client queue)
+POOL_SIZE = 4  # Maximum number of persistent connections of a client
+
+# Concurrency
+CONCURRENCY = "none"  # Concurrency mode of the server (none, thread, process)
+SERVER_POOL_SIZE = 4  # Number of workers of a concurrent server
+SERVER_WORKERS = 1  # Number of pre-forked processes accepting connections
+STREAM_QUEUE_SIZE = 64  # Items of a stream queued by a worker process
 
 # Network buffer
 HEADER_SIZE = 16  # Size of the header of the first chunk (message length)
-BUFFER_SIZE = 1024 * 2  # Size of the vjunks in the network buffer
+BUFFER_SIZE = 1024 * 64  # Max. size of a chunk read (2 KiB up to v0.3.1)
+
+# Serialization
+CODEC = "pickle"  # Codec of the messages, negotiated in the AUTH handshake
+HANDSHAKE_CODEC = "base64"  # Codec before the negotiation (bgpy <= 0.3.1)
+SHM_THRESHOLD = 1024 * 1024  # Min. size of a message in shared memory (shm)
 
 # Times
-STARTUP_TIME = 1  # Time to sleep before sending INIT message to a new server
-BUFFER_TIME = 0.1  # Give receiving client socket time to complete reading
+STARTUP_TIME = 1  # Max. time to wait for the server to close after EXIT
+STARTUP_TIMEOUT = 30  # Max. time to wait for a new server to be ready
+BUFFER_TIME = 0.0  # Optional delay after each message (0.1 up to v0.3.1)
 
 # Logs
 LOG_LEVEL = "INFO"
+LOG_ASYNC = False  # Write the logs from a background thread (QueueHandler)
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Rotate the log file at this size, 0: never
+LOG_BACKUP_COUNT = 5  # Number of rotated log files to keep
+LOG_WHEN = None  # Rotate at time intervals instead, e.g. "midnight" or "H"
+LOG_COMPRESS = False  # Compress the rotated log files with gzip
 LOG_FORMAT = ("[%(asctime)s %(process)d %(levelname)s] %(message)s (%(name)s)")
 LOG_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Metrics
+LATENCY_BUCKETS = (  # Upper bounds of the buckets of latency histograms (s)
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+METRICS_PORT = None  # Port of the HTTP endpoint of the metrics, None: off
+
+# Profiling
+PROFILE_SORT = "cumulative"  # Sort key of the profile statistics (pstats)
+PROFILE_LIMIT = 30  # Number of functions in the profile statistics
+
+# Tracing
+TRACE_LIMIT = 1000  # Number of traces kept in memory by a tracer
+
+# Jobs
+JOB_WORKERS = 1  # Number of threads running the submitted jobs
+JOB_LIMIT = 1000  # Number of jobs kept by the server (pending and completed)
+JOB_TTL = 3600.0  # Time in seconds, for which a completed job is kept
+JOB_POLL_INTERVAL = 0.01  # First interval of polling for a result (s)
+JOB_POLL_MAX_INTERVAL = 1.0  # The interval is doubled up to this maximum
+
+# Scheduling
+SCHEDULER_QUEUE_SIZE = 64  # Max. number of requests waiting for the exec_task
+SCHEDULER_CLIENT_QUEUE_SIZE = 16  # Max. number of pending requests per client
+SCHEDULER_PRIORITY = 0  # Priority of requests without 'priority'
+
 # Env vars
 ENV_TOKEN = "BGPY_TOKEN"
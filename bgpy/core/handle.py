@@ -0,0 +1,95 @@
+from os import getpid
+from threading import Thread
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+if TYPE_CHECKING:  # pragma: no cover
+    from multiprocessing.process import BaseProcess
+
+
+class ServerHandle:
+    """
+    Server handle
+
+    Handle of a server running in a daemon thread or a child process of the
+    current interpreter, which is listening as soon as the handle is
+    returned. Created by 'Server.start'.
+    """
+
+    __slots__ = ["host", "port", "_worker", "_stop"]
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        worker: Union[Thread, "BaseProcess"],
+        stop: Callable[[], None],
+    ) -> None:
+        """
+        Initializes an object of type 'ServerHandle'.
+
+        Parameters
+        ----------
+        host : str
+            Address of the host the server runs on, or 'unix:///path' of the
+            socket file.
+        port : int
+            Port the server is listening to, also if started with port 0.
+        worker : Union[Thread, BaseProcess]
+            Thread or process running the main loop of the server.
+        stop : Callable[[], None]
+            Function to stop the main loop of the server.
+        """
+        self.host = host
+        self.port = port
+        self._worker = worker
+        self._stop = stop
+
+    def __repr__(self) -> str:
+        return f"ServerHandle({self.host!r}, {self.port!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        self.join()
+        return False
+
+    def stop(self) -> None:
+        """
+        Stop the server without running the 'exit_task', the open
+        connections are closed.
+        """
+        if self.is_alive():
+            self._stop()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until the server has stopped.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            Maximum time to wait in seconds, by default None.
+        """
+        self._worker.join(timeout)
+
+    def is_alive(self) -> bool:
+        """
+        Check if the server is running.
+
+        Returns
+        -------
+        bool
+            True if the thread or process of the server is alive.
+        """
+        return self._worker.is_alive()
+
+    @property
+    def pid(self) -> int:
+        """
+        Process id of the server, e.g. to send it signals. The current
+        process if the server runs in a thread.
+        """
+        pid = getattr(self._worker, "pid", None)
+        return getpid() if pid is None else pid
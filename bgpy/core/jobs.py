@@ -0,0 +1,186 @@
+from .environment import JOB_LIMIT, JOB_TTL
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic, time
+from typing import Dict, Optional
+from uuid import uuid4
+
+JOB_ACTIONS = ("submit", "status", "result")
+JOB_STATES = ("queued", "running", "done", "failed")
+JOB_PENDING = ("queued", "running")
+
+
+class Job:
+    """
+    Job of a submitted EXEC message: The state of the job ('queued',
+    'running', 'done' or 'failed'), the Unix times of the transitions and,
+    when completed, the response of the task as result or error.
+    """
+
+    __slots__ = [
+        "id",
+        "state",
+        "submitted",
+        "started",
+        "finished",
+        "result",
+        "error",
+        "expires",
+    ]
+
+    def __init__(self) -> None:
+        self.id = uuid4().hex
+        self.state = "queued"
+        self.submitted = time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[dict] = None
+        self.expires: Optional[float] = None  # Monotonic time, if completed
+
+    def __repr__(self) -> str:
+        return f"Job({self.id!r}, {self.state!r})"
+
+    def to_dict(self, result: bool = False) -> dict:
+        """
+        Status of the job, as sent in the response to a JOB message.
+
+        Parameters
+        ----------
+        result : bool, optional
+            Add the 'result' and 'error' of the job, by default False.
+
+        Returns
+        -------
+        dict
+            The id, state and times of the job.
+        """
+        status = {
+            "job": self.id,
+            "state": self.state,
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if result:
+            status["result"] = self.result
+            status["error"] = self.error
+        return status
+
+
+class JobStore:
+    """
+    Bounded store of the jobs of a server: Completed jobs expire after a time
+    to live and, if the store is full, the oldest completed jobs are evicted.
+    If all stored jobs are pending, further jobs are rejected.
+    """
+
+    __slots__ = ["limit", "ttl", "_jobs", "_lock"]
+
+    def __init__(self, limit: int = JOB_LIMIT, ttl: float = JOB_TTL) -> None:
+        """
+        Initializes an object of type 'JobStore'.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of jobs kept, pending and completed,
+            by default JOB_LIMIT.
+        ttl : float, optional
+            Time in seconds, for which a completed job is kept,
+            by default JOB_TTL.
+
+        Raises
+        ------
+        ValueError
+            If the limit or the time to live is not positive.
+        """
+        if limit < 1:
+            raise ValueError(f"Invalid job limit: {limit}")
+        if ttl <= 0:
+            raise ValueError(f"Invalid job TTL: {ttl}")
+        self.limit = limit
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = OrderedDict()
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"JobStore({self.limit!r}, {self.ttl!r})"
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def submit(self) -> Job:
+        """
+        Add a new queued job.
+
+        Returns
+        -------
+        Job
+            The job.
+
+        Raises
+        ------
+        ValueError
+            If the store is full of pending jobs.
+        """
+        with self._lock:
+            self._evict(full=True)
+            if len(self._jobs) >= self.limit:
+                raise ValueError(f"Job queue is full ({self.limit} jobs)")
+            job = Job()
+            self._jobs[job.id] = job
+            return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        Get a job by its id.
+
+        Raises
+        ------
+        ValueError
+            If the job is unknown or has expired.
+        """
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job: {job_id}")
+        return job
+
+    def start(self, job: Job) -> None:
+        job.started = time()
+        job.state = "running"
+
+    def finish(
+        self,
+        job: Job,
+        result: Optional[dict] = None,
+        error: Optional[dict] = None,
+    ) -> None:
+        """
+        Complete a job, which is 'failed' if an error is set.
+        """
+        with self._lock:
+            job.result = result
+            job.error = error
+            job.finished = time()
+            job.expires = monotonic() + self.ttl
+            job.state = "done" if error is None else "failed"
+
+    def _evict(self, full: bool = False) -> None:
+
+        # Remove expired jobs, then the oldest completed jobs to make room
+        now = monotonic()
+        completed = [
+            (job, job.expires)
+            for job in self._jobs.values()
+            if job.expires is not None
+        ]
+        for job, expires in completed:
+            if expires <= now:
+                del self._jobs[job.id]
+        for job, _ in completed if full else []:
+            if len(self._jobs) < self.limit:
+                break
+            self._jobs.pop(job.id, None)
@@ -1,26 +1,121 @@
 from .environment import (
+    LOG_ASYNC,
     LOG_FORMAT,
     LOG_DATETIME_FORMAT,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_WHEN,
+    LOG_COMPRESS,
 )
 from logging import (
     getLogger,
     Formatter,
+    Handler,
     StreamHandler,
     getLevelName,
     DEBUG,
     INFO,
     WARNING,
 )
-from logging.handlers import RotatingFileHandler
+from atexit import register
+from queue import SimpleQueue
 from sys import stdout, stderr
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
+import re
+
+ROTATION_INTERVAL = re.compile(r"^(S|M|H|D|MIDNIGHT|W[0-6])$", re.IGNORECASE)
+
+
+class LogRotation:
+    """
+    Rotation policy of a log file: Rotate at a size or at time intervals,
+    keep a number of backups and optionally compress them.
+    """
+
+    __slots__ = ["max_bytes", "backup_count", "when", "compress"]
+
+    def __init__(
+        self,
+        max_bytes: int = LOG_MAX_BYTES,
+        backup_count: int = LOG_BACKUP_COUNT,
+        when: Optional[str] = LOG_WHEN,
+        compress: bool = LOG_COMPRESS,
+    ) -> None:
+        """
+        Initializes an object of type 'LogRotation'.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Rotate the log file when it reaches this size, 0 disables the
+            size-based rotation, by default LOG_MAX_BYTES.
+        backup_count : int, optional
+            Number of rotated files to keep. Without backups, the log file is
+            truncated at the size limit, while with time-based rotation all
+            backups are kept. By default LOG_BACKUP_COUNT.
+        when : Optional[str], optional
+            Rotate at time intervals instead of a size: Every second ('S'),
+            minute ('M'), hour ('H'), day ('D'), at midnight ('midnight') or
+            on a weekday ('W0' = Monday, ..., 'W6'), by default LOG_WHEN.
+        compress : bool, optional
+            Compress the rotated files with gzip ('.gz') in a background
+            thread, by default LOG_COMPRESS.
+
+        Raises
+        ------
+        ValueError
+            If the size, the backup count or the interval is invalid.
+        """
+        if max_bytes < 0:
+            raise ValueError(f"Invalid maximum log size: {max_bytes}")
+        if backup_count < 0:
+            raise ValueError(f"Invalid number of log backups: {backup_count}")
+        if when is not None and not ROTATION_INTERVAL.match(when):
+            raise ValueError(f"Invalid rotation interval: {when}")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.when = when
+        self.compress = compress
+
+    def __repr__(self) -> str:
+        return (
+            f"LogRotation({self.max_bytes!r}, {self.backup_count!r}, "
+            + f"{self.when!r}, {self.compress!r})"
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LogRotation):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self) -> tuple:
+        return (self.max_bytes, self.backup_count, self.when, self.compress)
+
+
+# Handlers shared by all loggers (per log file, mode and rotation), the
+# configuration of every logger, the rotation policy of every log file and
+# the listeners of the asynchronous handlers with the running listeners
+_HANDLERS: Dict[tuple, List[Handler]] = {}
+_CONFIGS: Dict[str, tuple] = {}
+_ROTATIONS: Dict[Optional[str], LogRotation] = {}
+_LISTENERS: list = []  # Pairs of listener and queue handler
+_RUNNING: set = set()
+_ASYNC = [LOG_ASYNC]
 
 
 class Log:
     """
     Logger class, optionally binds to a log file and writes logs with timestamp
     and PID.
+
+    The handlers are configured once per logger and shared by all 'Log'
+    objects (e.g. of every connection) with the same name, level and file,
+    so creating a 'Log' is cheap. Messages are formatted only if the level
+    is enabled, arguments are merged into the message lazily ('%s' style).
     """
 
     __slots__ = ["name", "level", "tag", "file", "logger"]
@@ -32,6 +127,8 @@ class Log:
         tag: Optional[str] = None,
         file: Optional[Path] = None,
         clear: bool = False,
+        asynchronous: Optional[bool] = None,
+        rotation: Optional[LogRotation] = None,
     ) -> None:
         """
         Initializes an object of type 'Log'.
@@ -48,6 +145,15 @@ class Log:
             Path to the log file, by default None.
         clear : bool, optional
             Clear the provided log file, by default False.
+        asynchronous : Optional[bool], optional
+            Write the logs from a background thread, the records are passed
+            by a 'QueueHandler', so log I/O is not on the request path. Sets
+            the mode of all loggers configured afterwards in this process,
+            None keeps the current mode, by default None (LOG_ASYNC).
+        rotation : Optional[LogRotation], optional
+            Rotation policy of the log file, which applies to all loggers
+            writing to the file. None keeps the current policy of the file,
+            by default None (a 'LogRotation' with the default settings).
         """
 
         self.name = name
@@ -59,46 +165,18 @@ class Log:
         if clear:
             self.clear_log_file()
 
-        # Logger config
+        # Configure the logger only if the configuration has changed
+        if asynchronous is not None:
+            _ASYNC[0] = asynchronous
         numeric_level = self._level_from_str(level)
-        level = level.upper()
-        formatter = Formatter(LOG_FORMAT, LOG_DATETIME_FORMAT)
-        logger = getLogger(name)
-        if logger.hasHandlers():
-            logger.debug(self._format("Clear handlers"))
-            logger.handlers.clear()
-        logger.setLevel(numeric_level)
-
-        # Stream handler
-        stream_handler_stdout = StreamHandler(stdout)
-        stream_handler_stdout.setFormatter(formatter)
-        stream_handler_stdout.setLevel(DEBUG)
-        stream_handler_stdout.addFilter(lambda record: record.levelno <= INFO)
-        stream_handler_stderr = StreamHandler(stderr)
-        stream_handler_stderr.setFormatter(formatter)
-        stream_handler_stderr.setLevel(WARNING)
-        logger.addHandler(stream_handler_stdout)
-        logger.addHandler(stream_handler_stderr)
-
-        # File handler
-        if file is not None:
-            file_handler = RotatingFileHandler(
-                Path(file), maxBytes=512, backupCount=0
-            )
-            file_handler.setFormatter(formatter)
-            file_handler.setLevel(DEBUG)
-            logger.addHandler(file_handler)
-            logger.debug(
-                self._format(
-                    f"Set file handler to '{file}'"
-                )
-            )
-
-        # Complete initialization
-        logger.debug(self._format("Set stream handler to 'STDOUT/STDERR'"))
-        logger.debug(self._format(f"Set log level to '{level}'"))
-        self.logger = logger
-        self.logger.debug(self._format("Logger initialized"))
+        file_name = None if file is None else str(file)
+        if rotation is not None:
+            _ROTATIONS[file_name] = rotation
+        rotation = _ROTATIONS.setdefault(file_name, LogRotation())
+        config = (numeric_level, file_name, _ASYNC[0], rotation)
+        self.logger = getLogger(name)
+        if _CONFIGS.get(name) != config:
+            self._configure(config)
 
     def __repr__(self) -> str:
         return (
@@ -109,6 +187,24 @@ class Log:
     def __str__(self) -> str:
         return f"Logger {self.name!r} with level {self.level!r}"
 
+    def _configure(self, config: tuple) -> None:
+        numeric_level, file_name, asynchronous, rotation = config
+        logger = self.logger
+        if logger.hasHandlers():
+            logger.debug(self._format("Clear handlers"))
+        logger.handlers = list(_handlers(file_name, asynchronous, rotation))
+        logger.setLevel(numeric_level)
+        _CONFIGS[self.name] = config
+
+        # Complete initialization
+        if file_name is not None:
+            self.debug("Set file handler to '%s' (%r)", file_name, rotation)
+        self.debug("Set stream handler to 'STDOUT/STDERR'")
+        self.debug("Set log level to '%s'", self.level.upper())
+        if asynchronous:
+            self.debug("Writing logs asynchronously")
+        self.debug("Logger initialized")
+
     def clear_log_file(self) -> None:
         """
         Clears the log file.
@@ -116,71 +212,90 @@ class Log:
         if self.file is not None:
             open(self.file, "w").close()
 
-    def debug(self, msg: str) -> None:
+    def is_enabled(self, level: str) -> bool:
+        """
+        Check if messages of a level are logged, e.g. before computing the
+        arguments of a message.
+
+        Parameters
+        ----------
+        level : str
+            The level (DEBUG, INFO, WARNING, ERROR or CRITICAL).
+
+        Returns
+        -------
+        bool
+            True if messages of this level are logged.
+        """
+        return self.logger.isEnabledFor(self._level_from_str(level))
+
+    def debug(self, msg: str, *args) -> None:
         """
         Log a message with level "DEBUG"
 
         Parameters
         ----------
         msg : str
-            Message to log.
+            Message to log, '%s' placeholders are replaced by the arguments.
         """
-        self.logger.debug(self._format(msg))
+        if self.logger.isEnabledFor(DEBUG):
+            self.logger.debug(self._format(msg), *args)
 
-    def info(self, msg: str) -> None:
+    def info(self, msg: str, *args) -> None:
         """
         Log a message with level "INFO"
 
         Parameters
         ----------
         msg : str
-            Message to log.
+            Message to log, '%s' placeholders are replaced by the arguments.
         """
-        self.logger.info(self._format(msg))
+        if self.logger.isEnabledFor(INFO):
+            self.logger.info(self._format(msg), *args)
 
-    def warning(self, msg: str) -> None:
+    def warning(self, msg: str, *args) -> None:
         """
         Log a message with level "WARNING"
 
         Parameters
         ----------
         msg : str
-            Message to log.
+            Message to log, '%s' placeholders are replaced by the arguments.
         """
-        self.logger.warning(self._format(msg))
+        self.logger.warning(self._format(msg), *args)
 
-    def error(self, msg: str) -> None:
+    def error(self, msg: str, *args) -> None:
         """
         Log a message with level "ERROR"
 
         Parameters
         ----------
         msg : str
-            Message to log.
+            Message to log, '%s' placeholders are replaced by the arguments.
         """
-        self.logger.error(self._format(msg))
+        self.logger.error(self._format(msg), *args)
 
-    def critical(self, msg: str) -> None:
+    def critical(self, msg: str, *args) -> None:
         """
         Log a message with level "CRITICAL"
 
         Parameters
         ----------
         msg : str
-            Message to log.
+            Message to log, '%s' placeholders are replaced by the arguments.
         """
-        self.logger.critical(self._format(msg))
+        self.logger.critical(self._format(msg), *args)
 
-    def exception(self, msg: str) -> None:
+    def exception(self, msg: str, *args) -> None:
         """
         Log an exception with message.
 
         Parameters
         ----------
         msg : str
-            Message to log.
+            Message to log, '%s' placeholders are replaced by the arguments.
         """
-        self.logger.exception(self._format(msg))
+        self.logger.exception(self._format(msg), *args)
 
     @staticmethod
     def _level_from_str(level_name: str) -> int:
@@ -194,3 +309,121 @@ class Log:
             return f"{self.tag} - {msg}"
         else:
             return msg
+
+
+def _handlers(
+    file_name: Optional[str], asynchronous: bool, rotation: LogRotation
+) -> List[Handler]:
+
+    # Create the handlers of a log file once, shared by all loggers
+    key = (file_name, asynchronous, rotation)
+    if key in _HANDLERS:
+        return _HANDLERS[key]
+    formatter = Formatter(LOG_FORMAT, LOG_DATETIME_FORMAT)
+
+    # Stream handler
+    stream_handler_stdout = StreamHandler(stdout)
+    stream_handler_stdout.setFormatter(formatter)
+    stream_handler_stdout.setLevel(DEBUG)
+    stream_handler_stdout.addFilter(lambda record: record.levelno <= INFO)
+    stream_handler_stderr = StreamHandler(stderr)
+    stream_handler_stderr.setFormatter(formatter)
+    stream_handler_stderr.setLevel(WARNING)
+    handlers: List[Handler] = [stream_handler_stdout, stream_handler_stderr]
+
+    # File handler
+    if file_name is not None:
+        file_handler = _file_handler(Path(file_name), rotation)
+        file_handler.setFormatter(formatter)
+        file_handler.setLevel(DEBUG)
+        handlers.append(file_handler)
+
+    # Write from a background thread, the loggers only enqueue the records
+    if asynchronous:
+        from logging.handlers import QueueHandler, QueueListener
+
+        queue: SimpleQueue = SimpleQueue()
+        listener = QueueListener(queue, *handlers, respect_handler_level=True)
+        _start_listener(listener)
+        handlers = [QueueHandler(queue)]
+        _LISTENERS.append((listener, handlers[0]))
+    _HANDLERS[key] = handlers
+    _replace_handlers(key, handlers)
+    return handlers
+
+
+def _file_handler(file: Path, rotation: LogRotation) -> Handler:
+    from .rotation import (  # Only for files
+        SizeRotatingFileHandler,
+        TimeRotatingFileHandler,
+    )
+
+    if rotation.when is not None:
+        return TimeRotatingFileHandler(
+            file, rotation.when, rotation.backup_count, rotation.compress
+        )
+    return SizeRotatingFileHandler(
+        file, rotation.max_bytes, rotation.backup_count, rotation.compress
+    )
+
+
+def _replace_handlers(key: tuple, handlers: List[Handler]) -> None:
+
+    # Move the loggers of the file to the handlers of its new rotation policy
+    # and close the handlers of the previous policy
+    for old_key in [k for k in _HANDLERS if k[:2] == key[:2] and k != key]:
+        old_handlers = _HANDLERS.pop(old_key)
+        for name, config in _CONFIGS.items():
+            if config[1:] == old_key:
+                getLogger(name).handlers = list(handlers)
+                _CONFIGS[name] = config[:1] + key
+        for listener, handler in list(_LISTENERS):
+            if handler in old_handlers:
+                _LISTENERS.remove((listener, handler))
+                _stop_listener(listener)
+                old_handlers = list(listener.handlers)
+        for handler in old_handlers[2:]:
+            handler.close()
+
+
+def stop_listeners() -> None:
+    """
+    Write the pending records of the asynchronous loggers and stop their
+    threads. Called at exit, or before leaving a process with 'os._exit'.
+    """
+    for listener, _ in _LISTENERS:
+        _stop_listener(listener)
+
+
+def _start_listeners(new_queues: bool = False) -> None:
+    for listener, handler in _LISTENERS:
+        if new_queues:
+            handler.queue = listener.queue = SimpleQueue()
+        _start_listener(listener)
+
+
+def _start_listener(listener: Any) -> None:
+    if listener not in _RUNNING:
+        listener.start()
+        _RUNNING.add(listener)
+
+
+def _stop_listener(listener: Any) -> None:
+    if listener in _RUNNING:
+        _RUNNING.discard(listener)
+        listener.stop()
+
+
+register(stop_listeners)
+try:
+    from os import register_at_fork
+
+    # No thread may write at a fork, a forked child process would inherit
+    # the held locks of the files (and maybe of the queues)
+    register_at_fork(
+        before=stop_listeners,
+        after_in_parent=_start_listeners,
+        after_in_child=lambda: _start_listeners(new_queues=True),
+    )
+except ImportError:  # pragma: no cover
+    pass
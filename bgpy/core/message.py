@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 
 
 class MessageType(Enum):
@@ -13,6 +14,14 @@ class MessageType(Enum):
         - AUTH:    Sent in the beginning of the communication to authenticate.
         - OK:      Response message, optionally with return values.
         - ERROR:   Error response message.
+        - BATCH:   Command message with a list of arguments for many calls.
+        - STREAM:  Command message to stream the items yielded by the task,
+                   which are sent back as STREAM messages.
+        - STATS:   Query of the metrics of the server.
+        - PROFILE: Control message to profile the 'exec_task' calls.
+        - JOB:     Control message to submit an 'exec_task' call as a job,
+                   which runs in the background, and to query its status
+                   and result.
     """
 
     INIT = 0
@@ -21,6 +30,11 @@ class MessageType(Enum):
     AUTH = 3
     OK = 4
     ERROR = 5
+    BATCH = 6
+    STREAM = 7
+    STATS = 8
+    PROFILE = 9
+    JOB = 10
 
 
 class Message:
@@ -30,17 +44,40 @@ class Message:
     Messages to be sent and reveiced via the client sockets. The message
     consists of a message type and arguments. The message type is fixed in the
     communication between the client sockets, and the arguments are used for
-    confirmation, error messages and communicating response values.
+    confirmation, error messages and communicating response values. On
+    pipelined connections, the request id of a message is repeated in the
+    confirmation and responses to match them with the request. A traced
+    message carries the trace context (trace id and the spans of the server,
+    see 'bgpy.core.tracing'), which is repeated in the responses.
     """
 
-    __slots__ = ["type", "args"]
+    __slots__ = ["type", "args", "id", "trace"]
 
-    def __init__(self, type_: MessageType, args: dict = {}) -> None:
+    def __init__(
+        self,
+        type_: MessageType,
+        args: dict = {},
+        id_: Optional[int] = None,
+        trace: Optional[dict] = None,
+    ) -> None:
         self.type = type_
         self.args = args
+        self.id = id_
+        self.trace = trace
 
     def __repr__(self) -> str:
-        return f"Message({self.type}, {self.args})"
+        if self.id is None:
+            return f"Message({self.type}, {self.args})"
+        return f"Message({self.type}, {self.args}, {self.id})"
+
+    def __reduce__(self) -> tuple:
+        # Messages without id are unpickled by bgpy <= 0.3.1 as well, only
+        # traced messages require a server supporting traces
+        if self.trace is not None:
+            return (Message, (self.type, self.args, self.id, self.trace))
+        if self.id is None:
+            return (Message, (self.type, self.args))
+        return (Message, (self.type, self.args, self.id))
 
     def __str__(self) -> str:
         return self.type.name
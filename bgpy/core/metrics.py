@@ -0,0 +1,282 @@
+from .environment import LATENCY_BUCKETS
+from bisect import bisect_left
+from contextlib import contextmanager
+from os import getpid
+from threading import Lock, Thread
+from time import perf_counter, time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+TASKS = ("init_task", "exec_task", "exit_task")
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Name, type and description of the Prometheus metrics per counter
+COUNTERS = {
+    "bytes_received": ("received_bytes_total", "counter", "Bytes received"),
+    "bytes_sent": ("sent_bytes_total", "counter", "Bytes sent"),
+    "connections_active": ("connections_active", "gauge", "Open connections"),
+    "connections_total": ("connections_total", "counter", "Connections"),
+}
+
+
+class Histogram:
+    """
+    Latency histogram with fixed upper bounds of the buckets in seconds, the
+    last bucket counts the values above all bounds.
+    """
+
+    __slots__ = ["bounds", "counts", "count", "errors", "sum"]
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+
+    def __repr__(self) -> str:
+        return f"Histogram({self.bounds!r})"
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        """
+        Count a value in its bucket.
+
+        Parameters
+        ----------
+        seconds : float
+            The observed latency.
+        error : bool, optional
+            Count the observation as error, by default False.
+        """
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.errors += error
+        self.sum += seconds
+
+    def to_dict(self) -> dict:
+        """
+        Counts, errors, sum and buckets (upper bound and count) as dict.
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum": self.sum,
+            "buckets": list(zip(list(self.bounds) + [None], self.counts)),
+        }
+
+
+class Metrics:
+    """
+    Metrics of a server: Count, errors and latency histogram per message
+    type and per task, bytes received and sent and connections. The metrics
+    are kept per process, workers of a pre-forked server count separately.
+    """
+
+    __slots__ = [
+        "messages",
+        "tasks",
+        "bytes_received",
+        "bytes_sent",
+        "connections_active",
+        "connections_total",
+        "started",
+        "_lock",
+    ]
+
+    def __init__(self) -> None:
+        self.messages: Dict[str, Histogram] = {}
+        self.tasks = {task: Histogram() for task in TASKS}
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.connections_active = 0
+        self.connections_total = 0
+        self.started = time()
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"Metrics({sorted(self.messages)!r})"
+
+    def observe_message(
+        self,
+        type_name: str,
+        seconds: float,
+        error: bool,
+        received: int,
+        sent: int,
+    ) -> None:
+        """
+        Count a handled message.
+
+        Parameters
+        ----------
+        type_name : str
+            Name of the message type.
+        seconds : float
+            Time from receiving the message until it is handled.
+        error : bool
+            True if handling failed or an error was sent.
+        received : int
+            Number of bytes received for the message.
+        sent : int
+            Number of bytes sent while handling the message.
+        """
+        with self._lock:
+            histogram = self.messages.get(type_name)
+            if histogram is None:
+                histogram = self.messages[type_name] = Histogram()
+            histogram.observe(seconds, error)
+            self.bytes_received += received
+            self.bytes_sent += sent
+
+    @contextmanager
+    def task(self, name: str) -> Iterator[None]:
+        """
+        Time a task ('init_task', 'exec_task' or 'exit_task'), raised
+        exceptions are counted as errors.
+        """
+        start = perf_counter()
+        error = True
+        try:
+            yield
+            error = False
+        finally:
+            with self._lock:
+                self.tasks[name].observe(perf_counter() - start, error)
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.connections_active += 1
+            self.connections_total += 1
+
+    def connection_closed(self) -> None:
+        with self._lock:
+            self.connections_active -= 1
+
+    def to_dict(self) -> dict:
+        """
+        Snapshot of the metrics, as sent in the response to a STATS message.
+
+        Returns
+        -------
+        dict
+            The metrics per message type and task, the bytes, connections,
+            process id and uptime in seconds.
+        """
+        with self._lock:
+            return {
+                "pid": getpid(),
+                "uptime": time() - self.started,
+                "messages": {
+                    name: histogram.to_dict()
+                    for name, histogram in sorted(self.messages.items())
+                },
+                "tasks": {
+                    name: histogram.to_dict()
+                    for name, histogram in self.tasks.items()
+                },
+                "bytes_received": self.bytes_received,
+                "bytes_sent": self.bytes_sent,
+                "connections_active": self.connections_active,
+                "connections_total": self.connections_total,
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        stats = self.to_dict()
+        lines: List[str] = []
+        _histograms(
+            lines, "bgpy_message", "type", stats["messages"], "Messages"
+        )
+        _histograms(lines, "bgpy_task", "task", stats["tasks"], "Tasks")
+        for key, (name, kind, help_text) in COUNTERS.items():
+            lines.append(f"# HELP bgpy_{name} {help_text}.")
+            lines.append(f"# TYPE bgpy_{name} {kind}")
+            lines.append(f"bgpy_{name} {stats[key]}")
+        return "\n".join(lines) + "\n"
+
+
+def _histograms(
+    lines: List[str], prefix: str, label: str, stats: dict, help_text: str
+) -> None:
+
+    # Counters of the requests and errors and the cumulative histograms
+    lines.append(f"# HELP {prefix}s_total {help_text} handled.")
+    lines.append(f"# TYPE {prefix}s_total counter")
+    for name, s in stats.items():
+        lines.append(f'{prefix}s_total{{{label}="{name}"}} {s["count"]}')
+    lines.append(f"# HELP {prefix}_errors_total {help_text} failed.")
+    lines.append(f"# TYPE {prefix}_errors_total counter")
+    for name, s in stats.items():
+        errors = s["errors"]
+        lines.append(f'{prefix}_errors_total{{{label}="{name}"}} {errors}')
+    metric = f"{prefix}_duration_seconds"
+    lines.append(f"# HELP {metric} Latency of the {help_text.lower()}.")
+    lines.append(f"# TYPE {metric} histogram")
+    for name, s in stats.items():
+        cumulative = 0
+        for bound, count in s["buckets"]:
+            cumulative += count
+            le = "+Inf" if bound is None else repr(float(bound))
+            lines.append(
+                f'{metric}_bucket{{{label}="{name}",le="{le}"}} {cumulative}'
+            )
+        lines.append(f'{metric}_sum{{{label}="{name}"}} {s["sum"]!r}')
+        lines.append(f'{metric}_count{{{label}="{name}"}} {s["count"]}')
+
+
+class MetricsEndpoint:
+    """
+    HTTP endpoint serving the metrics of a server in the Prometheus text
+    format on '/metrics', from a daemon thread.
+    """
+
+    __slots__ = ["host", "port", "metrics", "_httpd", "_thread"]
+
+    def __init__(self, host: str, port: int, metrics: Metrics) -> None:
+        """
+        Initializes and starts an object of type 'MetricsEndpoint'.
+
+        Parameters
+        ----------
+        host : str
+            Address of the host to listen on.
+        port : int
+            Port to listen on, 0 chooses a free port (set after binding).
+        metrics : Metrics
+            The metrics to serve.
+        """
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass  # Scrapes are not logged
+
+        self.metrics = metrics
+        self._httpd: Optional[HTTPServer] = HTTPServer((host, port), Handler)
+        self.host, self.port = self._httpd.server_address[:2]
+        self._thread = Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        return f"MetricsEndpoint({self.host!r}, {self.port!r})"
+
+    def close(self) -> None:
+        """
+        Stop serving and close the socket.
+        """
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -0,0 +1,149 @@
+from .message import Message, MessageType
+from .sockets import ClientSocket
+from concurrent.futures import Future
+from itertools import count
+from socket import SHUT_WR, error
+from threading import Lock, Thread
+from typing import Dict
+
+
+class Request:
+    """
+    Pending request of a pipeline, which is completed by the last message
+    with its id: The confirmation or, if 'await_response' is set, the response
+    after the confirmation.
+    """
+
+    __slots__ = ["future", "remaining"]
+
+    def __init__(self, await_response: bool) -> None:
+        self.future: Future = Future()
+        self.remaining = 2 if await_response else 1
+
+
+class Pipeline:
+    """
+    Pipeline
+
+    Pipelined connection to a server: Requests are sent back to back without
+    waiting for the confirmation of the previous request, which saves a round
+    trip per request on high-latency links. The confirmations and responses
+    are received by a background thread and matched with the requests by
+    their id. Created by 'Client.pipeline'.
+    """
+
+    __slots__ = [
+        "cs",
+        "_ids",
+        "_pending",
+        "_closed",
+        "_lock",
+        "_send_lock",
+        "_reader",
+    ]
+
+    def __init__(self, cs: ClientSocket) -> None:
+        """
+        Initializes an object of type 'Pipeline'.
+
+        Parameters
+        ----------
+        cs : ClientSocket
+            Connected and authenticated client socket, on which the server
+            has confirmed pipelining.
+        """
+        self.cs = cs
+        self.cs.pipelined = True
+        self._ids = count()
+        self._pending: Dict[int, Request] = {}
+        self._closed = False
+        self._lock = Lock()
+        self._send_lock = Lock()
+        self._reader = Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def __repr__(self) -> str:
+        return f"Pipeline({self.cs.sock.getpeername()!r})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def execute(self, exec_args: dict, await_response: bool = False) -> Future:
+        """
+        Send a command to the server without waiting (see 'Client.execute').
+
+        Parameters
+        ----------
+        exec_args : dict
+            Arguments to send to the 'exec_task'.
+        await_response : bool, optional
+            Complete the request with the second 'custom' response of the
+            server instead of the confirmation, by default False.
+
+        Returns
+        -------
+        Future
+            Future of the response of the server (dict).
+
+        Raises
+        ------
+        ConnectionError
+            If the connection to the server is closed.
+        """
+        request = Request(await_response)
+
+        # The reader must not wait for a blocked send, it takes only '_lock'
+        with self._send_lock:
+            with self._lock:
+                if self._closed:
+                    raise ConnectionError("Pipeline is closed")
+                id_ = next(self._ids)
+                self._pending[id_] = request
+            self.cs.send(
+                Message(MessageType.EXEC, args=exec_args, id_=id_),
+                await_response=await_response,
+            )
+        return request.future
+
+    def close(self) -> None:
+        """
+        Close the pipeline after receiving the responses of all sent requests.
+        """
+        try:
+            self.cs.sock.shutdown(SHUT_WR)
+        except error:
+            pass
+        self._reader.join()
+        self.cs.close()
+
+    def _read(self) -> None:
+        while True:
+            msg = self.cs.recv_frame()
+            if msg is None:
+                break
+            id_ = msg.id
+            with self._lock:
+                request = None if id_ is None else self._pending.get(id_)
+                if id_ is None or request is None:
+                    self.cs.log.warning(
+                        "Received '%s' of unknown request", msg
+                    )
+                    continue
+                request.remaining -= 1
+                if request.remaining > 0:
+                    continue
+                del self._pending[id_]
+            request.future.set_result(msg.get_args())
+
+        # Fail the requests, which are not completed by the server
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for request in pending.values():
+            request.future.set_exception(
+                ConnectionError("Connection closed by the server")
+            )
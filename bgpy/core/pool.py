@@ -0,0 +1,90 @@
+from .environment import POOL_SIZE
+from .sockets import ClientSocket
+from queue import Empty, LifoQueue
+from threading import BoundedSemaphore
+from typing import Optional
+
+
+class ConnectionPool:
+    """
+    Connection pool
+
+    Thread-safe pool of persistent client sockets, which allows several
+    threads to share the authenticated connections of one client.
+    """
+
+    __slots__ = ["size", "_idle", "_slots"]
+
+    def __init__(self, size: int = POOL_SIZE) -> None:
+        """
+        Initializes an object of type 'ConnectionPool'.
+
+        Parameters
+        ----------
+        size : int, optional
+            Maximum number of connections in use at the same time,
+            by default POOL_SIZE.
+
+        Raises
+        ------
+        ValueError
+            If the size of the pool is smaller than 1.
+        """
+        if size < 1:
+            raise ValueError(f"Invalid pool size: {size}")
+        self.size = size
+        self._idle: LifoQueue = LifoQueue()
+        self._slots = BoundedSemaphore(size)
+
+    def __repr__(self) -> str:
+        return f"ConnectionPool({self.size!r})"
+
+    def __str__(self) -> str:
+        return f"Pool of {self._idle.qsize()}/{self.size} idle connections"
+
+    def acquire(self) -> Optional[ClientSocket]:
+        """
+        Take a connection from the pool.
+
+        Blocks until less than 'size' connections are in use. Idle connections
+        which have been closed by the server in the meantime are discarded.
+
+        Returns
+        -------
+        Optional[ClientSocket]
+            An idle connection or None, if a new connection has to be opened
+            by the caller.
+        """
+        self._slots.acquire()
+        while True:
+            try:
+                cs = self._idle.get_nowait()
+            except Empty:
+                return None
+            if cs.is_idle():
+                return cs
+            cs.close()
+
+    def release(self, cs: Optional[ClientSocket]) -> None:
+        """
+        Return a connection to the pool.
+
+        Parameters
+        ----------
+        cs : Optional[ClientSocket]
+            The connection to reuse or None, if the connection was closed.
+        """
+        if cs is not None:
+            self._idle.put(cs)
+        self._slots.release()
+
+    def close(self) -> None:
+        """
+        Close all idle connections of the pool.
+        """
+        while True:
+            try:
+                cs = self._idle.get_nowait()
+            except Empty:
+                return
+            cs.close()
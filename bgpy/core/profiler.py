@@ -0,0 +1,124 @@
+from .environment import PROFILE_LIMIT, PROFILE_SORT
+from io import StringIO
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable
+
+PROFILE_ACTIONS = ("start", "stop", "stats", "dump")
+_PROFILE_LOCK = Lock()  # Held while a call is profiled, one per process
+
+
+class TaskProfiler:
+    """
+    Profiles calls with cProfile, one call at a time: Only one profiler can
+    be active in a process (since Python 3.12), so calls running while
+    another call is profiled (or another profiler is active) run without
+    being profiled.
+    """
+
+    __slots__ = ["calls", "_profile"]
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._profile: Any = None  # Created on the first profiled call
+
+    def __repr__(self) -> str:
+        return f"TaskProfiler(calls={self.calls!r})"
+
+    def run(self, fn: Callable, *args) -> Any:
+        """
+        Call a function under the profile, if no other call is profiled.
+
+        Parameters
+        ----------
+        fn : Callable
+            Function to profile.
+        *args
+            Arguments of the function.
+
+        Returns
+        -------
+        Any
+            The return value of the function.
+        """
+        profile = self._enable()
+        if profile is None:
+            return fn(*args)
+        try:
+            return fn(*args)
+        finally:
+            profile.disable()
+            _PROFILE_LOCK.release()
+
+    def stats(
+        self, sort: str = PROFILE_SORT, limit: int = PROFILE_LIMIT
+    ) -> str:
+        """
+        Report the statistics of the profiled calls.
+
+        Parameters
+        ----------
+        sort : str, optional
+            Sort key of 'pstats' (e.g. 'cumulative', 'tottime' or 'calls'),
+            by default PROFILE_SORT.
+        limit : int, optional
+            Number of functions to report, by default PROFILE_LIMIT.
+
+        Returns
+        -------
+        str
+            The report of 'pstats', empty if nothing was profiled.
+        """
+        stream = StringIO()
+        stats = self._pstats(stream)
+        if stats is not None:
+            stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def dump(self, file: Path) -> bool:
+        """
+        Write the statistics to a file, which can be read with
+        'pstats' or visualized (e.g. with snakeviz).
+
+        Parameters
+        ----------
+        file : Path
+            Path to the file.
+
+        Returns
+        -------
+        bool
+            False if nothing was profiled and no file is written.
+        """
+        stats = self._pstats(StringIO())
+        if stats is None:
+            return False
+        stats.dump_stats(str(file))
+        return True
+
+    def _enable(self) -> Any:
+
+        # Take the profiler of the process, unless it is taken
+        if not _PROFILE_LOCK.acquire(blocking=False):
+            return None
+        if self._profile is None:
+            from cProfile import Profile  # Only if profiling is used
+
+            self._profile = Profile()
+        try:
+            self._profile.enable()
+        except ValueError:  # Another profiler is active
+            _PROFILE_LOCK.release()
+            return None
+        self.calls += 1
+        return self._profile
+
+    def _pstats(self, stream: StringIO) -> Any:
+
+        # Wait for the profiled call, the profile is not running meanwhile
+        from pstats import Stats
+
+        with _PROFILE_LOCK:
+            if self._profile is None:
+                return None
+            return Stats(self._profile, stream=stream)
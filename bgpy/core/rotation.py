@@ -0,0 +1,88 @@
+from gzip import open as gzip_open
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from os import remove, replace
+from pathlib import Path
+from shutil import copyfileobj
+from threading import Thread
+from typing import Callable, Optional
+
+
+class CompressingMixin:
+    """
+    Compresses the rotated log files with gzip in a background thread, so the
+    logging thread only renames the file. The next rollover waits for the
+    previous compression, the backups are shifted after it has completed.
+    """
+
+    _compression: Optional[Thread] = None
+    namer: Optional[Callable[[str], str]]
+    rotator: Optional[Callable[[str, str], None]]
+
+    def _set_compression(self, compress: bool) -> None:
+        if compress:
+            self.namer = lambda name: name + ".gz"
+            self.rotator = self._rotate_compressed
+
+    def doRollover(self) -> None:
+        self._join_compression()
+        super().doRollover()  # type: ignore
+
+    def close(self) -> None:
+        self._join_compression()
+        super().close()  # type: ignore
+
+    def _join_compression(self) -> None:
+        if self._compression is not None:
+            self._compression.join()
+            self._compression = None
+
+    def _rotate_compressed(self, source: str, dest: str) -> None:
+        uncompressed = dest[: -len(".gz")]
+        replace(source, uncompressed)
+        self._compression = Thread(
+            target=_compress, args=(uncompressed, dest), daemon=True
+        )
+        self._compression.start()
+
+
+class SizeRotatingFileHandler(CompressingMixin, RotatingFileHandler):
+    """
+    Rotates the log file when it reaches a size, optionally compressed.
+    Without backups, the log file is truncated.
+    """
+
+    def __init__(
+        self, file: Path, max_bytes: int, backup_count: int, compress: bool
+    ) -> None:
+        super().__init__(file, maxBytes=max_bytes, backupCount=backup_count)
+        self._set_compression(compress)
+
+    def doRollover(self) -> None:
+        if self.backupCount > 0:
+            super().doRollover()
+            return
+        self.mode = "w"
+        try:
+            super().doRollover()
+        finally:
+            self.mode = "a"
+
+
+class TimeRotatingFileHandler(CompressingMixin, TimedRotatingFileHandler):
+    """
+    Rotates the log file at time intervals (e.g. at 'midnight'), optionally
+    compressed.
+    """
+
+    def __init__(
+        self, file: Path, when: str, backup_count: int, compress: bool
+    ) -> None:
+        super().__init__(file, when=when, backupCount=backup_count)
+        self._set_compression(compress)
+
+
+def _compress(source: str, dest: str) -> None:
+    with open(source, "rb") as f_in, gzip_open(dest + ".tmp", "wb") as f_out:
+        copyfileobj(f_in, f_out)
+    replace(dest + ".tmp", dest)
+    remove(source)
@@ -0,0 +1,219 @@
+from .environment import (
+    SCHEDULER_CLIENT_QUEUE_SIZE,
+    SCHEDULER_PRIORITY,
+    SCHEDULER_QUEUE_SIZE,
+)
+from heapq import heappop, heappush
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# Negated priority, finish, seq, key of the client and the request
+Ticket = Tuple[int, float, int, Hashable, Any]
+
+
+class Scheduler:
+    """
+    Scheduler of the requests to the 'exec_task' of a server: A request waits
+    for one of the slots, the waiting request with the highest priority runs
+    next. Requests of the same priority are ordered by fair queuing, every
+    client gets a virtual finish time one turn after its previous request,
+    so a client sending many requests can not starve the others. Requests
+    are rejected at once, if the queue or the queue of the client is full.
+    The scheduler never blocks: The server takes the 'next' request, as long
+    as a slot is free, and 'release's the slot when the request has run.
+    """
+
+    __slots__ = [
+        "slots",
+        "queue_size",
+        "client_queue_size",
+        "rejected",
+        "_lock",
+        "_waiting",
+        "_running",
+        "_pending",
+        "_finish",
+        "_time",
+        "_seq",
+    ]
+
+    def __init__(
+        self,
+        slots: int = 1,
+        queue_size: int = SCHEDULER_QUEUE_SIZE,
+        client_queue_size: int = SCHEDULER_CLIENT_QUEUE_SIZE,
+    ) -> None:
+        """
+        Initializes an object of type 'Scheduler'.
+
+        Parameters
+        ----------
+        slots : int, optional
+            Number of requests running at the same time, by default 1.
+        queue_size : int, optional
+            Maximum number of requests waiting for a slot,
+            by default SCHEDULER_QUEUE_SIZE.
+        client_queue_size : int, optional
+            Maximum number of pending (waiting or running) requests of a
+            client, by default SCHEDULER_CLIENT_QUEUE_SIZE.
+
+        Raises
+        ------
+        ValueError
+            If the number of slots or a queue size is invalid.
+        """
+        if slots < 1:
+            raise ValueError(f"Invalid number of slots: {slots}")
+        if queue_size < 0:
+            raise ValueError(f"Invalid queue size: {queue_size}")
+        if client_queue_size < 1:
+            raise ValueError(f"Invalid client queue size: {client_queue_size}")
+        self.slots = slots
+        self.queue_size = queue_size
+        self.client_queue_size = client_queue_size
+        self.rejected = 0
+        self._lock = Lock()
+        self._waiting: List[Ticket] = []
+        self._running = 0
+        self._pending: Dict[Hashable, int] = {}
+        self._finish: Dict[Hashable, float] = {}  # Last finish per client
+        self._time = 0.0  # Virtual time, finish of the last started request
+        self._seq = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"Scheduler({self.slots!r}, {self.queue_size!r}, "
+            + f"{self.client_queue_size!r})"
+        )
+
+    def admit(
+        self,
+        client: Hashable,
+        request: Any = None,
+        priority: int = SCHEDULER_PRIORITY,
+        bounded: bool = True,
+    ) -> Ticket:
+        """
+        Add a request to the queue.
+
+        Parameters
+        ----------
+        client : Hashable
+            Key of the client sending the request (e.g. its connection).
+        request : Any, optional
+            The request, which is returned with its ticket by 'next',
+            by default None.
+        priority : int, optional
+            Priority of the request, higher priorities run first,
+            by default SCHEDULER_PRIORITY.
+        bounded : bool, optional
+            Reject the request if a queue is full, otherwise the request is
+            bounded by the caller (e.g. the jobs by the job store),
+            by default True.
+
+        Returns
+        -------
+        Ticket
+            The ticket of the request.
+
+        Raises
+        ------
+        ValueError
+            If the priority is not an integer or a queue is full.
+        """
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise ValueError(f"Invalid priority: {priority!r}")
+        with self._lock:
+            pending = self._pending.get(client, 0)
+            if bounded:
+                self._check_limits(pending)
+            finish = max(self._time, self._finish.get(client, 0.0)) + 1
+            self._finish[client] = finish
+            self._pending[client] = pending + 1
+            self._seq += 1
+            ticket = (-priority, finish, self._seq, client, request)
+            heappush(self._waiting, ticket)
+            return ticket
+
+    def _check_limits(self, pending: int) -> None:
+        if (
+            self._running >= self.slots
+            and len(self._waiting) >= self.queue_size
+        ):
+            self.rejected += 1
+            raise ValueError(
+                f"Request queue is full ({self.queue_size} requests)"
+            )
+        if pending >= self.client_queue_size:
+            self.rejected += 1
+            raise ValueError(
+                "Request queue of the client is full "
+                + f"({self.client_queue_size} requests)"
+            )
+
+    def next(self) -> Optional[Ticket]:
+        """
+        Take the next waiting request, if a slot is free.
+
+        Returns
+        -------
+        Optional[Ticket]
+            The ticket of the request, which runs on the slot until it is
+            released, or None if all slots are taken or no request waits.
+        """
+        with self._lock:
+            if self._running >= self.slots or not self._waiting:
+                return None
+            ticket = heappop(self._waiting)
+            self._running += 1
+            self._time = max(self._time, ticket[1])
+            return ticket
+
+    def release(self, ticket: Ticket) -> None:
+        """
+        Free the slot of a request, which has run.
+        """
+        with self._lock:
+            self._running -= 1
+            self._done(ticket[3])
+
+    def clear(self) -> List[Ticket]:
+        """
+        Remove all waiting requests (e.g. when the server exits).
+
+        Returns
+        -------
+        List[Ticket]
+            The tickets of the removed requests, in the order of the queue.
+        """
+        with self._lock:
+            tickets = sorted(self._waiting)
+            self._waiting.clear()
+            for ticket in tickets:
+                self._done(ticket[3])
+            return tickets
+
+    def _done(self, client: Hashable) -> None:
+        self._pending[client] -= 1
+        if self._pending[client] == 0:
+            del self._pending[client]
+            del self._finish[client]  # Starts at the virtual time again
+
+    def to_dict(self) -> dict:
+        """
+        State of the scheduler, as reported in the STATS message.
+
+        Returns
+        -------
+        dict
+            The number of slots, running and waiting requests, clients with
+            pending requests and rejected requests.
+        """
+        with self._lock:
+            return {
+                "slots": self.slots,
+                "running": self._running,
+                "waiting": len(self._waiting),
+                "clients": len(self._pending),
+                "rejected": self.rejected,
+            }
@@ -1,9 +1,392 @@
-from .message import Message
+from .environment import CODEC, SHM_THRESHOLD
+from .message import Message, MessageType
 from codecs import encode, decode
-from pickle import dumps, loads
+from json import dumps as json_dumps, loads as json_loads
+from os import name as os_name
+from pickle import dumps, loads, HIGHEST_PROTOCOL
+from struct import calcsize, pack, unpack_from
+from sys import version_info
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
+if TYPE_CHECKING:  # pragma: no cover
+    from multiprocessing.shared_memory import SharedMemory
 
-def serialize(x: Message) -> bytes:
+OOB_COUNT = "I"  # Number of out-of-band buffers
+OOB_SIZE = "Q"  # Size of an out-of-band buffer
+SHM_NAME = "B"  # Length of the name of a shared memory segment
+
+Encoded = Union[bytes, bytearray]  # Serialized or received message
+
+
+def _oob_format(count: int) -> str:
+    return "!" + OOB_COUNT + OOB_SIZE * count
+
+
+class Codec:
+    """
+    Codec
+
+    Base class of the codecs to serialize messages. Except for the legacy
+    'base64' codec, the first byte of a serialized message is the tag of the
+    codec, so the receiver can deserialize every message without knowing
+    the codec of the sender.
+    """
+
+    __slots__: List[str] = []
+
+    name = ""
+    tag = b""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+    def encode(self, x: Message) -> bytes:
+        """
+        Serializes a Python Message object.
+
+        Parameters
+        ----------
+        x : Message
+            A Python Message object.
+
+        Returns
+        -------
+        bytes
+            Bytes containing the serialized Python Message object.
+        """
+        raise NotImplementedError
+
+    def encode_buffers(self, x: Message) -> Tuple[bytes, List[memoryview]]:
+        """
+        Serializes a Python Message object, large buffers may be returned
+        separately to send them out-of-band without copying.
+
+        Parameters
+        ----------
+        x : Message
+            A Python Message object.
+
+        Returns
+        -------
+        Tuple[bytes, List[memoryview]]
+            Bytes containing the serialized Python Message object and the
+            out-of-band buffers.
+        """
+        return self.encode(x), []
+
+    def decode(
+        self, x: Encoded, buffers: Optional[Sequence[bytearray]] = None
+    ) -> Message:
+        """
+        Deserializes bytes to a Python Message object.
+
+        Parameters
+        ----------
+        x : bytes
+            Bytes containing a serialized Python Message object.
+        buffers : Optional[Sequence[bytearray]], optional
+            The out-of-band buffers of the message, by default None.
+
+        Returns
+        -------
+        Message
+            A Python Message object.
+        """
+        raise NotImplementedError
+
+
+class Base64Codec(Codec):
+    """
+    Pickled messages wrapped in base64, as sent by bgpy <= 0.3.1. Used for
+    the AUTH handshake, which negotiates the codec of the connection.
+    """
+
+    __slots__: List[str] = []
+
+    name = "base64"
+
+    def encode(self, x: Message) -> bytes:
+        return encode(dumps(x), "base64")
+
+    def decode(
+        self, x: Encoded, buffers: Optional[Sequence[bytearray]] = None
+    ) -> Message:
+        return loads(decode(x, "base64"))
+
+
+class PickleCodec(Codec):
+    """
+    Binary pickle with the highest protocol available.
+
+    With pickle protocol 5 (Python >= 3.8), contiguous buffers of objects
+    supporting out-of-band pickling (e.g. NumPy arrays or any bytes-like
+    object wrapped in a 'pickle.PickleBuffer') are returned separately by
+    'encode_buffers'. Their sizes are listed in front of the pickle, tagged
+    with 'oob_tag', so the receiver can read them into preallocated buffers.
+    """
+
+    __slots__: List[str] = []
+
+    name = "pickle"
+    tag = b"\x01"
+    oob_tag = b"\x03"
+
+    def encode(self, x: Message) -> bytes:
+        return self.tag + dumps(x, protocol=HIGHEST_PROTOCOL)
+
+    def encode_buffers(self, x: Message) -> Tuple[bytes, List[memoryview]]:
+        if HIGHEST_PROTOCOL < 5:
+            return self.encode(x), []
+        buffers: List[memoryview] = []
+
+        def buffer_callback(buffer) -> bool:
+            try:
+                buffers.append(buffer.raw())
+            except BufferError:
+                return True  # Not contiguous, serialize in-band
+            return False
+
+        data = dumps(x, protocol=5, buffer_callback=buffer_callback)
+        if not buffers:
+            return self.tag + data, []
+        sizes = [buffer.nbytes for buffer in buffers]
+        head = pack(_oob_format(len(sizes)), len(sizes), *sizes)
+        return self.oob_tag + head + data, buffers
+
+    def decode(
+        self, x: Encoded, buffers: Optional[Sequence[bytearray]] = None
+    ) -> Message:
+        view = memoryview(x)
+        if view[:1] == self.oob_tag:
+            offset = 1 + calcsize(_oob_format(len(buffers or [])))
+            return loads(view[offset:], buffers=buffers)
+        return loads(view[1:])
+
+
+class JSONCodec(Codec):
+    """
+    JSON for messages with plain data arguments (dict with str keys, list,
+    str, int, float, bool and None; tuples are received as lists). Messages,
+    which can not be represented in JSON (e.g. dict keys of other types,
+    which JSON would turn into strings), are pickled instead.
+    """
+
+    __slots__: List[str] = []
+
+    name = "json"
+    tag = b"\x02"
+
+    def encode(self, x: Message) -> bytes:
+        try:
+            data = self._dumps(x)
+        except (TypeError, ValueError):
+            return CODECS["pickle"].encode(x)
+        return self.tag + data.encode("utf-8")
+
+    def encode_buffers(self, x: Message) -> Tuple[bytes, List[memoryview]]:
+        try:
+            data = self._dumps(x)
+        except (TypeError, ValueError):
+            return CODECS["pickle"].encode_buffers(x)
+        return self.tag + data.encode("utf-8"), []
+
+    def decode(
+        self, x: Encoded, buffers: Optional[Sequence[bytearray]] = None
+    ) -> Message:
+        data = json_loads(x[1:])
+        return Message(
+            MessageType[data["type"]],
+            args=data["args"],
+            id_=data.get("id"),
+            trace=data.get("trace"),
+        )
+
+    def _dumps(self, x: Message) -> str:
+        _check_keys(x.args)
+        data: Dict[str, Any] = {"type": x.type.name, "args": x.args}
+        if x.id is not None:
+            data["id"] = x.id
+        if x.trace is not None:
+            data["trace"] = x.trace
+        return json_dumps(data)
+
+
+def _check_keys(x: Any) -> None:
+
+    # JSON converts the keys of objects to strings, e.g. {1: 2} to {"1": 2}
+    if isinstance(x, dict):
+        for key, value in x.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Key of type '{type(key).__name__}'")
+            _check_keys(value)
+    elif isinstance(x, (list, tuple)):
+        for value in x:
+            _check_keys(value)
+
+
+class SharedMemoryCodec(Codec):
+    """
+    Pickle, which passes large messages through shared memory between a
+    client and a server on the same host (POSIX, Python >= 3.8).
+
+    The pickle and its out-of-band buffers are copied into a named segment of
+    'multiprocessing.shared_memory', only a descriptor with the name of the
+    segment and the sizes is sent through the socket. The receiver copies the
+    data out of the segment and unlinks it, the sender unlinks the segment
+    if the message is not confirmed (see 'release_segment'). Messages smaller
+    than 'SHM_THRESHOLD' are sent as pickle.
+    """
+
+    __slots__: List[str] = []
+
+    name = "shm"
+    tag = b"\x04"
+
+    def encode(self, x: Message) -> bytes:
+        data, buffers = self.encode_buffers(x)
+        return CODECS[PickleCodec.name].encode(x) if buffers else data
+
+    def encode_buffers(self, x: Message) -> Tuple[bytes, List[memoryview]]:
+        data, buffers = CODECS[PickleCodec.name].encode_buffers(x)
+        parts = [memoryview(data), *buffers]
+        sizes = [part.nbytes for part in parts]
+        if sum(sizes) < SHM_THRESHOLD:
+            return data, buffers
+        try:
+            segment = _create_segment(sum(sizes))
+        except OSError:
+            return data, buffers  # E.g. no space left, send via socket
+        buf = cast(memoryview, segment.buf)  # Set while the segment is open
+        offset = 0
+        for part in parts:
+            buf[offset:offset + part.nbytes] = part
+            offset += part.nbytes
+        name = segment.name.encode("utf-8")
+        segment.close()
+        head = pack("!" + SHM_NAME, len(name)) + name
+        head += pack(_oob_format(len(sizes)), len(sizes), *sizes)
+        return self.tag + head, []
+
+    def decode(
+        self, x: Encoded, buffers: Optional[Sequence[bytearray]] = None
+    ) -> Message:
+        name, sizes = _segment_descriptor(x)
+        segment = _shared_memory()(name=name)
+        try:
+            parts = []
+            offset = 0
+            for size in sizes:
+                parts.append(bytearray(segment.buf[offset:offset + size]))
+                offset += size
+        finally:
+            segment.close()
+            segment.unlink()
+        return CODECS[PickleCodec.name].decode(parts[0], parts[1:])
+
+
+def _shared_memory() -> type:
+
+    # Imported on first use, multiprocessing is not needed by other codecs
+    from multiprocessing.shared_memory import SharedMemory
+
+    return SharedMemory
+
+
+def _create_segment(size: int) -> "SharedMemory":
+
+    # The receiver unlinks the segment, so it must not be tracked (and
+    # unlinked again at exit) by the resource tracker of the sender
+    try:
+        return _shared_memory()(create=True, size=size, track=False)
+    except TypeError:  # Python < 3.13
+        from multiprocessing import resource_tracker
+
+        segment = _shared_memory()(create=True, size=size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+def _segment_descriptor(x: Encoded) -> Tuple[str, List[int]]:
+    (length,) = unpack_from("!" + SHM_NAME, x, 1)
+    offset = 1 + calcsize("!" + SHM_NAME)
+    name = bytes(x[offset:offset + length]).decode("utf-8")
+    offset += length
+    (count,) = unpack_from(_oob_format(0), x, offset)
+    return name, list(unpack_from(_oob_format(count), x, offset)[1:])
+
+
+CODECS: Dict[str, Codec] = {
+    codec.name: codec for codec in [Base64Codec(), PickleCodec(), JSONCodec()]
+}
+if version_info >= (3, 8) and os_name == "posix":
+    CODECS[SharedMemoryCodec.name] = SharedMemoryCodec()
+TAGS: Dict[bytes, Codec] = {
+    codec.tag: codec for codec in CODECS.values() if codec.tag
+}
+TAGS[PickleCodec.oob_tag] = CODECS["pickle"]
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Gets a codec by its name.
+
+    Parameters
+    ----------
+    name : str
+        Name of the codec ('pickle', 'json', 'shm' or 'base64').
+
+    Returns
+    -------
+    Codec
+        The codec.
+
+    Raises
+    ------
+    ValueError
+        If no codec with this name exists.
+    """
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Invalid codec: {name}")
+
+
+def negotiate_codec(offered: List[str], local: bool = False) -> str:
+    """
+    Chooses the first codec offered by a client, which is available.
+
+    Parameters
+    ----------
+    offered : List[str]
+        Names of the codecs in the order of preference of the client.
+    local : bool, optional
+        The client runs on the same host, which is required by the 'shm'
+        codec, by default False.
+
+    Returns
+    -------
+    str
+        Name of the chosen codec, 'base64' if none of the codecs is available.
+    """
+    for name in offered:
+        if name == SharedMemoryCodec.name and not local:
+            continue
+        if name in CODECS:
+            return name
+    return Base64Codec.name
+
+
+def serialize(x: Message, codec: str = CODEC) -> bytes:
     """
     Serializes a Python Message object.
 
@@ -11,27 +394,101 @@ def serialize(x: Message) -> bytes:
     ----------
     x : object
         A Python Message object.
+    codec : str, optional
+        Name of the codec, by default CODEC.
 
     Returns
     -------
     bytes
         Bytes containing the serialized Python Message object.
     """
-    return encode(dumps(x), "base64")
+    return CODECS[codec].encode(x)
+
+
+def serialize_buffers(
+    x: Message, codec: str = CODEC
+) -> Tuple[bytes, List[memoryview]]:
+    """
+    Serializes a Python Message object, large buffers are returned separately
+    if supported by the codec.
+
+    Parameters
+    ----------
+    x : Message
+        A Python Message object.
+    codec : str, optional
+        Name of the codec, by default CODEC.
+
+    Returns
+    -------
+    Tuple[bytes, List[memoryview]]
+        Bytes containing the serialized Python Message object and the
+        out-of-band buffers, which have to be sent after the message.
+    """
+    return CODECS[codec].encode_buffers(x)
+
+
+def buffer_sizes(x: Encoded) -> List[int]:
+    """
+    Gets the sizes of the out-of-band buffers of a serialized message.
+
+    Parameters
+    ----------
+    x : bytes
+        Bytes containing a serialized Python Message object.
+
+    Returns
+    -------
+    List[int]
+        Sizes of the buffers in bytes, empty if the message has no
+        out-of-band buffers.
+    """
+    if bytes(x[:1]) != PickleCodec.oob_tag:
+        return []
+    (count,) = unpack_from(_oob_format(0), x, 1)
+    return list(unpack_from(_oob_format(count), x, 1)[1:])
 
 
-def deserialize(x: bytes) -> Message:
+def deserialize(
+    x: Encoded, buffers: Optional[Sequence[bytearray]] = None
+) -> Message:
     """
-    Deserializes bytes to a Python Message object.
+    Deserializes bytes to a Python Message object. The codec is detected from
+    the tag in the first byte.
 
     Parameters
     ----------
     x : bytes
         Bytes containing a serialized Python Message object.
+    buffers : Optional[Sequence[bytearray]], optional
+        The out-of-band buffers of the message, by default None.
 
     Returns
     -------
     object
         A python object.
     """
-    return loads(decode(x, "base64"))
+    codec = TAGS.get(bytes(x[:1]), CODECS[Base64Codec.name])
+    return codec.decode(x, buffers)
+
+
+def release_segment(x: Encoded) -> None:
+    """
+    Unlinks the shared memory segment of a serialized message, which has not
+    been received (the receiver unlinks the segment after reading it).
+
+    Parameters
+    ----------
+    x : bytes
+        Bytes containing a serialized Python Message object, messages without
+        a shared memory segment are ignored.
+    """
+    if bytes(x[:1]) != SharedMemoryCodec.tag:
+        return
+    name, _ = _segment_descriptor(x)
+    try:
+        segment = _shared_memory()(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
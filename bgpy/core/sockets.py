@@ -1,20 +1,118 @@
-from .environment import BACKLOG_SIZE, HEADER_SIZE, BUFFER_SIZE, BUFFER_TIME
+from .environment import (
+    BACKLOG_SIZE,
+    HEADER_SIZE,
+    BUFFER_SIZE,
+    BUFFER_TIME,
+    HANDSHAKE_CODEC,
+    UNIX_SCHEME,
+    UNIX_SOCKET_MODE,
+)
 from .log import Log
 from .message import Message, MessageType
-from .serialize import serialize, deserialize
+from .serialize import (
+    PickleCodec,
+    SharedMemoryCodec,
+    serialize_buffers,
+    buffer_sizes,
+    deserialize,
+    release_segment,
+)
+from .tracing import Trace
 from contextlib import ContextDecorator
+from ipaddress import ip_address
+from os import chmod, umask, unlink
 from pathlib import Path
+from select import select
 from socket import (
     AF_INET,
+    AF_INET6,
     error,
     SHUT_WR,
     SO_REUSEADDR,
     SOCK_STREAM,
     socket,
     SOL_SOCKET,
+    IPPROTO_TCP,
+    TCP_NODELAY,
 )
-from time import sleep
-from typing import Optional
+from stat import S_ISSOCK
+from time import monotonic, sleep, time
+from typing import List, Optional
+
+try:
+    from socket import AF_UNIX
+except ImportError:  # pragma: no cover
+    AF_UNIX = None  # type: ignore
+
+
+def unix_path(host: str) -> Optional[str]:
+    """
+    Gets the path of a Unix domain socket from an address.
+
+    Parameters
+    ----------
+    host : str
+        Address or name of the host, or 'unix:///path' to a socket file.
+
+    Returns
+    -------
+    Optional[str]
+        Path of the socket file or None if the address is not a Unix domain
+        socket address.
+
+    Raises
+    ------
+    ValueError
+        If Unix domain sockets are not supported on this platform.
+    """
+    if not host.startswith(UNIX_SCHEME):
+        return None
+    if AF_UNIX is None:
+        raise ValueError("Unix domain sockets are not supported")
+    return host[len(UNIX_SCHEME):]
+
+
+def peer_name(sock: socket) -> str:
+    """
+    Gets the address of the remote socket for the logs.
+
+    Parameters
+    ----------
+    sock : socket
+        A connected socket.
+
+    Returns
+    -------
+    str
+        'host:port' or 'unix://path' of the remote socket.
+    """
+    if sock.family in (AF_INET, AF_INET6):
+        host, port = sock.getpeername()[:2]
+        return f"{host}:{port}"
+    return f"{UNIX_SCHEME}{sock.getpeername() or sock.getsockname()}"
+
+
+def is_local(sock: socket) -> bool:
+    """
+    Checks if the remote socket is on the same host.
+
+    Parameters
+    ----------
+    sock : socket
+        A connected socket.
+
+    Returns
+    -------
+    bool
+        True for Unix domain sockets and connections over the loopback
+        interface.
+    """
+    if sock.family not in (AF_INET, AF_INET6):
+        return True
+    try:
+        return ip_address(sock.getpeername()[0]).is_loopback
+    except (error, ValueError):
+        return False
 
 
 class ClientSocket(ContextDecorator):
@@ -24,20 +122,36 @@ class ClientSocket(ContextDecorator):
     Stream socket used on the client and the server to communciate.
     """
 
-    __slots__ = ["sock", "log"]
+    __slots__ = [
+        "sock",
+        "log",
+        "buffer_size",
+        "buffer_time",
+        "codec",
+        "pipelined",
+        "request_id",
+        "bytes_sent",
+        "bytes_received",
+        "errors_sent",
+        "trace",
+        "pending",
+    ]
 
     def __init__(
         self,
-        sock: socket = None,
+        sock: Optional[socket] = None,
         log_level: str = "WARNING",
         log_file: Optional[Path] = None,
+        buffer_size: int = BUFFER_SIZE,
+        buffer_time: float = BUFFER_TIME,
+        codec: str = HANDSHAKE_CODEC,
     ) -> None:
         """
         Initializes a object of type 'ClientSocket'.
 
         Parameters
         ----------
-        sock : socket, optional
+        sock : Optional[socket], optional
             An existing stream socket to use or None to create a new one,
             by default None.
         log_level : str, optional
@@ -45,24 +159,118 @@ class ClientSocket(ContextDecorator):
             by default WARNING.
         log_file : Optional[Path], optional
             Path to the file for writing the logs, by default None.
+        buffer_size : int, optional
+            Maximum number of bytes read from the network buffer at once,
+            by default BUFFER_SIZE.
+        buffer_time : float, optional
+            Time in seconds to sleep after sending or receiving a message. The
+            message boundaries are defined by the length prefix alone, so this
+            is only useful to reproduce the timing of older versions,
+            by default BUFFER_TIME.
+        codec : str, optional
+            Codec to serialize the sent messages, which is usually negotiated
+            in the AUTH handshake. Received messages are deserialized with the
+            codec of the sender, by default HANDSHAKE_CODEC.
+
+        Raises
+        ------
+        ValueError
+            If the buffer size is not positive.
         """
+        if buffer_size < 1:
+            raise ValueError(f"Invalid buffer size: {buffer_size}")
+        self.buffer_size = buffer_size
+        self.buffer_time = buffer_time
+        self.codec = codec
+        self.pipelined = False
+        self.request_id: Optional[int] = None
+        self.bytes_sent = 0  # Counters for the metrics of the server
+        self.bytes_received = 0
+        self.errors_sent = 0
+        self.trace: Optional[Trace] = None  # Trace of the current request
+        self.pending: Optional[Message] = None  # Deferred confirmation
         if sock is None:
             self.log = Log(__name__, log_level, "Client", log_file)
             self.sock = socket(AF_INET, SOCK_STREAM)
+            self.sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
         else:
             self.log = Log(__name__, log_level, "Server", log_file)
             self.sock = sock
-            host, port = self.sock.getpeername()
-            self.log.info(f"ClientSocket connected to '{host}:{port}'")
+            if self.sock.family in (AF_INET, AF_INET6):
+                self.sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+            if self.log.is_enabled("INFO"):  # Skip the lookup of the peer
+                self.log.info(
+                    "ClientSocket connected to '%s'", peer_name(self.sock)
+                )
 
     def __enter__(self):
         return self
 
     def __exit__(self, *exc):
-        self.sock.shutdown(SHUT_WR)
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Shut down the connection and close the socket.
+        """
+        try:
+            self.sock.shutdown(SHUT_WR)
+        except error:
+            pass
         self.sock.close()
         self.log.info("ClientSocket closed")
-        return False
+
+    def is_idle(self) -> bool:
+        """
+        Check if the socket is still connected and idle.
+
+        A persistent connection is idle if it is open and no data is pending
+        in the network buffer. If the remote socket has been closed in the
+        meantime, the socket is readable (EOF) and therefore not idle.
+
+        Returns
+        -------
+        bool
+            True if the socket can be reused for a new request.
+        """
+        try:
+            readable, _, _ = select([self.sock], [], [], 0)
+        except (error, ValueError):
+            return False
+        return not readable
+
+    def wait_closed(self, timeout: float) -> bool:
+        """
+        Shut down the writing end of the connection and wait until the remote
+        socket closes the connection, data received in the meantime is
+        discarded (e.g. unconfirmed responses).
+
+        Parameters
+        ----------
+        timeout : float
+            Maximum time to wait in seconds.
+
+        Returns
+        -------
+        bool
+            True if the connection has been closed within the timeout.
+        """
+        deadline = monotonic() + timeout
+        try:
+            self.sock.shutdown(SHUT_WR)
+        except error:
+            return True
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                readable, _, _ = select([self.sock], [], [], remaining)
+                if readable and not self.sock.recv(self.buffer_size):
+                    return True
+            except (error, ValueError):
+                return True
 
     def connect(self, host: str, port: int) -> None:
         """
@@ -71,9 +279,10 @@ class ClientSocket(ContextDecorator):
         Parameters
         ----------
         host : str, optional
-            Address or name of the host
+            Address or name of the host, or 'unix:///path' to connect to the
+            socket file of a server on the same host.
         port : int, optional
-            Port on the host to connect to
+            Port on the host to connect to, ignored for Unix domain sockets.
 
         Raises
         ------
@@ -81,10 +290,19 @@ class ClientSocket(ContextDecorator):
             If the socket connection fails, the error is also written to the
             logs and raised.
         """
+        path = unix_path(host)
         try:
-            self.sock.connect((host, port))
-            host, port = self.sock.getpeername()
-            self.log.info(f"ClientSocket connected to '{host}:{port}'")
+            if path is None:
+                self.sock.connect((host, port))
+            else:
+                if self.sock.family != AF_UNIX:
+                    self.sock.close()
+                    self.sock = socket(AF_UNIX, SOCK_STREAM)
+                self.sock.connect(path)
+            if self.log.is_enabled("INFO"):
+                self.log.info(
+                    "ClientSocket connected to '%s'", peer_name(self.sock)
+                )
         except error as e:
             self.log.exception("ClientSocket failed to connected")
             raise error(e)
@@ -101,10 +319,24 @@ class ClientSocket(ContextDecorator):
         receiving the confirmation, the socket waits for another response by
         the remote client socket, which is again confirmed if received.
 
+        With the 'shm' codec, the shared memory segment of a large message is
+        unlinked by the remote client socket when receiving the message, or
+        otherwise by this socket when the confirmation does not arrive.
+
+        On a pipelined connection, the message is sent with the id of the
+        request received last and the method returns without waiting for a
+        confirmation, since the remote client socket is reading further
+        requests and responses concurrently.
+
+        If a 'trace' is set, the message carries the trace context and the
+        phases (serialize, send, confirm and response) are recorded as spans,
+        the spans of the server in the replies are added to the trace.
+
         Note
         ----
         If 'await_response' is set to True, but the remote client socket is not
-        sending a response, this socket is waiting forever.
+        sending a response, this socket is waiting forever. A confirmation of
+        type ERROR (e.g. a rejected request) is returned without waiting.
 
         Parameters
         ----------
@@ -119,119 +351,316 @@ class ClientSocket(ContextDecorator):
         Message
             The confirmation message of the remote client socket. Or, if
             'await_response' is set to True, a custom response from the remote
-            client socket.
+            client socket. None on a pipelined connection.
         """
-        self.log.info(f"Sending '{msg}'")
+        self.log.info("Sending '%s'", msg)
         args = msg.get_args()
         args["await_response"] = await_response
         msg.set_args(args)
-        msg_enc = serialize(msg)
-        self._buffered_send(msg_enc)
-        res_enc = self._buffered_recv()
-        if res_enc is None:
+        if self.pipelined:
+            if msg.id is None:
+                msg.id = self.request_id
+            self.send_frame(msg)
+            return None
+        res = self._send_confirmed(msg)
+        if res is None:
             return None
-        res = deserialize(res_enc)
         if res.type is MessageType.ERROR:
-            self.log.error(f"Received '{res}': {res.get_args()}")
+            self.log.error("Received '%s': %s", res, res.get_args())
         else:
-            self.log.info(f"Received '{res}'")
-        if await_response:
+            self.log.info("Received '%s'", res)
+        if await_response and res.type is not MessageType.ERROR:
             self.log.info("Waiting for response")
             res_2 = self.recv()
-            if res_2 is None:
-                return None
-            else:
-                return res_2
+            if self.trace is not None:
+                self.trace.lap("response")
+            return res_2
         return res
 
-    def _buffered_send(self, msg: bytes) -> None:
+    def _send_confirmed(self, msg: Message) -> Optional[Message]:
+        if msg.type is MessageType.ERROR:
+            self.errors_sent += 1
+        trace = self.trace
+        if trace is not None:
+            msg.trace = trace.context()
+            trace.mark()
+        msg_enc, buffers = serialize_buffers(msg, self.codec)
+        if trace is not None:
+            trace.lap("serialize")
+        self._buffered_send(msg_enc, buffers)
+        if trace is not None:
+            trace.lap("send")
+        res = self._recv_message()
+        release_segment(msg_enc)
+        if res is not None and trace is not None:
+            trace.lap("confirm")
+            if res.trace is not None:
+                trace.merge(res.trace)
+        return res
+
+    def send_frame(self, msg: Message) -> bool:
+        """
+        Send a message without waiting for a confirmation.
+
+        Used for sequences of messages, which are read by the remote client
+        socket using 'recv_frame' (e.g. the items of a stream). Frames are
+        never passed through shared memory, the 'shm' codec sends them as
+        pickle.
+
+        Parameters
+        ----------
+        msg : Message
+            Message to send to the remote client socket.
+
+        Returns
+        -------
+        bool
+            False if sending failed (e.g. the remote socket is closed).
+        """
+        self.log.debug("Sending frame '%s'", msg)
+        return self._send_message(msg)
+
+    def recv_frame(self) -> Optional[Message]:
+        """
+        Receive a message without confirming it.
+
+        Returns
+        -------
+        Optional[Message]
+            The received message or None if the remote socket is closed.
+        """
+        msg = self._recv_message()
+        if msg is not None:
+            self.log.debug("Received frame '%s'", msg)
+        return msg
+
+    def _send_message(self, msg: Message) -> bool:
+
+        # Without a confirmation, a shared memory segment could not be
+        # released if the message is never received
+        codec = self.codec
+        if codec == SharedMemoryCodec.name:
+            codec = PickleCodec.name
+        if msg.type is MessageType.ERROR:
+            self.errors_sent += 1
+        msg_enc, buffers = serialize_buffers(msg, codec)
+        return self._buffered_send(msg_enc, buffers)
+
+    def _recv_message(self) -> Optional[Message]:
+        msg_enc = self._buffered_recv()
+        if msg_enc is None:
+            return None
+        buffers = []
+        for size in buffer_sizes(msg_enc):
+            buffer = bytearray(size)
+            if not self._recv_into(buffer):
+                return None
+            buffers.append(buffer)
+        return deserialize(msg_enc, buffers)
+
+    def _buffered_send(
+        self, msg: bytes, buffers: List[memoryview] = []
+    ) -> bool:
         """
         Send message with header.
 
         Adds a header with the messages length to the message as prefix and
         sends the message to the network buffer of a connected client socket.
+        The out-of-band buffers of the message are sent afterwards without
+        header and without copying, their sizes are part of the message.
 
         Parameters
         ----------
         msg : bytes
             The message to send (all types) with arguments as bytes.
+        buffers : List[memoryview], optional
+            Out-of-band buffers of the message, by default [].
 
         Returns
         -------
-            None
+            bool: False if sending the message failed.
         """
         msg = bytes(f"{len(msg):<{HEADER_SIZE}}", "utf-8") + msg
         try:
             self.sock.sendall(msg)
+            self.bytes_sent += len(msg)
+            for buffer in buffers:
+                self.sock.sendall(buffer)
+                self.bytes_sent += memoryview(buffer).nbytes
         except Exception:
             self.log.exception("Sending message failed")
-            pass
-        sleep(BUFFER_TIME)
+            return False
+        if self.buffer_time > 0:
+            sleep(self.buffer_time)
+        return True
 
-    def recv(self) -> Optional[Message]:
+    def recv(
+        self, queued: Optional[float] = None, defer: bool = False
+    ) -> Optional[Message]:
         """
         Receive message from client socket.
 
         Receive a message from the connected client socket, by reading the
-        network buffer.
+        network buffer. The confirmation repeats the id of the message, which
+        is kept as 'request_id' for the responses.
+
+        A traced message starts the 'trace' of the request on this side, the
+        confirmation carries the spans of receiving (and queueing) it. The
+        responses to a traced request add the spans of the remote side.
+
+        The confirmation of an EXEC message with 'await_result' is deferred
+        as 'pending' and sent by 'confirm', with the result of the task.
+
+        Parameters
+        ----------
+        queued : Optional[float], optional
+            Unix time when the connection became readable, the time until the
+            message is received is traced as queueing, by default None.
+        defer : bool, optional
+            Defer the confirmation of every EXEC message (e.g. until the
+            request is admitted by a scheduler), by default False.
 
         Returns
         -------
         Optional[Message]
             A message of type OK or Error.
         """
-        msg_enc = self._buffered_recv()
-        if msg_enc is None:
+        start = time()
+        msg = self._recv_message()
+        if msg is None:
             return None
-        msg = deserialize(msg_enc)
         res_msg = f"Received '{msg}'"
         if msg.type is MessageType.ERROR:
-            self.log.error(f"{res_msg}: {msg.get_args()}")
+            self.log.error("%s: %s", res_msg, msg.get_args())
         else:
             self.log.info(res_msg)
-        res = Message(MessageType.OK, args={"message": res_msg})
-        self.log.info(f"Responding '{res}'")
-        res_enc = serialize(res)
-        self._buffered_send(res_enc)
+        self.request_id = msg.id
+        self._trace_received(msg, start, queued)
+        res = Message(
+            MessageType.OK,
+            args={"message": res_msg},
+            id_=msg.id,
+            trace=None if self.trace is None else self.trace.context(),
+        )
+        if (
+            msg.type is MessageType.EXEC
+            and not self.pipelined
+            and (defer or msg.get_args().get("await_result", False))
+        ):
+            self.pending = res
+            return msg
+        self.log.info("Responding '%s'", res)
+        self._send_message(res)
         return msg
 
-    def _buffered_recv(self) -> Optional[bytes]:
+    def confirm(self, reply: Optional[Message] = None) -> bool:
+        """
+        Send the deferred confirmation of the message received last.
+
+        Parameters
+        ----------
+        reply : Optional[Message], optional
+            Message to send instead of the confirmation (e.g. the result of
+            the task), which repeats the id of the received message,
+            by default None.
+
+        Returns
+        -------
+        bool
+            False if no confirmation is pending or sending failed.
+        """
+        res, self.pending = self.pending, None
+        if res is None:
+            return False
+        if reply is not None:
+            reply.id = res.id
+            res = reply
+        if self.trace is not None:
+            res.trace = self.trace.context()
+        self.log.info("Responding '%s'", res)
+        return self._send_message(res)
+
+    def _trace_received(
+        self, msg: Message, start: float, queued: Optional[float]
+    ) -> None:
+
+        # A response to a traced request of this side
+        trace = self.trace
+        if trace is not None and trace.side == "client":
+            if msg.trace is not None:
+                trace.merge(msg.trace)
+            return
+
+        # Continue the trace of the remote side, if the request is traced
+        if msg.trace is None:
+            self.trace = None
+            return
+        self.trace = trace = Trace(msg.trace["id"], side="server")
+        if queued is not None:
+            trace.add("queue", queued, start)
+        trace.add("recv", start, time())
+
+    def _buffered_recv(self) -> Optional[bytearray]:
         """
         Receive message from network buffer.
 
-        Reads chunks with length 'BUFFER_SIZE' from the network buffer.
-        In the header with size 'HEADER_SIZE' of the first chunk, the total
-        message length is stored. Chunks are received until the total message
-        length is reached. Then, the function returns the message without the
-        header of the first chunk. If the remote socket is closed (msg == b""),
-        None is returned.
+        Reads the header with size 'HEADER_SIZE' from the network buffer, in
+        which the total message length is stored. Then, a buffer of exactly
+        this length is allocated once and filled in chunks of at most
+        'buffer_size' bytes, so the length prefix alone marks the message
+        boundary and the method returns as soon as the message has arrived.
+        If the remote socket is closed, None is returned.
 
         Returns
         -------
-            bytes or None: The concatenated message from the network buffer or
-            None if the remote socket is closed.
+            bytearray or None: The message from the network buffer without
+            the header or None if the remote socket is closed.
         """
-        msg = b""
-        chunk_count = 0
-        while True:
-            chunk_count += 1
+        header = bytearray(HEADER_SIZE)
+        if not self._recv_into(header):
+            return None
+        msg_len = int(header)
+        self.log.debug("Detected message header, length=%s", msg_len)
+        msg = bytearray(msg_len)
+        if not self._recv_into(msg):
+            return None
+        if self.buffer_time > 0:
+            sleep(self.buffer_time)
+        return msg
+
+    def _recv_into(self, buffer: bytearray) -> bool:
+        """
+        Receive directly into a preallocated buffer.
+
+        The buffer is filled with 'recv_into' in chunks of at most
+        'buffer_size' bytes, without creating intermediate bytes objects.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            Buffer to fill completely with bytes from the network buffer.
+
+        Returns
+        -------
+        bool
+            False if the remote socket is closed before the buffer is filled.
+        """
+        view = memoryview(buffer)
+        received = 0
+        while received < len(view):
             try:
-                chunk = self.sock.recv(BUFFER_SIZE)
+                size = min(len(view) - received, self.buffer_size)
+                n = self.sock.recv_into(view[received:], size)
             except Exception:
                 self.log.exception(
-                    f"Receiving message chunk '{chunk_count}' failed"
+                    f"Receiving message failed after '{received}' bytes"
                 )
-                return None
-            if chunk == b"":
-                return None
-            if chunk_count == 1:
-                msg_len = int(chunk[:HEADER_SIZE])
-                self.log.debug(f"Detected chunk header, length={msg_len}")
-            msg += chunk
-            if len(msg) - HEADER_SIZE == msg_len:
-                self.log.debug(f"Message complete with chunks={chunk_count}")
-                sleep(BUFFER_TIME)
-                return msg[HEADER_SIZE:]
+                return False
+            if n == 0:
+                return False
+            received += n
+            self.bytes_received += n
+        return True
 
 
 class ServerSocket(ContextDecorator):
@@ -241,9 +670,11 @@ class ServerSocket(ContextDecorator):
     Socket used on the server to listen on a port for requests.
     If the server accepts a connection request a new client socket for the
     communication is created, which binds to the client socket on the client.
+    With an address 'unix:///path', the server socket listens on a Unix
+    domain socket file instead, which is only accessible by the owner.
     """
 
-    __slots__ = ["sock", "log"]
+    __slots__ = ["sock", "log", "path"]
 
     def __init__(
         self,
@@ -259,9 +690,11 @@ class ServerSocket(ContextDecorator):
         Parameters
         ----------
         host : str, optional
-            Address or name of the host, by default BG_HOST
+            Address or name of the host, or 'unix:///path' of a socket file,
+            by default BG_HOST
         port : int, optional
-            Port on the host to listen to, by default BG_PORT
+            Port on the host to listen to (ignored for Unix domain sockets),
+            by default BG_PORT
         backlog : int, optional
             Size of the backlog/queue of clients on the server,
             by default BG_BACKLOG
@@ -278,15 +711,31 @@ class ServerSocket(ContextDecorator):
             the logs and raised.
         """
         self.log = Log(__name__, log_level, "Server", log_file)
-        self.sock = socket(AF_INET, SOCK_STREAM)
-        self.sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+        self.path = unix_path(host)
+        address = host if self.path else f"{host}:{port}"
         try:
-            self.sock.bind((host, port))
-            self.log.info(f"ServerSocket listening to '{host}:{port}'")
+            if self.path is None:
+                self.sock = socket(AF_INET, SOCK_STREAM)
+                self.sock.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+                self.sock.bind((host, port))
+            else:
+                self.sock = socket(AF_UNIX, SOCK_STREAM)
+                self._remove_stale(self.path)
+
+                # Create the socket file with the mode, so it is never
+                # accessible by others
+                mask = umask(~UNIX_SOCKET_MODE & 0o777)
+                try:
+                    self.sock.bind(self.path)
+                finally:
+                    umask(mask)
+                chmod(self.path, UNIX_SOCKET_MODE)
+            if self.path is None:
+                address = f"{host}:{self.sock.getsockname()[1]}"  # Port 0
+            self.log.info(f"ServerSocket listening to '{address}'")
         except error as e:
-            self.log.exception(
-                f"ServerSocket failed to bind to '{host}:{port}'"
-            )
+            self.log.exception(f"ServerSocket failed to bind to '{address}'")
+            self.sock.close()
             raise error(e)
         self.sock.listen(backlog)
 
@@ -295,9 +744,28 @@ class ServerSocket(ContextDecorator):
 
     def __exit__(self, *exc):
         self.sock.close()
+        if self.path is not None:
+            try:
+                unlink(self.path)
+            except OSError:
+                pass
         self.log.info("ServerSocket closed")
         return False
 
+    @staticmethod
+    def _remove_stale(path: str) -> None:
+
+        # Remove the socket file of a server, which is not running anymore
+        try:
+            if not S_ISSOCK(Path(path).stat().st_mode):
+                return
+        except OSError:
+            return
+        with socket(AF_UNIX, SOCK_STREAM) as probe:
+            if probe.connect_ex(path) == 0:
+                return
+        unlink(path)
+
     def accept(self) -> socket:
         """
         Accepts connection requests from client sockets and creates a client
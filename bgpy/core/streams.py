@@ -0,0 +1,205 @@
+from .environment import HEADER_SIZE, HANDSHAKE_CODEC
+from .log import Log
+from .message import Message, MessageType
+from .serialize import serialize_buffers, buffer_sizes, deserialize
+from .sockets import unix_path
+from asyncio import (
+    IncompleteReadError,
+    StreamReader,
+    StreamWriter,
+    open_connection,
+    open_unix_connection,
+)
+from typing import Optional
+
+
+class StreamSocket:
+    """
+    Stream socket
+
+    Asynchronous counterpart of the 'ClientSocket' based on asyncio streams,
+    which speaks the same protocol (framing, confirmations and responses).
+    """
+
+    __slots__ = ["reader", "writer", "log", "codec"]
+
+    def __init__(
+        self, reader: StreamReader, writer: StreamWriter, log: Log
+    ) -> None:
+        """
+        Initializes a object of type 'StreamSocket'.
+
+        Parameters
+        ----------
+        reader : StreamReader
+            Reading end of the connection.
+        writer : StreamWriter
+            Writing end of the connection.
+        log : Log
+            Logger of the stream socket, which is shared by all connections
+            of a server or client.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.log = log
+        self.codec = HANDSHAKE_CODEC
+
+    def __repr__(self) -> str:
+        return f"StreamSocket({self.writer.get_extra_info('peername')!r})"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        return False
+
+    @classmethod
+    async def connect(cls, host: str, port: int, log: Log) -> "StreamSocket":
+        """
+        Connect to port on host.
+
+        Parameters
+        ----------
+        host : str
+            Address or name of the host, or 'unix:///path' of a socket file.
+        port : int
+            Port on the host to connect to, ignored for Unix domain sockets.
+        log : Log
+            Logger of the stream socket.
+
+        Returns
+        -------
+        StreamSocket
+            The connected stream socket.
+
+        Raises
+        ------
+        OSError
+            If the connection fails, the error is also written to the logs
+            and raised.
+        """
+        path = unix_path(host)
+        try:
+            if path is None:
+                reader, writer = await open_connection(host, port)
+            else:
+                reader, writer = await open_unix_connection(path)
+        except OSError:
+            log.exception("StreamSocket failed to connected")
+            raise
+        address = host if path else f"{host}:{port}"
+        log.info("StreamSocket connected to '%s'", address)
+        return cls(reader, writer, log)
+
+    async def close(self) -> None:
+        """
+        Close the connection.
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+        self.log.info("StreamSocket closed")
+
+    async def send(
+        self, msg: Message, await_response: bool = False
+    ) -> Optional[Message]:
+        """
+        Send a message to the remote socket.
+
+        Sends the message and waits for the confirmation. If 'await_response'
+        is set to True, another response of the remote socket is awaited and
+        confirmed (see 'ClientSocket.send').
+
+        Parameters
+        ----------
+        msg : Message
+            Message to send to the remote socket.
+        await_response : bool, optional
+            Waits for another response by the remote socket, by default False.
+
+        Returns
+        -------
+        Optional[Message]
+            The confirmation or, if 'await_response' is True, the response of
+            the remote socket. None if the remote socket is closed.
+        """
+        self.log.info("Sending '%s'", msg)
+        args = msg.get_args()
+        args["await_response"] = await_response
+        msg.set_args(args)
+        await self._send_message(msg)
+        res = await self._recv_message()
+        if res is None:
+            return None
+        if res.type is MessageType.ERROR:
+            self.log.error("Received '%s': %s", res, res.get_args())
+        else:
+            self.log.info("Received '%s'", res)
+        if await_response:
+            self.log.info("Waiting for response")
+            return await self.recv()
+        return res
+
+    async def recv(self) -> Optional[Message]:
+        """
+        Receive a message from the remote socket and confirm it.
+
+        Returns
+        -------
+        Optional[Message]
+            The received message or None if the remote socket is closed.
+        """
+        msg = await self._recv_message()
+        if msg is None:
+            return None
+        res_msg = f"Received '{msg}'"
+        if msg.type is MessageType.ERROR:
+            self.log.error("%s: %s", res_msg, msg.get_args())
+        else:
+            self.log.info(res_msg)
+        res = Message(MessageType.OK, args={"message": res_msg})
+        self.log.info("Responding '%s'", res)
+        await self._send_message(res)
+        return msg
+
+    async def send_frame(self, msg: Message) -> None:
+        """
+        Send a message without waiting for a confirmation (see
+        'ClientSocket.send_frame').
+
+        Parameters
+        ----------
+        msg : Message
+            Message to send to the remote socket.
+        """
+        self.log.debug("Sending frame '%s'", msg)
+        await self._send_message(msg)
+
+    async def _send_message(self, msg: Message) -> None:
+        msg_enc, buffers = serialize_buffers(msg, self.codec)
+        self.writer.write(
+            bytes(f"{len(msg_enc):<{HEADER_SIZE}}", "utf-8") + msg_enc
+        )
+        for buffer in buffers:
+            self.writer.write(buffer)
+        try:
+            await self.writer.drain()
+        except OSError:
+            self.log.exception("Sending message failed")
+
+    async def _recv_message(self) -> Optional[Message]:
+        try:
+            header = await self.reader.readexactly(HEADER_SIZE)
+            msg_len = int(header)
+            self.log.debug("Detected message header, length=%s", msg_len)
+            msg_enc = await self.reader.readexactly(msg_len)
+            buffers = [
+                bytearray(await self.reader.readexactly(size))
+                for size in buffer_sizes(msg_enc)
+            ]
+        except (IncompleteReadError, OSError):
+            return None
+        return deserialize(msg_enc, buffers)
@@ -0,0 +1,43 @@
+from importlib import util
+from pathlib import Path
+from sys import modules
+from typing import Callable, Tuple
+
+TASKS_MODULE = "bgpy.custom.tasks"
+
+
+def load_tasks(init_file: Path) -> Tuple[Callable, Callable, Callable]:
+    """
+    Loads the tasks of a server from a file.
+
+    The file is imported as module 'bgpy.custom.tasks', which is also
+    registered in 'sys.modules', so the tasks can be pickled by reference.
+
+    Parameters
+    ----------
+    init_file : Path
+        Path to a file containing the 'init_task', 'exec_task' and
+        'exit_task' functions.
+
+    Returns
+    -------
+    Tuple[Callable, Callable, Callable]
+        The 'init_task', 'exec_task' and 'exit_task' functions.
+
+    Raises
+    ------
+    ImportError
+        If the file can not be loaded as a module.
+    AssertionError
+        If one of the tasks is not defined as a callable in the file.
+    """
+    spec = util.spec_from_file_location(TASKS_MODULE, init_file)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load tasks from '{init_file}'")
+    tasks = util.module_from_spec(spec)
+    spec.loader.exec_module(tasks)
+    assert callable(tasks.init_task)
+    assert callable(tasks.exec_task)
+    assert callable(tasks.exit_task)
+    modules[TASKS_MODULE] = tasks
+    return tasks.init_task, tasks.exec_task, tasks.exit_task
@@ -1,6 +1,5 @@
 from .environment import ENV_TOKEN
 from os import environ
-from secrets import token_urlsafe
 from typing import Optional
 
 
@@ -18,6 +17,8 @@ def token_create(length: int = 64) -> str:
     str
         The token.
     """
+    from secrets import token_urlsafe  # Only needed to create tokens
+
     return token_urlsafe(length)
 
 
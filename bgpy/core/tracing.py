@@ -0,0 +1,368 @@
+from .environment import TRACE_LIMIT
+from collections import deque
+from json import dumps, loads
+from os import getpid
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+TRACE_FORMATS = ("jsonl", "chrome")
+TRACE_SIDES = ("client", "server")
+
+
+class Trace:
+    """
+    Trace of a request: A trace id, which is sent with the messages of the
+    request, and the spans of its phases (name, start and end as Unix time in
+    seconds, process id). The names are prefixed by the side of the
+    connection, which recorded the span (e.g. 'client.send'). The server
+    continues the trace of a traced message and sends its spans back in the
+    confirmation and in the responses.
+    """
+
+    __slots__ = ["id", "side", "spans", "_mark"]
+
+    def __init__(
+        self, id_: Optional[str] = None, side: str = "client"
+    ) -> None:
+        """
+        Initializes an object of type 'Trace'.
+
+        Parameters
+        ----------
+        id_ : Optional[str], optional
+            Id of the trace, by default None (a new random id).
+        side : str, optional
+            Side of the connection, which records the spans ('client' or
+            'server'), by default 'client'.
+
+        Raises
+        ------
+        ValueError
+            If the side is invalid.
+        """
+        if side not in TRACE_SIDES:
+            raise ValueError(f"Invalid trace side: {side}")
+        self.id = uuid4().hex if id_ is None else id_
+        self.side = side
+        self.spans: List[list] = []
+        self._mark = time()
+
+    def __repr__(self) -> str:
+        return f"Trace({self.id!r}, {self.side!r})"
+
+    def add(
+        self, name: str, start: float, end: Optional[float] = None
+    ) -> list:
+        """
+        Add a span of this side, an open span (end None) is ended later.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase, without the side.
+        start : float
+            Start as Unix time in seconds.
+        end : Optional[float], optional
+            End as Unix time in seconds, by default None (open).
+
+        Returns
+        -------
+        list
+            The span: name, start, end and process id.
+        """
+        span = [f"{self.side}.{name}", start, end, getpid()]
+        self.spans.append(span)
+        return span
+
+    def lap(self, name: str) -> None:
+        """
+        Add a span from the last lap (or the creation) until now.
+        """
+        now = time()
+        self.add(name, self._mark, now)
+        self._mark = now
+
+    def mark(self) -> None:
+        """
+        Start the next lap now.
+        """
+        self._mark = time()
+
+    def span(self, name: str) -> "_Span":
+        """
+        Context manager, which records a span around its block. The span is
+        open while the block runs.
+        """
+        return _Span(self, name)
+
+    def context(self) -> dict:
+        """
+        Trace context sent with a message: The id and, on the server, the
+        spans recorded so far (open spans end now).
+
+        Returns
+        -------
+        dict
+            The trace id and the spans of the server.
+        """
+        if self.side != "server":
+            return {"id": self.id}
+        now = time()
+        spans = [
+            [name, start, now if end is None else end, pid]
+            for name, start, end, pid in self.spans
+        ]
+        return {"id": self.id, "spans": spans}
+
+    def merge(self, context: dict) -> None:
+        """
+        Add the spans of the remote side from a received trace context,
+        which have not been added before.
+
+        Parameters
+        ----------
+        context : dict
+            Trace context of a received message.
+        """
+        known = {(span[0], span[1]) for span in self.spans}
+        for name, start, end, pid in context.get("spans", []):
+            if name.startswith(self.side + "."):
+                continue
+            if (name, start) in known:
+                self._update(name, start, end)
+            else:
+                self.spans.append([name, start, end, pid])
+
+    def _update(self, name: str, start: float, end: float) -> None:
+
+        # An open span of the remote side was sent again, now ended later
+        for span in self.spans:
+            if span[0] == name and span[1] == start:
+                span[2] = end
+
+    def breakdown(self) -> dict:
+        """
+        Timing breakdown of the request. The phases of the server overlap the
+        phases of the client, in which it waits for the server.
+
+        Returns
+        -------
+        dict
+            The trace 'id', the 'total' time from the first start to the last
+            end and the time in seconds per phase in 'phases'.
+        """
+        now = time()
+        phases: Dict[str, float] = {}
+        starts, ends = [], []
+        for name, start, end, _ in self.spans:
+            end = now if end is None else end
+            phases[name] = phases.get(name, 0.0) + end - start
+            starts.append(start)
+            ends.append(end)
+        total = max(ends) - min(starts) if starts else 0.0
+        return {"id": self.id, "total": total, "phases": phases}
+
+    def to_dict(self) -> dict:
+        """
+        The trace as dict, as written to JSON lines.
+        """
+        return {
+            "id": self.id,
+            "spans": [
+                {"name": name, "start": start, "end": end, "pid": pid}
+                for name, start, end, pid in self.spans
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Trace":
+        """
+        Create a trace from a dict of 'to_dict'.
+        """
+        trace = cls(data["id"])
+        trace.spans = [
+            [span["name"], span["start"], span["end"], span["pid"]]
+            for span in data["spans"]
+        ]
+        return trace
+
+
+class _Span:
+    __slots__ = ["trace", "name", "span"]
+
+    def __init__(self, trace: Trace, name: str) -> None:
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.span = self.trace.add(self.name, time())
+
+    def __exit__(self, *exc) -> None:
+        self.span[2] = time()
+
+
+class _NoSpan:
+    __slots__: List[str] = []
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(trace: Optional[Trace], name: str) -> Any:
+    """
+    Record a span around a block, if the request is traced.
+
+    Parameters
+    ----------
+    trace : Optional[Trace]
+        The trace of the request or None if it is not traced.
+    name : str
+        Name of the phase.
+
+    Returns
+    -------
+    Any
+        A context manager, which does nothing without a trace.
+    """
+    return _NO_SPAN if trace is None else trace.span(name)
+
+
+class Tracer:
+    """
+    Collects the traces of requests: The last 'limit' traces are kept in
+    memory and, if a file is set, every trace is appended to the file as a
+    JSON line. The traces can be exported as JSON lines or in the Chrome
+    trace event format (e.g. for 'chrome://tracing' or Perfetto).
+    """
+
+    __slots__ = ["file", "traces", "_lock"]
+
+    def __init__(
+        self, file: Optional[Path] = None, limit: int = TRACE_LIMIT
+    ) -> None:
+        """
+        Initializes an object of type 'Tracer'.
+
+        Parameters
+        ----------
+        file : Optional[Path], optional
+            File to append the traces to as JSON lines, by default None.
+        limit : int, optional
+            Number of traces kept in memory, by default TRACE_LIMIT.
+
+        Raises
+        ------
+        ValueError
+            If the limit is negative.
+        """
+        if limit < 0:
+            raise ValueError(f"Invalid trace limit: {limit}")
+        self.file = file
+        self.traces: Deque[Trace] = deque(maxlen=limit)
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"Tracer({self.file!r})"
+
+    def __iter__(self) -> Iterator[Trace]:
+        with self._lock:
+            return iter(list(self.traces))
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def record(self, trace: Trace) -> None:
+        """
+        Keep a completed trace and append it to the file.
+        """
+        with self._lock:
+            self.traces.append(trace)
+            if self.file is not None:
+                with open(self.file, "a") as f:
+                    f.write(dumps(trace.to_dict()) + "\n")
+
+    def export(self, file: Path, format: str = "jsonl") -> None:
+        """
+        Write the traces kept in memory to a file.
+
+        Parameters
+        ----------
+        file : Path
+            Path to the file.
+        format : str, optional
+            JSON lines ('jsonl', a trace per line) or the Chrome trace event
+            format ('chrome', a span per event and a thread per trace),
+            by default 'jsonl'.
+
+        Raises
+        ------
+        ValueError
+            If the format is invalid.
+        """
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"Invalid trace format: {format}")
+        traces = list(self)
+        with open(file, "w") as f:
+            if format == "jsonl":
+                for trace in traces:
+                    f.write(dumps(trace.to_dict()) + "\n")
+            else:
+                f.write(dumps(_chrome_events(traces)))
+
+    @classmethod
+    def load(cls, file: Path, limit: int = TRACE_LIMIT) -> "Tracer":
+        """
+        Read the traces from a JSON lines file (e.g. written by a server),
+        for example to export them in the Chrome trace event format.
+
+        Parameters
+        ----------
+        file : Path
+            Path to the file.
+        limit : int, optional
+            Number of traces kept, the last ones of the file,
+            by default TRACE_LIMIT.
+
+        Returns
+        -------
+        Tracer
+            Tracer with the traces of the file, without a file to append to.
+        """
+        tracer = cls(limit=limit)
+        with open(file) as f:
+            for line in f:
+                if line.strip():
+                    tracer.traces.append(Trace.from_dict(loads(line)))
+        return tracer
+
+
+def _chrome_events(traces: List[Trace]) -> dict:
+
+    # Complete events ('X') with timestamps and durations in microseconds
+    events = []
+    for tid, trace in enumerate(traces, 1):
+        for name, start, end, pid in trace.spans:
+            if end is None:
+                continue
+            events.append(
+                {
+                    "name": name,
+                    "cat": name.split(".")[0],
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"trace": trace.id},
+                }
+            )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,277 @@
+from .message import Message, MessageType
+from .tasks import load_tasks
+from inspect import isgenerator
+from pathlib import Path
+from typing import Any, Callable, Generator, List, Optional, Tuple, Union
+
+# State of a worker process of the server
+_exec_task: Optional[Callable] = None
+_init_args: Optional[dict] = None
+
+
+class ResponseBuffer:
+    """
+    Response buffer
+
+    Stands in for the client socket passed to a task, where the connection to
+    the client is not available (e.g. in a worker process). The messages sent
+    by 'respond' are collected and relayed to the client afterwards.
+    """
+
+    __slots__ = ["messages"]
+
+    def __init__(self) -> None:
+        self.messages: List[Message] = []
+
+    def __repr__(self) -> str:
+        return f"ResponseBuffer({self.messages!r})"
+
+    def send(
+        self, msg: Message, await_response: bool = False
+    ) -> Optional[Message]:
+        """
+        Collect a message instead of sending it.
+
+        Parameters
+        ----------
+        msg : Message
+            Message to collect.
+        await_response : bool, optional
+            Ignored, a buffer can not receive responses, by default False.
+
+        Returns
+        -------
+        Optional[Message]
+            Always None.
+        """
+        self.messages.append(msg)
+        return None
+
+
+def stream_task(
+    exec_task: Callable, client_socket: Any, init_args: dict, exec_args: dict
+) -> Generator[Any, None, dict]:
+    """
+    Run the 'exec_task' and yield the items of the task.
+
+    If the task is a generator function (or returns a generator), its items
+    are yielded and the return value of the generator is the new state; if
+    it returns None, the state passed to the task is kept. Otherwise, the
+    return value of the task is the new state and no items are yielded.
+
+    Parameters
+    ----------
+    exec_task : Callable
+        Task to run.
+    client_socket : Any
+        Client socket or response buffer passed to the task.
+    init_args : dict
+        State passed to the task.
+    exec_args : dict
+        Arguments passed to the task.
+
+    Returns
+    -------
+    Generator[Any, None, dict]
+        Generator of the items, which returns the new state.
+    """
+    result = exec_task(client_socket, init_args, exec_args)
+    if not isgenerator(result):
+        return result
+    state = yield from result
+    return init_args if state is None else state
+
+
+def run_task(
+    exec_task: Callable, client_socket: Any, init_args: dict, exec_args: dict
+) -> dict:
+    """
+    Run the 'exec_task' and discard the items, if it yields any (see
+    'stream_task').
+
+    Returns
+    -------
+    dict
+        The new state.
+    """
+    items = stream_task(exec_task, client_socket, init_args, exec_args)
+    while True:
+        try:
+            next(items)
+        except StopIteration as stop:
+            return stop.value
+
+
+def run_batch(
+    exec_task: Callable, init_args: dict, batch: List[dict]
+) -> Tuple[dict, dict]:
+    """
+    Run the 'exec_task' for every item of a batch in order.
+
+    The responses of the task are collected per item: The arguments of the
+    last OK response are the result and the arguments of an ERROR response
+    or a raised exception are the error of the item. A failing item does not
+    stop the batch, the following items operate on the last returned state.
+
+    Parameters
+    ----------
+    exec_task : Callable
+        Task to run for every item.
+    init_args : dict
+        State passed to the first call of the task.
+    batch : List[dict]
+        Arguments of the calls.
+
+    Returns
+    -------
+    Tuple[dict, dict]
+        The new state and the aggregated response with the lists 'results'
+        and 'errors' (None for items without result or error).
+    """
+    results: List[Optional[dict]] = []
+    errors: List[Optional[dict]] = []
+    for exec_args in batch:
+        buffer = ResponseBuffer()
+        result, error = None, None
+        try:
+            init_args = run_task(exec_task, buffer, init_args, exec_args)
+        except Exception as e:
+            error = {"message": f"{type(e).__name__}: {e}"}
+        for msg in buffer.messages:
+            if msg.type is MessageType.ERROR:
+                error = msg.get_args()
+            else:
+                result = msg.get_args()
+        results.append(result)
+        errors.append(error)
+    return init_args, {"results": results, "errors": errors}
+
+
+def result_message(messages: List[Message]) -> Optional[Message]:
+    """
+    Result of a task from the messages sent by 'respond': The last ERROR
+    response or otherwise the last OK response.
+
+    Parameters
+    ----------
+    messages : List[Message]
+        Messages collected from the task.
+
+    Returns
+    -------
+    Optional[Message]
+        The result or None if the task did not respond.
+    """
+    errors = [msg for msg in messages if msg.type is MessageType.ERROR]
+    if errors:
+        return errors[-1]
+    return messages[-1] if messages else None
+
+
+def process_init(tasks: Union[Callable, Path], init_args: dict) -> None:
+    """
+    Initializer of a worker process of the server.
+
+    Parameters
+    ----------
+    tasks : Union[Callable, Path]
+        The 'exec_task' or the path to the file defining it.
+    init_args : dict
+        Initial state of the worker, a copy of the return value of the
+        'init_task'.
+    """
+    global _exec_task, _init_args
+    if isinstance(tasks, Path):
+        _, tasks, _ = load_tasks(tasks)
+    _exec_task = tasks
+    _init_args = init_args
+
+
+def process_exec(exec_args: dict) -> List[Message]:
+    """
+    Run the 'exec_task' on the state of a worker process.
+
+    Parameters
+    ----------
+    exec_args : dict
+        Arguments of the EXEC message.
+
+    Returns
+    -------
+    List[Message]
+        Messages sent by the task using 'respond'.
+    """
+    global _init_args
+    buffer = ResponseBuffer()
+    _init_args = run_task(
+        _exec_task, buffer, _init_args, exec_args  # type: ignore
+    )
+    return buffer.messages
+
+
+def process_batch(batch: List[dict]) -> dict:
+    """
+    Run the 'exec_task' for every item of a batch on the state of a worker
+    process (see 'run_batch').
+
+    Parameters
+    ----------
+    batch : List[dict]
+        Arguments of the calls.
+
+    Returns
+    -------
+    dict
+        Aggregated response with the lists 'results' and 'errors'.
+    """
+    global _init_args
+    _init_args, response = run_batch(
+        _exec_task, _init_args, batch  # type: ignore
+    )
+    return response
+
+
+def process_stream(exec_args: dict, queue: Any, stop: Any) -> List[Message]:
+    """
+    Run the 'exec_task' on the state of a worker process and put the yielded
+    items into a queue as soon as they are produced (see 'stream_task'),
+    followed by the end of the stream. A raised exception is collected as
+    message of type ERROR.
+
+    Parameters
+    ----------
+    exec_args : dict
+        Arguments of the STREAM message.
+    queue : Any
+        Queue shared with the server (e.g. of a 'multiprocessing.Manager'),
+        which receives a pair (True, item) for every item and (False, None)
+        at the end of the stream.
+    stop : Any
+        Event set by the server, if the client closed the stream. The
+        generator of the task is closed and the stream ends.
+
+    Returns
+    -------
+    List[Message]
+        Messages sent by the task using 'respond'.
+    """
+    global _init_args
+    buffer = ResponseBuffer()
+    items = stream_task(
+        _exec_task, buffer, _init_args, exec_args  # type: ignore
+    )
+    try:
+        while not stop.is_set():
+            queue.put((True, next(items)))
+        items.close()
+    except StopIteration as end:
+        _init_args = end.value
+    except Exception as e:
+        buffer.messages.append(
+            Message(
+                MessageType.ERROR, args={"message": f"{type(e).__name__}: {e}"}
+            )
+        )
+    finally:
+        queue.put((False, None))
+    return buffer.messages
@@ -1,5 +1,7 @@
 from ..core.sockets import ClientSocket
 from ..server import respond
+from time import sleep
+from typing import Generator, Union
 
 
 def init_task() -> dict:
@@ -9,12 +11,27 @@ def init_task() -> dict:
 
 def exec_task(
     client_socket: ClientSocket, init_args: dict, exec_args: dict
-) -> dict:
+) -> Union[dict, Generator[int, None, dict]]:
     init_args["request_count"] += 1
     if exec_args["command"] == "increase":
         init_args["value"] += exec_args["value_change"]
     if exec_args["command"] == "decrease":
         init_args["value"] -= exec_args["value_change"]
+    if exec_args["command"] == "get":
+        respond(client_socket, {"value": init_args["value"]})
+    if exec_args["command"] == "sleep":
+        sleep(exec_args["seconds"])
+        respond(client_socket, {"request_count": init_args["request_count"]})
+    if exec_args["command"] == "count":
+        return count_task(init_args, exec_args)
+    return init_args
+
+
+def count_task(
+    init_args: dict, exec_args: dict
+) -> Generator[int, None, dict]:
+    for i in range(exec_args["stop"]):
+        yield init_args["value"] + i
     return init_args
 
 
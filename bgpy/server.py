@@ -1,13 +1,90 @@
-from .core.environment import STARTUP_TIME, LOG_LEVEL
-from .core.log import Log
+from .core.environment import (
+    STARTUP_TIME,
+    STARTUP_TIMEOUT,
+    LOG_LEVEL,
+    LOG_ASYNC,
+    METRICS_PORT,
+    PROFILE_LIMIT,
+    PROFILE_SORT,
+    CONCURRENCY,
+    SERVER_POOL_SIZE,
+    SERVER_WORKERS,
+    STREAM_QUEUE_SIZE,
+    BUFFER_SIZE,
+    JOB_WORKERS,
+    JOB_LIMIT,
+    JOB_TTL,
+    SCHEDULER_QUEUE_SIZE,
+    SCHEDULER_CLIENT_QUEUE_SIZE,
+    SCHEDULER_PRIORITY,
+)
+from .core.handle import ServerHandle
+from .core.jobs import JOB_ACTIONS, Job, JobStore
+from .core.log import Log, LogRotation, stop_listeners
 from .core.message import Message, MessageType
-from .core.sockets import ClientSocket, ServerSocket
+from .core.metrics import Metrics, MetricsEndpoint
+from .core.profiler import PROFILE_ACTIONS, TaskProfiler
+from .core.scheduler import Scheduler, Ticket
+from .core.serialize import negotiate_codec
+from .core.sockets import ClientSocket, ServerSocket, is_local, unix_path
+from .core.tasks import load_tasks
+from .core.tracing import Tracer, span
 from .core.token import token_setenv, token_getenv
-from importlib import util
+from .core.workers import (
+    ResponseBuffer,
+    process_init,
+    process_exec,
+    process_batch,
+    process_stream,
+    result_message,
+    run_batch,
+    run_task,
+    stream_task,
+)
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from os import _exit, close, getpid, kill, pipe, waitpid, write
+from os import name as os_name
 from pathlib import Path
+from queue import Empty, SimpleQueue
+from select import select
+from selectors import DefaultSelector, EVENT_READ
+from signal import SIGTERM, signal
+from socket import socketpair
 from subprocess import Popen
-from time import sleep
-from typing import Optional
+from threading import Lock, Thread, local, current_thread, main_thread
+from time import perf_counter, sleep, time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.managers import SyncManager
+    from multiprocessing.process import BaseProcess
+
+try:
+    from os import fork
+except ImportError:  # pragma: no cover
+    fork = None  # type: ignore
+try:
+    from signal import SIGUSR1
+except ImportError:  # pragma: no cover
+    SIGUSR1 = None  # type: ignore
+
+CONCURRENCY_MODES = ("none", "thread", "process")
+START_MODES = ("thread", "process")
+STATE_POLICIES = ("shared", "worker")
+SCHEDULED_TYPES = (MessageType.EXEC, MessageType.BATCH, MessageType.STREAM)
 
 
 class Server:
@@ -22,8 +99,48 @@ class Server:
         "token",
         "log_level",
         "log_file",
+        "log_async",
+        "log_rotation",
         "init_file",
+        "concurrency",
+        "pool_size",
+        "state",
+        "buffer_size",
+        "workers",
+        "metrics_port",
+        "profile_file",
+        "trace_file",
+        "job_workers",
+        "job_limit",
+        "job_ttl",
+        "queue_size",
+        "client_queue_size",
+        "metrics",
         "log",
+        "_token",
+        "_initialized",
+        "_exited",
+        "_authenticated",
+        "_init_task",
+        "_exec_task",
+        "_exit_task",
+        "_init_args",
+        "_lock",
+        "_local",
+        "_selector",
+        "_threads",
+        "_processes",
+        "_manager",
+        "_ready",
+        "_wakeup",
+        "_pids",
+        "_profiler",
+        "_profile",
+        "_profile_toggled",
+        "_tracer",
+        "_jobs",
+        "_job_threads",
+        "_scheduler",
     ]
 
     def __init__(
@@ -34,6 +151,21 @@ class Server:
         log_level: str = LOG_LEVEL,
         log_file: Optional[Path] = None,
         init_file: Optional[Path] = None,
+        concurrency: str = CONCURRENCY,
+        pool_size: int = SERVER_POOL_SIZE,
+        state: str = "shared",
+        buffer_size: int = BUFFER_SIZE,
+        workers: int = SERVER_WORKERS,
+        log_async: bool = LOG_ASYNC,
+        log_rotation: Optional[LogRotation] = None,
+        metrics_port: Optional[int] = METRICS_PORT,
+        profile_file: Optional[Path] = None,
+        trace_file: Optional[Path] = None,
+        job_workers: int = JOB_WORKERS,
+        job_limit: int = JOB_LIMIT,
+        job_ttl: float = JOB_TTL,
+        queue_size: int = SCHEDULER_QUEUE_SIZE,
+        client_queue_size: int = SCHEDULER_CLIENT_QUEUE_SIZE,
     ) -> None:
         """
         Initializes a object of type 'Server'.
@@ -41,7 +173,8 @@ class Server:
         Parameters
         ----------
         host : str
-            Address of the host to run the server on.
+            Address of the host to run the server on, or 'unix:///path' to
+            listen on a Unix domain socket file.
         port : int
             Port where the server will listen.
         token : str, optional
@@ -51,14 +184,143 @@ class Server:
             by default LOG_LEVEL.
         log_file : Optional[Path], optional
             Path to the file for writing the logs, by default None.
+        init_file : Optional[Path], optional
+            Path to a file containing the 'init_task', 'exec_task' and
+            'exit_task' for the server initialization, by default None.
+        concurrency : str, optional
+            Handle the messages in the main loop ('none'), in a pool of
+            threads ('thread') or in a pool of threads with the 'exec_task'
+            running in a pool of processes ('process'), by default
+            CONCURRENCY.
+        pool_size : int, optional
+            Number of workers in the pool, by default SERVER_POOL_SIZE.
+        state : str, optional
+            Policy for the 'init_args' of concurrent workers: The 'shared'
+            state is passed to every 'exec_task' call, which are serialized
+            by a lock. With 'worker' every worker operates on its own copy of
+            the state returned by the 'init_task' and the 'exec_task' calls
+            run in parallel; the 'exit_task' receives the original state. In
+            the 'process' mode only the 'worker' policy is possible.
+            By default 'shared'.
+        buffer_size : int, optional
+            Maximum number of bytes read from the network buffer at once by
+            the client sockets of the server, by default BUFFER_SIZE.
+        workers : int, optional
+            Number of processes, which are forked after the 'init_task' has
+            run and accept connections on the shared listening socket (POSIX
+            only). The state returned by the 'init_task' is shared copy-on-
+            write, changes by the 'exec_task' are local to a worker. A
+            supervisor restarts workers, which died, from the initial state.
+            Only with the concurrency mode 'none', by default SERVER_WORKERS.
+        log_async : bool, optional
+            Write the logs from a background thread, so the handling of the
+            messages does not wait for the log I/O, by default LOG_ASYNC.
+        log_rotation : Optional[LogRotation], optional
+            Rotation policy of the 'log_file' (size or time-based, number of
+            backups and compression), by default None (the default policy).
+        metrics_port : Optional[int], optional
+            Port of an HTTP endpoint on the host of the server, which serves
+            the metrics in the Prometheus text format on '/metrics' (0
+            chooses a free port). Not supported with several workers, which
+            count their metrics per process, by default METRICS_PORT (no
+            endpoint).
+        profile_file : Optional[Path], optional
+            File for the profile statistics of the 'exec_task' calls, which
+            are written on a PROFILE message with the action 'dump'. If set,
+            the signal SIGUSR1 starts and stops profiling, the statistics are
+            written when profiling is stopped (with several workers, the pid
+            is added to the file name), by default None.
+        trace_file : Optional[Path], optional
+            File to append the traces of traced requests to as JSON lines,
+            with the spans of the server (queue, recv, exec_task, ...),
+            by default None.
+        job_workers : int, optional
+            Number of threads running the jobs submitted by JOB messages
+            (the 'exec_task' runs in the pool of processes in the 'process'
+            mode). The jobs wait in the queue of the requests as one more
+            client and run on the free slots, by default JOB_WORKERS.
+        job_limit : int, optional
+            Maximum number of jobs kept, pending and completed. If all jobs
+            are pending, further jobs are rejected, by default JOB_LIMIT.
+        job_ttl : float, optional
+            Time in seconds, for which the result of a completed job is
+            kept, by default JOB_TTL.
+        queue_size : int, optional
+            Maximum number of EXEC, BATCH and STREAM requests waiting for
+            the 'exec_task'. The waiting request with the highest 'priority'
+            runs next, requests of the same priority are shared fairly
+            between the clients (by the id of a 'Client', otherwise per
+            connection). Requests beyond the
+            limit are rejected with an error, by default
+            SCHEDULER_QUEUE_SIZE.
+        client_queue_size : int, optional
+            Maximum number of pending requests of a client, further
+            requests of the client are rejected with an error, by default
+            SCHEDULER_CLIENT_QUEUE_SIZE.
+
+        Raises
+        ------
+        ValueError
+            If the concurrency mode, pool size, state policy, buffer size,
+            number of workers, a job setting or a queue size is invalid, or
+            the metrics endpoint is set with several workers.
         """
+        if concurrency not in CONCURRENCY_MODES:
+            raise ValueError(f"Invalid concurrency mode: {concurrency}")
+        if state not in STATE_POLICIES:
+            raise ValueError(f"Invalid state policy: {state}")
+        if concurrency == "process" and state == "shared":
+            raise ValueError("Processes can not share state, use 'worker'")
+        if pool_size < 1:
+            raise ValueError(f"Invalid pool size: {pool_size}")
+        if buffer_size < 1:
+            raise ValueError(f"Invalid buffer size: {buffer_size}")
+        if workers < 1:
+            raise ValueError(f"Invalid number of workers: {workers}")
+        if workers > 1 and (concurrency != "none" or fork is None):
+            raise ValueError("Workers require the concurrency mode 'none'")
+        if workers > 1 and metrics_port is not None:
+            raise ValueError("Metrics endpoint requires a single worker")
+        if job_workers < 1:
+            raise ValueError(f"Invalid number of job workers: {job_workers}")
+        self._jobs = JobStore(job_limit, job_ttl)
+        self._scheduler = Scheduler(  # Runs one task at once in the loop or
+            1  # with a shared state
+            if concurrency == "none" or state == "shared"
+            else pool_size,
+            queue_size,
+            client_queue_size,
+        )
         self.host = host
         self.port = port
         self.log_level = log_level
         self.log_file = log_file
         self.token = token
         self.init_file = init_file
-        self.log = Log(__name__, log_level, "Server", log_file, True)
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.state = state
+        self.buffer_size = buffer_size
+        self.workers = workers
+        self.log_async = log_async
+        self.log_rotation = log_rotation
+        self.metrics_port = metrics_port
+        self.profile_file = profile_file
+        self.trace_file = trace_file
+        self.job_workers = job_workers
+        self.job_limit = job_limit
+        self.job_ttl = job_ttl
+        self.queue_size = queue_size
+        self.client_queue_size = client_queue_size
+        self.log = Log(
+            __name__,
+            log_level,
+            "Server",
+            log_file,
+            True,
+            log_async,
+            log_rotation,
+        )
 
     def __repr__(self) -> str:
         return (
@@ -73,183 +335,1105 @@ class Server:
             + f"'{self.host}:{self.port}'"
         )
 
-    def run(self):  # noqa: C901
+    def run(self, ready_fd: Optional[int] = None) -> None:
         """
         Start the main loop of the server.
-        """
 
-        INIT = False
-        EXIT = False
-        TOKEN = token_getenv()
+        The listening socket and all open connections are watched by a
+        selector, so persistent connections of clients can stay open between
+        requests while the server keeps serving other connections. The main
+        loop reads one message of a readable connection: Requests to the
+        'exec_task' wait in the queue of the scheduler and run on a free
+        slot, in the main loop or, if a concurrency mode is set, in a worker
+        of the pool, which returns the connection to the main loop. Other
+        messages are handled at once.
+
+        With several workers, the main loop is forked into the worker
+        processes after the initialization and this process supervises them
+        until a worker exits on an EXIT message.
+
+        Parameters
+        ----------
+        ready_fd : Optional[int], optional
+            File descriptor (e.g. the writing end of a pipe), on which the
+            port (and the port of the metrics endpoint, separated by a space)
+            is written and which is closed as soon as the server is
+            listening and initialized from the 'init_file'. The caller
+            closes the file descriptor, by default None.
+        """
+        self._initialized = False
+        self._exited = False
+        self._authenticated: Dict[ClientSocket, Hashable] = {}  # Clients
+        self._token = self.token if self.token is not None else token_getenv()
+        self._lock = Lock()
+        self._local = local()
+        self._ready: SimpleQueue[ClientSocket] = SimpleQueue()
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._manager: Optional[SyncManager] = None  # Queues of streams
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pids: Dict[int, int] = {}
+        self.metrics = Metrics()
+        self._profiler: Optional[TaskProfiler] = None  # Active profiler
+        self._profile: Optional[TaskProfiler] = None  # Last profile
+        self._profile_toggled = False
+        self._tracer = (  # Traces are only appended to the file
+            None if self.trace_file is None else Tracer(self.trace_file, 0)
+        )
+        if self.profile_file is not None:
+            self._install_profile_signal()
+        if self.concurrency != "none":
+            self._threads = ThreadPoolExecutor(self.pool_size)
+        self._job_threads = ThreadPoolExecutor(self.job_workers)
 
         # Initialize from file
         if self.init_file is not None:
             try:
                 self.log.info(f"Loading tasks from '{self.init_file}'")
-                spec = util.spec_from_file_location(
-                    "bgpy.custom.tasks", self.init_file
-                )
-                tasks = util.module_from_spec(spec)
-                spec.loader.exec_module(tasks)
-                assert callable(tasks.init_task)
-                assert callable(tasks.exec_task)
-                assert callable(tasks.exit_task)
-                init_task = tasks.init_task
-                exec_task = tasks.exec_task
-                exit_task = tasks.exit_task
+                tasks = load_tasks(self.init_file)
             except Exception as e:
                 self.log.exception("Unable to load tasks from file")
                 raise e
+            self._init_task, self._exec_task, self._exit_task = tasks
 
             # Execute INIT task and setup init_args
-            self.log.info("Executing 'init_task'")
-            init_args = init_task()
+            self._initialize()
 
             # Confirm initialization
             self.log.info("Initialization successful")
 
-            # Set INIT to True to avoid second initialization
-            INIT = True
-
         # Start server socket
         with ServerSocket(
             self.host,
             self.port,
             log_level=self.log_level,
             log_file=self.log_file,
-        ) as ss:
+        ) as ss, DefaultSelector() as selector:
 
-            if TOKEN is not None:
+            if self._token is not None:
                 self.log.info("Authentication token is set")
 
-            while not EXIT:
-                sock = ss.accept()
-
-                # Start serverside client socket
-                with ClientSocket(
-                    sock=sock,
-                    log_level=self.log_level,
-                    log_file=self.log_file,
-                ) as cs:
-
-                    AUTH = False
-
-                    while True:
-
-                        # Read messages
-                        msg = cs.recv()
-                        if msg is None:
-                            break
-
-                        # Message type: AUTH
-                        if msg.type is MessageType.AUTH:
-                            token = msg.get_args()["token"]
-                            if token == TOKEN or TOKEN is None:
-
-                                # Set AUTH to True to allow further messages
-                                AUTH = True
-
-                                # Confirm authentication
-                                auth_msg = "Authentication successful"
-                                self.log.info(auth_msg)
-                                respond(
-                                    cs,
-                                    {"message": f"{auth_msg}."},
-                                    error=False,
-                                )
-                            else:
-                                auth_msg = "Invalid client authentication"
-                                self.log.warning(auth_msg)
-                                respond(
-                                    cs, {"message": f"{auth_msg}."}, error=True
-                                )
-                            continue
-
-                        if not AUTH:
-                            self.log.warning(
-                                "Unauthorized access attempt of type "
-                                + f"'{msg.type.name}'"
-                            )
-                            continue
-
-                        # Message type: INIT
-                        if msg.type is MessageType.INIT:
-                            if INIT:
-                                init_msg = "Already initialized"
-                                self.log.warning(init_msg)
-                                respond(
-                                    cs, {"message": f"{init_msg}."}, error=True
-                                )
-                                continue
-
-                            # Extract tasks from INIT message
-                            tasks = msg.get_args()
-                            init_task = tasks["init_task"]
-                            exec_task = tasks["exec_task"]
-                            exit_task = tasks["exit_task"]
-
-                            # Execute INIT task and setup init_args
-                            self.log.info("Executing 'init_task'")
-                            init_args = init_task()
-
-                            # Set INIT to True to avoid second initialization
-                            INIT = True
-
-                            # Confirm initialization
-                            init_msg = "Initialization successful"
-                            self.log.info(init_msg)
-                            respond(
-                                cs, {"message": f"{init_msg}."}, error=False
-                            )
-                            continue
-
-                        # Message type: EXIT
-                        if msg.type is MessageType.EXIT:
-
-                            # Execute exit_task, returns None
-                            if INIT:
-                                self.log.info("Executing 'exit_task'")
-                                _ = exit_task(cs, init_args, msg.get_args())
-
-                            # Set exit to True and trigger exit
-                            EXIT = True
-                            break
-
-                        if not INIT:
-                            self.log.warning("Not yet initialized")
-                            continue
-
-                        # Message type: EXEC
-                        if msg.type is MessageType.EXEC:
-
-                            # Execute exec_task and overwrite init_args
-                            self.log.info("Executing 'exec_task'")
-                            init_args = exec_task(
-                                cs, init_args, msg.get_args()
-                            )
+            wakeup, self._wakeup = socketpair()
+            selector.register(ss.sock, EVENT_READ, ss)
+            selector.register(wakeup, EVENT_READ, wakeup)
+            self._selector = selector
+            if self.workers > 1:
+                ss.sock.setblocking(False)  # Accepted by one of the workers
+            endpoint = self._serve_metrics()
+            if ready_fd is not None:
+                self._notify_ready(ss, ready_fd, endpoint)
+            try:
+                self._loop(ss)
+            finally:
+                self._shutdown()
+                wakeup.close()
+                self._wakeup.close()
+                if endpoint is not None:
+                    endpoint.close()
+
+    def _serve_metrics(self) -> Optional[MetricsEndpoint]:
+        if self.metrics_port is None:
+            return None
+        host = "127.0.0.1" if unix_path(self.host) else self.host
+        endpoint = MetricsEndpoint(host, self.metrics_port, self.metrics)
+        self.metrics_port = endpoint.port  # Chosen port, if 0
+        self.log.info(
+            "Serving metrics on 'http://%s:%s/metrics'", host, endpoint.port
+        )
+        return endpoint
+
+    def _notify_ready(
+        self,
+        ss: ServerSocket,
+        ready_fd: int,
+        endpoint: Optional[MetricsEndpoint],
+    ) -> None:
+
+        # Write the port and, if served, the port of the metrics endpoint
+        port = ss.sock.getsockname()[1] if ss.path is None else self.port
+        ports = f"{port}" if endpoint is None else f"{port} {endpoint.port}"
+        try:
+            write(ready_fd, f"{ports}\n".encode("utf-8"))
+        except OSError:
+            self.log.warning("Unable to notify readiness")
+        self.log.info("Server ready")
+
+    def _loop(self, ss: ServerSocket) -> None:
+        while not self._exited:
+            if self._initialized and self.workers > 1:
+                self._supervise(ss)
+                return
+            for key, _ in self._selector.select():
+                self._on_readable(key.data)
+                if self._exited:
+                    break
+
+    def _supervise(self, ss: ServerSocket) -> None:
+
+        # Fork the workers, the first one keeps the open connections
+        connections = [
+            key.data
+            for key in self._selector.get_map().values()
+            if isinstance(key.data, ClientSocket)
+        ]
+        for index in range(self.workers):
+            self._fork_worker(ss, index, connections if index == 0 else [])
+        for cs in connections:
+            self._selector.unregister(cs.sock)
+            cs.sock.close()  # Without shutdown, the worker is connected
+        self._authenticated.clear()
+
+        # Restart workers, which died, until one exits on an EXIT message
+        try:
+            while self._pids:
+                pid, status = waitpid(-1, 0)
+                if pid not in self._pids:
+                    continue  # Child of a task, not a worker
+                index = self._pids.pop(pid)
+                if status == 0 or self._exited:
+                    self.log.info(f"Worker {index} (pid {pid}) exited")
+                    break
+                self.log.warning(
+                    f"Worker {index} (pid {pid}) died with wait status "
+                    + f"{status}, restarting"
+                )
+                self._fork_worker(ss, index, [])
+        finally:
+            for pid in self._pids:
+                kill(pid, SIGTERM)
+            for pid in list(self._pids):
+                waitpid(pid, 0)
+            self._pids.clear()
+            self._exited = True
+
+    def _fork_worker(
+        self, ss: ServerSocket, index: int, connections: List[ClientSocket]
+    ) -> None:
+        pid = fork()
+        if pid > 0:
+            self._pids[pid] = index
+            self.log.info(f"Worker {index} started (pid {pid})")
+            return
+
+        # Worker: Watch the listening socket and the kept connections with a
+        # selector of its own, the one of the supervisor is shared by fork
+        status = 0
+        try:
+            self.workers = 1  # This process is a worker
+            self._pids = {}
+            self._authenticated = {
+                cs: key
+                for cs, key in self._authenticated.items()
+                if cs in connections
+            }
+            for key in list(self._selector.get_map().values()):
+                if isinstance(key.data, ClientSocket):
+                    if key.data not in connections:
+                        key.data.sock.close()
+            self._selector = DefaultSelector()
+            self._selector.register(ss.sock, EVENT_READ, ss)
+            wakeup, self._wakeup = socketpair()
+            self._selector.register(wakeup, EVENT_READ, wakeup)
+            for cs in connections:
+                self._selector.register(cs.sock, EVENT_READ, cs)
+            self._loop(ss)
+            self._shutdown()
+        except BaseException:
+            self.log.exception(f"Worker {index} failed")
+            status = 1
+        finally:
+            stop_listeners()
+            _exit(status)
+
+    def stop(self) -> None:
+        """
+        Stop the main loop of the server from another thread or a signal
+        handler, without running the 'exit_task'. The open connections are
+        closed and the workers of a pre-forked server are terminated.
+        """
+        self._exited = True
+        for pid in getattr(self, "_pids", {}):
+            kill(pid, SIGTERM)
+        try:
+            self._wakeup.send(b"\0")
+        except (AttributeError, OSError):
+            pass  # Not running
+
+    def _on_readable(self, obj) -> None:
+
+        # Start serverside client socket
+        if isinstance(obj, ServerSocket):
+            try:
+                sock = obj.accept()
+            except BlockingIOError:
+                return  # Accepted by another worker
+            self.metrics.connection_opened()
+            cs = ClientSocket(
+                sock=sock,
+                log_level=self.log_level,
+                log_file=self.log_file,
+                buffer_size=self.buffer_size,
+            )
+            self._selector.register(cs.sock, EVENT_READ, cs)
+
+        # Serve one message, the connection is not watched in the meantime
+        elif isinstance(obj, ClientSocket):
+            self._selector.unregister(obj.sock)
+            self._serve(obj, time())
+
+        else:
+            self._on_wakeup(obj)
+
+    def _on_wakeup(self, wakeup) -> None:
+        wakeup.recv(1024)
+        if self._profile_toggled:
+            self._toggle_profiling()
+
+        # Watch connections again, which were returned by the workers, and
+        # start the next requests on the freed slots
+        while True:
+            try:
+                cs = self._ready.get_nowait()
+            except Empty:
+                break
+            self._selector.register(cs.sock, EVENT_READ, cs)
+        self._dispatch()
+
+    def _serve(self, cs: ClientSocket, queued: Optional[float] = None) -> None:
+
+        # Read messages, close connection if remote is closed
+        start = perf_counter()
+        counters = (cs.bytes_received, cs.bytes_sent, cs.errors_sent)
+        msg = cs.recv(queued, defer=True)
+        if msg is None:
+            self._close(cs)
+            return
+        request = _Request(cs, msg, start, counters)
+
+        # Queue the requests to the 'exec_task' for their turn, handle the
+        # other messages at once
+        if (
+            msg.type in SCHEDULED_TYPES
+            and cs in self._authenticated
+            and self._initialized
+        ):
+            self._admit(request)
+        elif self._run(request, self._handle):
+            self._selector.register(cs.sock, EVENT_READ, cs)
+        self._dispatch()
+
+    def _run(
+        self,
+        request: "_Request",
+        handle: Callable[[ClientSocket, Message], None],
+    ) -> bool:
+
+        # Handle the message, a failure in a worker thread closes the
+        # connection instead of stopping the server
+        try:
+            self._observe(request, handle)
+        except Exception:
+            if self._threads is None:
+                raise
+            self.log.exception("Handling message failed, closing connection")
+            self._close(request.cs)
+            return False
+        return True
+
+    def _observe(
+        self,
+        request: "_Request",
+        handle: Callable[[ClientSocket, Message], None],
+    ) -> None:
+
+        # Handle the message, count it with its latency and the bytes
+        cs, msg = request.cs, request.msg
+        failed = True
+        try:
+            handle(cs, msg)
+            failed = False
+        finally:
+            cs.confirm()  # If deferred and the task has not replied
+            self.metrics.observe_message(
+                msg.type.name,
+                perf_counter() - request.start,
+                failed or cs.errors_sent > request.errors,
+                cs.bytes_received - request.received,
+                cs.bytes_sent - request.sent,
+            )
+            self._record_trace(cs)
+
+    def _record_trace(self, cs: ClientSocket) -> None:
+        if cs.trace is not None:
+            if self._tracer is not None:
+                self._tracer.record(cs.trace)
+            cs.trace = None
+
+    def _close(self, cs: ClientSocket) -> None:
+        self._authenticated.pop(cs, None)
+        cs.close()
+        self.metrics.connection_closed()
+
+    def _shutdown(self) -> None:
+        self._clear_queue()
+        if self._threads is not None:
+            self._threads.shutdown(wait=True)
+        self._job_threads.shutdown(wait=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+        self._close_connections()
+
+    def _clear_queue(self) -> None:
+        for ticket in self._scheduler.clear():  # Waiting requests and jobs
+            if isinstance(ticket[4], _Request):
+                ticket[4].cs.close()
+            else:
+                job, _ = ticket[4]
+                self._jobs.finish(job, error={"message": "Server exited."})
+
+    def _close_connections(self) -> None:
+        for key in list(self._selector.get_map().values()):
+            if isinstance(key.data, ClientSocket):
+                key.data.close()
+        while True:
+            try:
+                self._ready.get_nowait().close()
+            except Empty:
+                break
+
+    def _initialize(self) -> None:
+        self.log.info("Executing 'init_task'")
+        with self.metrics.task("init_task"):
+            self._init_args = self._init_task()
+        if self.concurrency == "process":
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import get_context
+
+            tasks: Union[Callable, Path] = self._exec_task
+            if self.init_file is not None:
+                tasks = Path(self.init_file)  # Loaded by the worker
+            self._processes = ProcessPoolExecutor(
+                self.pool_size,
+                mp_context=get_context("spawn"),
+                initializer=process_init,
+                initargs=(tasks, self._init_args),
+            )
+
+        # Set initialized to True to avoid second initialization
+        self._initialized = True
+
+    def _handle(self, cs: ClientSocket, msg: Message) -> None:
+
+        # Message type: AUTH
+        if msg.type is MessageType.AUTH:
+            self._handle_auth(cs, msg)
+            return
+
+        if cs not in self._authenticated:
+            self.log.warning(
+                "Unauthorized access attempt of type " + f"'{msg.type.name}'"
+            )
+            return
+
+        # Message types: STATS, PROFILE and JOB, also before initialization
+        if msg.type in (
+            MessageType.STATS,
+            MessageType.PROFILE,
+            MessageType.JOB,
+        ):
+            self._handle_control(cs, msg)
+            return
+
+        # Message type: INIT
+        if msg.type is MessageType.INIT:
+            with self._lock:
+                self._handle_init(cs, msg)
+            return
+
+        # Message type: EXIT
+        if msg.type is MessageType.EXIT:
+
+            # Execute exit_task, returns None
+            with self._lock:
+                if self._initialized:
+                    self.log.info("Executing 'exit_task'")
+                    with self.metrics.task("exit_task"):
+                        self._exit_task(cs, self._init_args, msg.get_args())
+
+                # Set exit to True and trigger exit
+                self._exited = True
+            return
+
+        if not self._initialized:
+            self.log.warning("Not yet initialized")
+            self._reject(cs, msg, "Not yet initialized.")
+
+    def _admit(self, request: "_Request") -> None:
+
+        # Queue the request, reject it at once if the queue is full
+        cs, args = request.cs, request.msg.get_args()
+        try:
+            self._scheduler.admit(
+                self._authenticated[cs],
+                request,
+                args.get("priority", SCHEDULER_PRIORITY),
+            )
+        except ValueError as e:
+            self.log.warning("Request rejected: %s", e)
+            message = f"{e}"
+            if self._run(
+                request, lambda cs, msg: self._reject(cs, msg, message)
+            ):
+                self._selector.register(cs.sock, EVENT_READ, cs)
+            return
+        if not args.get("await_result", False):
+            cs.confirm()  # Admitted, the client does not wait for its turn
+
+    def _dispatch(self) -> None:
+
+        # Start the next requests on the free slots, in the main loop or in
+        # the pool of threads, which never queues a request
+        while True:
+            ticket = self._scheduler.next()
+            if ticket is None:
+                return
+            if not isinstance(ticket[4], _Request):
+                self._job_threads.submit(self._run_job, ticket)
+            elif self._threads is not None:
+                self._threads.submit(self._serve_worker, ticket)
+            elif self._run_scheduled(ticket):
+                cs = ticket[4].cs
+                self._selector.register(cs.sock, EVENT_READ, cs)
+
+    def _run_scheduled(self, ticket: Ticket) -> bool:
+        request = ticket[4]
+        trace = request.cs.trace
+        if trace is not None:
+            trace.add("schedule", request.admitted, time())
+        try:
+            return self._run(request, self._handle_task)
+        finally:
+            self._scheduler.release(ticket)
+
+    def _serve_worker(self, ticket: Ticket) -> None:
+        try:
+            if self._run_scheduled(ticket):
+                self._ready.put(ticket[4].cs)
+        finally:
+            self._wakeup.send(b"\0")
+
+    def _handle_task(self, cs: ClientSocket, msg: Message) -> None:
+        with self.metrics.task("exec_task"), span(cs.trace, "exec_task"):
+            self._handle_exec(cs, msg)
+
+    def _reject(self, cs: ClientSocket, msg: Message, message: str) -> None:
+
+        # Reply with an error, as soon as the client is waiting for a reply
+        error_msg = {"message": message}
+        if msg.type is MessageType.STREAM:
+            cs.send_frame(Message(MessageType.ERROR, args=error_msg))
+        elif cs.pending is not None:
+            cs.confirm(Message(MessageType.ERROR, args=error_msg))
+        elif msg.type is MessageType.BATCH or msg.get_args().get(
+            "await_response", False
+        ):
+            respond(cs, error_msg, error=True)
+        else:  # Confirmed on receipt, e.g. on a pipelined connection
+            self.log.warning(
+                "Rejection of request %s dropped, the client does not wait "
+                + "for a reply: %s",
+                msg.id,
+                message,
+            )
+
+    def _handle_exec(self, cs: ClientSocket, msg: Message) -> None:
+        if self._profiler is None:
+            self._dispatch_exec(cs, msg)
+        else:
+            self._profiler.run(self._dispatch_exec, cs, msg)
+
+    def _dispatch_exec(self, cs: ClientSocket, msg: Message) -> None:
+
+        # Message type: EXEC
+        if msg.type is MessageType.EXEC:
+            self.log.info("Executing 'exec_task'")
+            self._execute(cs, msg.get_args())
+
+        # Message type: BATCH
+        elif msg.type is MessageType.BATCH:
+            batch = msg.get_args()["batch"]
+            self.log.info("Executing 'exec_task' for %s items", len(batch))
+            respond(cs, self._execute_batch(batch))
+
+        # Message type: STREAM
+        elif msg.type is MessageType.STREAM:
+            self.log.info("Executing 'exec_task', streaming the items")
+            self._execute_stream(cs, msg.get_args())
+
+    def _execute(self, cs: ClientSocket, exec_args: dict) -> None:
+        if cs.pending is None:
+            self._execute_task(cs, exec_args)
+        else:
+            # Reply once with the result instead of confirming and responding
+            cs.confirm(self._execute_result(exec_args))
+
+    def _execute_result(self, exec_args: dict) -> Optional[Message]:
+
+        # Collect the responses, a raised exception is an error response
+        buffer = ResponseBuffer()
+        try:
+            self._execute_task(buffer, exec_args)
+        except Exception as e:
+            self.log.exception("Executing 'exec_task' failed")
+            buffer.messages.append(
+                Message(
+                    MessageType.ERROR,
+                    args={"message": f"{type(e).__name__}: {e}"},
+                )
+            )
+        return result_message(buffer.messages)
+
+    def _execute_task(self, cs: Any, exec_args: dict) -> None:
+
+        # Run in a worker process and relay the responses
+        if self._processes is not None:
+            future = self._processes.submit(process_exec, exec_args)
+            for res in future.result():
+                cs.send(res)
+            return
+
+        # Execute exec_task and overwrite the init_args
+        self._with_state(
+            lambda init_args: (
+                run_task(self._exec_task, cs, init_args, exec_args),
+                None,
+            )
+        )
+
+    def _execute_batch(self, batch: list) -> dict:
+
+        # Run in a worker process
+        if self._processes is not None:
+            return self._processes.submit(process_batch, batch).result()
+
+        return self._with_state(
+            lambda init_args: run_batch(self._exec_task, init_args, batch)
+        )
+
+    def _execute_stream(self, cs: ClientSocket, exec_args: dict) -> None:
+
+        # Run in a worker process, which queues the items one by one
+        if self._processes is not None:
+            queue, stop = self._stream_queue()
+            future = self._processes.submit(
+                process_stream, exec_args, queue, stop
+            )
+            messages: List[Message] = []
+            self._send_stream(
+                cs, _queued_items(queue, stop, future, messages), messages
+            )
+            return
+
+        def stream(init_args: dict) -> Tuple[dict, None]:
+            buffer = ResponseBuffer()
+            items = stream_task(self._exec_task, buffer, init_args, exec_args)
+            state = self._send_stream(cs, items, buffer.messages)
+            return (init_args if state is None else state), None
+
+        self._with_state(stream)
+
+    def _stream_queue(self) -> Tuple[Any, Any]:
+
+        # Queue and stop event shared with a worker process, by a manager
+        # process started on the first stream
+        with self._lock:
+            if self._manager is None:
+                from multiprocessing import get_context
+
+                self._manager = get_context("spawn").Manager()
+        return (
+            self._manager.Queue(STREAM_QUEUE_SIZE),
+            self._manager.Event(),
+        )
+
+    def _send_stream(
+        self,
+        cs: ClientSocket,
+        items: Generator[Any, None, Optional[dict]],
+        messages: List[Message],
+    ) -> Optional[dict]:
+
+        # Send every item in a frame, the items are not confirmed
+        count = 0
+        state = None
+        try:
+            while True:
+                item = next(items)
+                msg = Message(MessageType.STREAM, args={"item": item})
+                if not cs.send_frame(msg):
+                    self.log.warning("Stream closed by the client")
+                    items.close()
+                    return None
+                count += 1
+        except StopIteration as stop:
+            state = stop.value
+        except Exception as e:
+            self.log.exception("Streaming items failed")
+            messages.append(
+                Message(
+                    MessageType.ERROR,
+                    args={"message": f"{type(e).__name__}: {e}"},
+                )
+            )
+
+        # Mark the end of the stream, with an error response if any
+        errors = [msg for msg in messages if msg.type is MessageType.ERROR]
+        if errors:
+            cs.send_frame(errors[-1])
+        else:
+            cs.send_frame(
+                Message(
+                    MessageType.OK,
+                    args={"message": "End of stream.", "count": count},
+                )
+            )
+        self.log.info("Streamed %s items", count)
+        return state
+
+    def _with_state(self, fn: Callable[[dict], Tuple[dict, Any]]) -> Any:
+
+        # Run on the state of the worker thread
+        if self.state == "worker" and self._threads is not None:
+            if not hasattr(self._local, "init_args"):
+                self._local.init_args = deepcopy(self._init_args)
+            self._local.init_args, result = fn(self._local.init_args)
+            return result
+
+        # Run on the shared init_args, guarded by the lock
+        with self._lock:
+            self._init_args, result = fn(self._init_args)
+        return result
+
+    def _handle_control(self, cs: ClientSocket, msg: Message) -> None:
+        if msg.type is MessageType.STATS:
+            stats = self.metrics.to_dict()
+            stats["scheduler"] = self._scheduler.to_dict()
+            respond(cs, stats)
+            return
+
+        # Message types: PROFILE and JOB
+        args = msg.get_args()
+        try:
+            if msg.type is MessageType.JOB:
+                res = self._control_job(str(args.get("action")), args)
+            else:
+                res = self._control_profiling(
+                    str(args.get("action")),
+                    args.get("sort", PROFILE_SORT),
+                    args.get("limit", PROFILE_LIMIT),
+                )
+        except (ValueError, KeyError) as e:
+            self.log.warning("%s failed: %s", msg.type.name, e)
+            respond(cs, {"message": f"{e}"}, error=True)
+            return
+        respond(cs, res)
+
+    def _control_job(self, action: str, args: dict) -> dict:
+
+        # Submit a job or report its status and result
+        if action not in JOB_ACTIONS:
+            raise ValueError(f"Invalid job action: {action}")
+        if action != "submit":
+            job = self._jobs.get(str(args.get("job")))
+            return job.to_dict(result=action == "result")
+        if not self._initialized:
+            raise ValueError("Not yet initialized.")
+        if self.workers > 1:
+            raise ValueError("Jobs are not supported with several workers")
+        job = self._jobs.submit()
+        exec_args = args.get("exec_args", {})
+        self._scheduler.admit(self._jobs, (job, exec_args), bounded=False)
+        self.log.info("Submitted job '%s'", job.id)
+        return {"message": "Job submitted.", "job": job.id}
+
+    def _run_job(self, ticket: Ticket) -> None:
+
+        # Run on the slot of the job, then start the next request
+        try:
+            self._execute_job(*ticket[4])
+        finally:
+            self._scheduler.release(ticket)
+            self._wakeup.send(b"\0")
+
+    def _execute_job(self, job: Job, exec_args: dict) -> None:
+        if self._exited:
+            self._jobs.finish(job, error={"message": "Server exited."})
+            return
+        self._jobs.start(job)
+        self.log.info("Running job '%s'", job.id)
+        with self.metrics.task("exec_task"):
+            if self._profiler is None:
+                res = self._execute_result(exec_args)
+            else:
+                res = self._profiler.run(self._execute_result, exec_args)
+        if res is not None and res.type is MessageType.ERROR:
+            self._jobs.finish(job, error=res.get_args())
+        else:
+            self._jobs.finish(job, result=None if res is None else res.args)
+        self.log.info("Finished job '%s': %s", job.id, job.state)
+
+    def _control_profiling(self, action: str, sort: str, limit: int) -> dict:
+
+        # Start a new profile, stop it, report or write the statistics
+        if action not in PROFILE_ACTIONS:
+            raise ValueError(f"Invalid profile action: {action}")
+        if action == "start":
+            self._profile = self._profiler = TaskProfiler()
+        elif action == "stop":
+            self._profiler = None
+        profile = self._profile
+        res = {
+            "message": f"Profiling {action} successful.",
+            "enabled": self._profiler is not None,
+            "calls": 0 if profile is None else profile.calls,
+        }
+        self.log.info("Profiling %s, enabled: %s", action, res["enabled"])
+        if action in ("stop", "stats") and profile is not None:
+            res["stats"] = profile.stats(sort, limit)
+        if action == "dump":
+            if self.profile_file is None:
+                raise ValueError("No profile file is set")
+            res["dumped"] = profile is not None and profile.dump(
+                self._profile_path(self.profile_file)
+            )
+        return res
+
+    def _install_profile_signal(self) -> None:
+        if SIGUSR1 is None or current_thread() is not main_thread():
+            self.log.warning("Unable to toggle profiling by a signal")
+            return
+
+        # The signal may interrupt a profiled call, toggle in the main loop
+        def toggle(signum, frame) -> None:
+            self._profile_toggled = True
+            self._wakeup.send(b"\0")
+
+        signal(SIGUSR1, toggle)
+
+    def _toggle_profiling(self) -> None:
+        self._profile_toggled = False
+        if self._profiler is None:
+            self._control_profiling("start", PROFILE_SORT, PROFILE_LIMIT)
+        else:
+            self._control_profiling("stop", PROFILE_SORT, 0)
+            self._control_profiling("dump", PROFILE_SORT, 0)
+
+    def _profile_path(self, file: Path) -> Path:
+        path = Path(file)
+        if self.workers > 1:
+            return path.with_name(f"{path.stem}.{getpid()}{path.suffix}")
+        return path
+
+    def _handle_auth(self, cs: ClientSocket, msg: Message) -> None:
+        token = msg.get_args()["token"]
+        if token == self._token or self._token is None:
+
+            # Allow further messages on this connection
+            self._authenticated[cs] = _client_key(
+                cs, msg.get_args().get("client")
+            )
+
+            # Confirm authentication, switch to the negotiated codec and to
+            # pipelining if requested by the client
+            auth_msg = "Authentication successful"
+            codec = negotiate_codec(
+                msg.get_args().get("codecs", []), local=is_local(cs.sock)
+            )
+            pipeline = bool(msg.get_args().get("pipeline", False))
+            self.log.info("%s, codec '%s'", auth_msg, codec)
+            respond(
+                cs,
+                {
+                    "message": f"{auth_msg}.",
+                    "codec": codec,
+                    "pipeline": pipeline,
+                },
+                error=False,
+            )
+            cs.codec = codec
+            cs.pipelined = pipeline
+        else:
+            auth_msg = "Invalid client authentication"
+            self.log.warning(auth_msg)
+            respond(cs, {"message": f"{auth_msg}."}, error=True)
+
+    def _handle_init(self, cs: ClientSocket, msg: Message) -> None:
+        if self._initialized:
+            init_msg = "Already initialized"
+            self.log.warning(init_msg)
+            respond(cs, {"message": f"{init_msg}."}, error=True)
+            return
+
+        # Extract tasks from INIT message
+        tasks = msg.get_args()
+        self._init_task = tasks["init_task"]
+        self._exec_task = tasks["exec_task"]
+        self._exit_task = tasks["exit_task"]
+
+        # Execute INIT task and setup init_args
+        self._initialize()
+
+        # Confirm initialization
+        init_msg = "Initialization successful"
+        self.log.info(init_msg)
+        respond(cs, {"message": f"{init_msg}."}, error=False)
 
     def run_background(self) -> None:
         """
         Run the server in the background.
 
+        Starts the server in a new process and returns as soon as it is
+        listening and, if an 'init_file' is set, initialized. The new process
+        reports its readiness on a pipe, so startup failures are raised
+        immediately. If the port (or the 'metrics_port') is 0, it is set to the
+        port chosen by the operating system.
+
+        Raises
+        ------
+        RuntimeError
+            If the server exits during the startup (e.g. the port is in use).
+        TimeoutError
+            If the server is not ready after STARTUP_TIMEOUT seconds, the
+            process is killed.
+        """
+        token_setenv(self.token)
+        args = [
+            "bgpy",
+            "server",
+            f"{self.host}",
+            f"{self.port}",
+            f"--log-level={str(self.log_level)}",
+            f"--log-file={str(self.log_file)}",
+            f"--init-file={str(self.init_file)}",
+            f"--concurrency={self.concurrency}",
+            f"--pool-size={self.pool_size}",
+            f"--state={self.state}",
+            f"--buffer-size={self.buffer_size}",
+            f"--workers={self.workers}",
+        ] + self._optional_args()
+        if os_name != "posix":
+            _ = Popen(args)
+            sleep(STARTUP_TIME)
+            return
+
+        # Wait for the port on the readiness pipe or its end (server exited)
+        read_fd, write_fd = pipe()
+        try:
+            process = Popen(
+                args + [f"--ready-fd={write_fd}"], pass_fds=(write_fd,)
+            )
+        finally:
+            close(write_fd)
+        try:
+            ports = _wait_ready(read_fd)
+        except TimeoutError:
+            process.kill()
+            raise
+        if ports is None:
+            code = process.wait()
+            raise RuntimeError(f"Server failed to start, exit code {code}")
+        self._set_ports(ports)
+
+    def _optional_args(self) -> List[str]:
+        args = []
+        if self.log_async:
+            args.append("--log-async")
+        if self.log_rotation is not None:
+            args += _rotation_args(self.log_rotation)
+        if self.metrics_port is not None:
+            args.append(f"--metrics-port={self.metrics_port}")
+        if self.profile_file is not None:
+            args.append(f"--profile-file={self.profile_file}")
+        if self.trace_file is not None:
+            args.append(f"--trace-file={self.trace_file}")
+        args += [
+            f"--job-workers={self.job_workers}",
+            f"--job-limit={self.job_limit}",
+            f"--job-ttl={self.job_ttl}",
+            f"--queue-size={self.queue_size}",
+            f"--client-queue-size={self.client_queue_size}",
+        ]
+        return args
+
+    def start(self, mode: str = "thread") -> ServerHandle:
+        """
+        Start the server from the current interpreter.
+
+        In contrast to 'run_background', no new interpreter is started: The
+        server runs in a daemon thread ('thread') or in a child process
+        forked from the current interpreter ('process', POSIX only). Returns
+        as soon as the server is listening and, if an 'init_file' is set,
+        initialized. If the port (or the 'metrics_port') is 0, it is set to the
+        port chosen by the operating system.
+
+        Parameters
+        ----------
+        mode : str, optional
+            Run the server in a 'thread' or a 'process', by default 'thread'.
+
         Returns
         -------
-        Optional[dict]
-            Response of the server.
+        ServerHandle
+            Handle to get the port of the server, stop and join it.
+
+        Raises
+        ------
+        ValueError
+            If the mode is invalid or processes can not be forked.
+        RuntimeError
+            If the server stops during the startup (e.g. the port is in use).
+        TimeoutError
+            If the server is not ready after STARTUP_TIMEOUT seconds.
         """
-        token_setenv(self.token)
-        _ = Popen(
-            [
-                "bgpy",
-                "server",
-                f"{self.host}",
-                f"{self.port}",
-                f"--log-level={str(self.log_level)}",
-                f"--log-file={str(self.log_file)}",
-                f"--init-file={str(self.init_file)}",
-            ]
-        )
-        sleep(STARTUP_TIME)
+        if mode not in START_MODES or (mode == "process" and fork is None):
+            raise ValueError(f"Invalid start mode: {mode}")
+        read_fd, write_fd = pipe()
+        worker: Union[Thread, BaseProcess]
+        if mode == "thread":
+            worker = Thread(
+                target=self._run_ready, args=(write_fd,), daemon=True
+            )
+            worker.start()
+            stop = self.stop
+        else:
+            from multiprocessing import get_context
+
+            process = get_context("fork").Process(
+                target=self._run_process, args=(write_fd,), daemon=True
+            )
+            process.start()
+            close(write_fd)
+            worker, stop = process, process.terminate
+        try:
+            ports = _wait_ready(read_fd)
+        except TimeoutError:
+            stop()
+            raise
+        if ports is None:
+            worker.join()
+            raise RuntimeError(f"Server failed to start in a {mode}")
+        self._set_ports(ports)
+        return ServerHandle(self.host, self.port, worker, stop)
+
+    def _set_ports(self, ports: List[int]) -> None:
+        self.port = ports[0]
+        if len(ports) > 1:
+            self.metrics_port = ports[1]  # Chosen by the server, if 0
+
+    def _run_ready(self, ready_fd: int) -> None:
+        try:
+            self.run(ready_fd)
+        finally:
+            close(ready_fd)
+
+    def _run_process(self, ready_fd: int) -> None:
+        signal(SIGTERM, lambda signum, frame: self.stop())
+        try:
+            self._run_ready(ready_fd)
+        finally:
+            stop_listeners()  # The process exits without the 'atexit' hooks
+
+
+class _Request:
+    """
+    Message received by the main loop, which is handled at once or queued
+    until its turn, with the counters of the connection for its metrics.
+    """
+
+    __slots__ = [
+        "cs",
+        "msg",
+        "start",
+        "received",
+        "sent",
+        "errors",
+        "admitted",
+    ]
+
+    def __init__(
+        self,
+        cs: ClientSocket,
+        msg: Message,
+        start: float,
+        counters: Tuple[int, int, int],
+    ) -> None:
+        self.cs = cs
+        self.msg = msg
+        self.start = start  # Performance counter, before receiving
+        self.received, self.sent, self.errors = counters
+        self.admitted = time()
+
+    def __repr__(self) -> str:
+        return f"_Request({self.msg!r})"
+
+
+def _client_key(cs: ClientSocket, client: Any) -> Hashable:
+    """
+    Key of the client of a connection for the fair share of the scheduler:
+    The id sent by the client in the AUTH message, which is the same for all
+    connections of a 'Client', or otherwise the connection.
+    """
+    return client if isinstance(client, str) else cs
+
+
+def _queued_items(
+    queue: Any, stop: Any, future: Any, messages: List[Message]
+) -> Generator[Any, None, None]:
+
+    # Items queued by 'process_stream' until the end of the stream, then add
+    # the responses of the task. If closed early, stop the task and drain
+    # the queue, so the worker process is not blocked on a full queue.
+    ended = False
+    try:
+        while True:
+            more, item = queue.get()
+            if not more:
+                ended = True
+                messages.extend(future.result())
+                return
+            yield item
+    finally:
+        if not ended:
+            stop.set()
+            while queue.get()[0]:
+                pass
+            future.result()
+
+
+def _rotation_args(rotation: LogRotation) -> List[str]:
+
+    # Options of the 'bgpy server' command for a log rotation policy
+    args = [
+        f"--log-max-bytes={rotation.max_bytes}",
+        f"--log-backup-count={rotation.backup_count}",
+    ]
+    if rotation.when is not None:
+        args.append(f"--log-when={rotation.when}")
+    if rotation.compress:
+        args.append("--log-compress")
+    return args
+
+
+def _wait_ready(read_fd: int) -> Optional[List[int]]:
+
+    # Read the ports from the readiness pipe, None if it is closed before
+    with open(read_fd, "rb") as ready:
+        readable, _, _ = select([ready], [], [], STARTUP_TIMEOUT)
+        if not readable:
+            raise TimeoutError("Server is not ready")
+        line = ready.readline()
+    return [int(port) for port in line.split()] if line else None
 
 
 def respond(
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+"""Tests for `bgpy.aio` module."""
+
+from bgpy.core.environment import HOST
+from bgpy.aio import AsyncClient, AsyncServer, respond
+from bgpy.core.token import token_create
+from asyncio import Event, gather, run, sleep
+from pathlib import Path
+from time import perf_counter
+
+LOG_FILE = Path("tests/test_async.log")
+LOG_LEVEL = "WARNING"
+TOKEN = token_create()
+N_CLIENTS = 200
+
+
+async def init_task() -> dict:
+    return {"request_count": 0, "value": 1000}
+
+
+async def exec_task(stream, init_args: dict, exec_args: dict) -> dict:
+    init_args["request_count"] += 1
+    await sleep(exec_args.get("delay", 0))
+    if exec_args["command"] == "increase":
+        init_args["value"] += exec_args["value_change"]
+    if exec_args["await_response"]:
+        await respond(stream, {"value": init_args["value"]})
+    return init_args
+
+
+async def exit_task(stream, init_args: dict, exit_args: dict) -> None:
+    init_args["status"] = "Exited."
+    await respond(stream, init_args)
+
+
+async def main() -> dict:
+    server = AsyncServer(
+        HOST, 0, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+    )
+    ready = Event()
+    serving = server.serve(ready)
+    results = await gather(serving, session(server, ready))
+    return results[1]
+
+
+async def session(server: AsyncServer, ready: Event) -> dict:
+    await ready.wait()
+    client = AsyncClient(
+        HOST, server.port, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+    )
+    res: dict = {
+        "init": await client.initialize(init_task, exec_task, exit_task)
+    }
+
+    # Many concurrent clients with slow coroutine tasks
+    start = perf_counter()
+    res["exec"] = await gather(
+        *[
+            client.execute(
+                {"command": "increase", "value_change": 1, "delay": 0.2},
+                await_response=True,
+            )
+            for _ in range(N_CLIENTS)
+        ]
+    )
+    res["duration"] = perf_counter() - start
+    res["get"] = await client.execute({"command": "get"}, True)
+    res["exit"] = await client.terminate(await_response=True)
+    return res
+
+
+res = run(main())
+
+
+def test_async_initialize():
+    assert res["init"]["message"] == "Initialization successful."
+
+
+def test_async_concurrent_execution():
+    assert all(r["value"] > 1000 for r in res["exec"])
+    assert res["duration"] < N_CLIENTS * 0.2 / 4
+
+
+def test_async_terminate():
+    assert res["get"]["value"] == 1000 + N_CLIENTS
+    assert res["exit"]["status"] == "Exited."
+    assert res["exit"]["request_count"] == N_CLIENTS + 1
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""Tests for BATCH messages of the `bgpy.client` and `bgpy.server` modules."""
+
+from bgpy.core.environment import PORT, HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from pathlib import Path
+
+LOG_FILE = Path("tests/test_batch.log")
+LOG_LEVEL = "DEBUG"
+PORT = PORT + 9
+TOKEN = token_create()
+
+# Create server context and start server in background
+server = Server(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+server.run_background()
+
+# Bind client to context
+client = Client(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+
+# Send a batch before the initialization, receive ERROR
+res_batch_uninitialized = client.execute_many([{"command": "get"}])
+
+# Initialize and send many commands in one message
+res_init = client.initialize(init_task, exec_task, exit_task)
+batch = [{"command": "increase", "value_change": 1}] * 1000
+batch += [{"command": "get"}, {"value_change": 1}, {"command": "get"}]
+res_batch = client.execute_many(batch)
+
+# Terminate and wait for response, receive OK with values
+res_exit = client.terminate(await_response=True)
+
+
+def test_batch_uninitialized():
+    assert res_batch_uninitialized["message"] == "Not yet initialized."
+
+
+def test_batch_results():
+    assert res_init["message"] == "Initialization successful."
+    assert len(res_batch["results"]) == len(batch)
+    assert res_batch["results"][:1000] == [None] * 1000
+    assert res_batch["results"][1000] == {"value": 2000}
+    assert res_batch["results"][1002] == {"value": 2000}
+
+
+def test_batch_errors():
+    assert res_batch["errors"][:1001] == [None] * 1001
+    assert res_batch["errors"][1001]["message"] == "KeyError: 'command'"
+
+
+def test_batch_terminate():
+    assert res_exit["request_count"] == 1004
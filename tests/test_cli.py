@@ -4,7 +4,7 @@
 
 from bgpy.core.environment import HOST, PORT, STARTUP_TIME
 from time import sleep
-from subprocess import Popen, check_output
+from subprocess import Popen, check_output, run
 from pathlib import Path
 
 LOG_FILE = Path("tests/test_cli.log")
@@ -48,6 +48,19 @@ def test_cli_terminate():
     assert isinstance(stop, Popen)
 
 
+# The port is required for TCP hosts
+missing_port = [
+    run(["bgpy", command, f"{HOST}"], capture_output=True)
+    for command in ["server", "terminate"]
+]
+
+
+def test_cli_missing_port():
+    for res in missing_port:
+        assert res.returncode == 2
+        assert b"Missing port for a TCP host" in res.stderr
+
+
 # Version
 version = (
     check_output(["bgpy", "version"]).decode("utf-8").strip().split(" ")[1]
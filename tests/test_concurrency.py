@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""Tests for the concurrency modes of the `bgpy.server` module."""
+
+from bgpy.core.environment import PORT, HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import importlib.resources as resources
+import pytest
+
+LOG_FILE = Path("tests/test_concurrency.log")
+LOG_LEVEL = "DEBUG"
+PORT_THREAD = PORT + 5
+PORT_PROCESS = PORT + 6
+TOKEN = token_create()
+with resources.path("bgpy.example", "tasks.py") as file_path:
+    INIT_FILE = str(file_path)
+
+# Start a thread pool server with shared state in the background
+server_thread = Server(
+    host=HOST,
+    port=PORT_THREAD,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    concurrency="thread",
+    pool_size=4,
+    state="shared",
+)
+server_thread.run_background()
+
+# Start a process pool server with state per worker in the background
+server_process = Server(
+    host=HOST,
+    port=PORT_PROCESS,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    concurrency="process",
+    pool_size=2,
+    state="worker",
+)
+server_process.run_background()
+
+# Send concurrent requests from several clients
+client_thread = Client(host=HOST, port=PORT_THREAD, token=TOKEN)
+res_init_thread = client_thread.initialize(init_task, exec_task, exit_task)
+with ThreadPoolExecutor(max_workers=8) as executor:
+    res_exec_thread = list(
+        executor.map(
+            client_thread.execute,
+            [{"command": "increase", "value_change": 1}] * 16,
+        )
+    )
+res_get_thread = client_thread.execute({"command": "get"}, True)
+res_exit_thread = client_thread.terminate(await_response=True)
+
+client_process = Client(host=HOST, port=PORT_PROCESS, token=TOKEN)
+res_init_process = client_process.initialize(init_task, exec_task, exit_task)
+res_get_process = client_process.execute({"command": "get"}, True)
+res_exit_process = client_process.terminate(await_response=True)
+
+# Worker processes load the tasks from an init file given as a string
+server_file = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    init_file=INIT_FILE,  # type: ignore[arg-type]
+    concurrency="process",
+    pool_size=1,
+    state="worker",
+)
+handle_file = server_file.start()
+client_file = Client(host=HOST, port=handle_file.port, token=TOKEN)
+client_file.execute({"command": "increase", "value_change": 5})
+res_get_file = client_file.execute({"command": "get"}, True)
+client_file.terminate()
+handle_file.join(timeout=5)
+
+
+def test_concurrency_thread_shared():
+    assert res_init_thread["message"] == "Initialization successful."
+    assert all(r["message"] == "Received 'EXEC'" for r in res_exec_thread)
+    assert res_get_thread["value"] == 1016
+    assert res_exit_thread["request_count"] == 18
+
+
+def test_concurrency_process_worker():
+    assert res_init_process["message"] == "Initialization successful."
+    assert res_get_process["value"] == 1000
+    assert res_exit_process["request_count"] == 1
+
+
+def test_concurrency_init_file():
+    assert res_get_file["value"] == 1005
+
+
+def test_concurrency_invalid():
+    with pytest.raises(ValueError):
+        Server(HOST, PORT, concurrency="process", state="shared")
+    with pytest.raises(ValueError):
+        Server(HOST, PORT, concurrency="fiber")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""Tests for a server initialized from a file and a JSON client."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.core.token import token_create
+from pathlib import Path
+import importlib.resources as resources
+
+LOG_FILE = Path("tests/test_file_init_json.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+with resources.path("bgpy.example", "tasks.py") as file_path:
+    INIT_FILE = file_path
+
+# Start server initialized from file, use JSON for plain data messages
+server = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    init_file=INIT_FILE,
+)
+handle = server.start()
+client = Client(
+    host=HOST,
+    port=handle.port,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    codec="json",
+)
+
+res_exec = client.execute({"command": "increase", "value_change": 10})
+res_get = client.execute({"command": "get"}, await_response=True)
+res_exit = client.terminate(await_response=True)
+handle.join(timeout=5)
+
+
+def test_file_json_execution():
+    assert client.codec == "json"
+    assert res_exec["message"] == "Received 'EXEC'"
+    assert res_get["value"] == 1010
+
+
+def test_file_json_terminate():
+    assert res_exit["request_count"] == 3
+    assert res_exit["status"] == "Exited."
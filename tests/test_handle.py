@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""Tests for servers started in-process by `bgpy.server.Server.start`."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from pathlib import Path
+from time import perf_counter
+import pytest
+
+LOG_FILE = Path("tests/test_handle.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+MAX_STARTUP_TIME = 0.1
+
+
+def session(mode: str) -> dict:
+    server = Server(
+        host=HOST, port=0, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+    )
+    start = perf_counter()
+    handle = server.start(mode)
+    time_startup = perf_counter() - start
+    client = Client(host=HOST, port=handle.port, token=TOKEN)
+    res_init = client.initialize(init_task, exec_task, exit_task)
+    client.execute({"command": "increase", "value_change": 10})
+    res_get = client.execute({"command": "get"}, await_response=True)
+    handle.stop()
+    handle.join(timeout=5)
+    return {
+        "port": handle.port,
+        "time_startup": time_startup,
+        "res_init": res_init,
+        "res_get": res_get,
+        "alive": handle.is_alive(),
+    }
+
+
+# Start in a daemon thread and in a forked child process on any port
+results = {mode: session(mode) for mode in ["thread", "process"]}
+
+# A terminated server stops the handle as well
+with Server(host=HOST, port=0, token=TOKEN).start() as handle:
+    client = Client(host=HOST, port=handle.port, token=TOKEN)
+    client.initialize(init_task, exec_task, exit_task)
+    res_exit = client.terminate()
+    handle.join(timeout=5)
+    alive_after_exit = handle.is_alive()
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_handle_start(mode):
+    assert results[mode]["port"] > 0
+    assert results[mode]["time_startup"] < MAX_STARTUP_TIME
+    assert results[mode]["res_init"]["message"] == "Initialization successful."
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_handle_stop(mode):
+    assert results[mode]["res_get"]["value"] == 1010
+    assert not results[mode]["alive"]
+
+
+def test_handle_exit():
+    assert res_exit["message"] == "Received 'EXIT'"
+    assert not alive_after_exit
+
+
+def test_handle_invalid_mode():
+    with pytest.raises(ValueError):
+        Server(host=HOST, port=0).start("subprocess")
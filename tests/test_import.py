@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+
+"""Tests for the lazy imports of the `bgpy` package."""
+
+from subprocess import run
+from sys import executable
+import bgpy
+import pytest
+
+
+def imported_modules(statement: str) -> set:
+    output = run(
+        [
+            executable,
+            "-c",
+            f"{statement}; import sys; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return set(output.split())
+
+
+def test_import_lazy():
+    modules = imported_modules("import bgpy")
+    assert "bgpy.client" not in modules
+    assert "bgpy.server" not in modules
+
+
+def test_import_client_only():
+    modules = imported_modules("from bgpy import Client")
+    assert "bgpy.client" in modules
+    assert {"bgpy.server", "bgpy.aio", "asyncio", "typer"}.isdisjoint(modules)
+
+
+def test_import_public_names():
+    for name in bgpy.__all__:
+        assert name in dir(bgpy)
+        assert getattr(bgpy, name) is not None
+    with pytest.raises(AttributeError):
+        bgpy.Unknown
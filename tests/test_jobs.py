@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+
+"""Tests for jobs, which run the `exec_task` in the background."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.jobs import JobStore
+from bgpy.core.token import token_create
+from pathlib import Path
+from pytest import raises
+from time import monotonic, sleep
+
+LOG_FILE = Path("tests/test_jobs.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+GET = {"command": "get"}
+
+server = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    job_limit=3,
+)
+handle = server.start()
+client = Client(host=HOST, port=handle.port, token=TOKEN)
+with raises(RuntimeError, match="Not yet initialized"):
+    client.submit(GET)
+client.initialize(init_task, exec_task, exit_task)
+
+# The first job holds the slot of the 'exec_task', so the next jobs and the
+# EXEC requests are queued, while the server still answers the polling
+job_sleep = client.submit({"command": "sleep", "seconds": 0.5})
+job_failed = client.submit({"command": "increase"})
+job_increase = client.submit({"command": "increase", "value_change": 10})
+status_queued = client.status(job_failed)
+with raises(RuntimeError, match="Job queue is full"):
+    client.submit(GET)
+start = monotonic()
+res_exec = client.execute(GET)
+with raises(TimeoutError):
+    client.result(job_failed, timeout=0.05)
+elapsed = monotonic() - start
+result_sleep = client.result(job_sleep, timeout=5)
+result_failed = client.result(job_failed, timeout=5)
+result_increase = client.result(job_increase, timeout=5)
+
+# Completed jobs are evicted from the full store for new jobs
+job_after = client.submit(GET)
+result_after = client.result(job_after, timeout=5)
+status_evicted = client.status(job_sleep)
+status_unknown = client.status("unknown")
+
+client.terminate()
+handle.join(timeout=5)
+
+
+def test_job_status():
+    assert status_queued["state"] == "queued"
+    assert status_queued["started"] is None
+    assert "result" not in status_queued
+    assert "await_response" not in status_queued
+
+
+def test_job_result():
+    assert result_sleep["state"] == "done"
+    assert result_sleep["result"] == {"request_count": 1}
+    assert result_sleep["submitted"] <= result_sleep["started"]
+    assert result_sleep["started"] <= result_sleep["finished"]
+    assert result_increase["state"] == "done"
+    assert result_increase["result"] is None
+    assert result_after["result"] == {"value": 1010}
+    assert "await_response" not in result_after
+
+
+def test_job_not_blocking():
+    assert res_exec["message"] == "Received 'EXEC'"
+    assert elapsed < 0.4
+
+
+def test_job_failed():
+    assert result_failed["state"] == "failed"
+    assert result_failed["error"] == {"message": "KeyError: 'value_change'"}
+    assert result_failed["result"] is None
+
+
+def test_job_errors():
+    assert status_evicted["message"] == f"Unknown job: {job_sleep}"
+    assert status_unknown["message"] == "Unknown job: unknown"
+
+
+def test_job_store_ttl():
+    store = JobStore(limit=1, ttl=0.01)
+    job = store.submit()
+    with raises(ValueError):
+        store.submit()
+    store.start(job)
+    store.finish(job, result={"value": 1})
+    assert store.get(job.id).state == "done"
+    sleep(0.02)
+    with raises(ValueError):
+        store.get(job.id)
+    assert len(store) == 0
+
+
+def test_job_invalid():
+    with raises(ValueError):
+        JobStore(limit=0)
+    with raises(ValueError):
+        JobStore(ttl=0)
+    with raises(ValueError):
+        Server(HOST, 0, job_workers=0)
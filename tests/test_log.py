@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""Tests for `bgpy.core.log` module."""
+
+from bgpy.core.log import Log, LogRotation
+from gzip import open as gzip_open
+from pathlib import Path
+from time import sleep
+import pytest
+
+LOG_FILE = Path(__file__).parent / "test_log.log"
+TIMED = LogRotation(when="midnight", backup_count=7, compress=True)
+
+
+class Counted:
+    """Counts how often it is formatted."""
+
+    calls = 0
+
+    def __str__(self) -> str:
+        Counted.calls += 1
+        return "counted"
+
+
+# Loggers with the same configuration share the handlers
+log_a = Log("bgpy.test.log", "INFO", "A", LOG_FILE, clear=True)
+handlers = list(log_a.logger.handlers)
+log_b = Log("bgpy.test.log", "INFO", "B", LOG_FILE)
+log_c = Log("bgpy.test.other", "INFO", "C", LOG_FILE)
+
+# Messages are only formatted if the level is enabled
+log_a.debug("Skipped '%s'", Counted())
+calls_skipped = Counted.calls
+log_a.info("Logged '%s'", Counted())
+
+# Asynchronous handlers write from a background thread
+log_async = Log("bgpy.test.log", "INFO", "Async", LOG_FILE, asynchronous=True)
+async_handlers = list(log_async.logger.handlers)
+log_async.info("Written in the background")
+for _ in range(100):
+    if "Written in the background" in LOG_FILE.read_text():
+        break
+    sleep(0.01)
+async_text = LOG_FILE.read_text()
+log_sync = Log("bgpy.test.log", "INFO", "Sync", LOG_FILE, asynchronous=False)
+
+
+def test_shared_handlers():
+    assert log_b.logger.handlers == handlers
+    assert log_c.logger.handlers == handlers
+
+
+def test_lazy_formatting():
+    assert calls_skipped == 0
+    assert Counted.calls > 0
+    assert log_a.is_enabled("INFO")
+    assert not log_a.is_enabled("DEBUG")
+    assert "A - Logged 'counted'" in async_text
+
+
+def test_async():
+    assert len(async_handlers) == 1
+    assert type(async_handlers[0]).__name__ == "QueueHandler"
+    assert "Async - Written in the background" in async_text
+    assert log_sync.logger.handlers == handlers
+
+
+def test_rotation_size(tmp_path):
+    file = tmp_path / "size.log"
+    rotation = LogRotation(max_bytes=200, backup_count=2, compress=True)
+    log = Log("bgpy.test.size", "INFO", file=file, rotation=rotation)
+    for i in range(20):
+        log.info("Message %s with some padding to fill the file", i)
+    log.logger.handlers[2].close()  # Waits for the compression
+    backups = sorted(p.name for p in tmp_path.iterdir())
+    assert backups == ["size.log", "size.log.1.gz", "size.log.2.gz"]
+    with gzip_open(tmp_path / "size.log.1.gz", "rt") as f:
+        assert "Message" in f.read()
+    assert file.stat().st_size <= 200
+
+
+def test_rotation_truncate(tmp_path):
+    file = tmp_path / "truncate.log"
+    rotation = LogRotation(max_bytes=200, backup_count=0)
+    log = Log("bgpy.test.truncate", "INFO", file=file, rotation=rotation)
+    for i in range(20):
+        log.info("Message %s with some padding to fill the file", i)
+    assert [p.name for p in tmp_path.iterdir()] == ["truncate.log"]
+    assert "Message 19" in file.read_text()
+    assert file.stat().st_size <= 200
+
+
+def test_rotation_policy(tmp_path):
+    file = tmp_path / "policy.log"
+    log = Log("bgpy.test.policy", "INFO", file=file)
+    other = Log("bgpy.test.policy.other", "INFO", file=file)
+    assert type(log.logger.handlers[2]).__name__ == "SizeRotatingFileHandler"
+    timed = Log("bgpy.test.policy", "INFO", file=file, rotation=TIMED)
+    for logger in [timed.logger, other.logger]:
+        handler = logger.handlers[2]
+        assert type(handler).__name__ == "TimeRotatingFileHandler"
+    assert Log("bgpy.test.policy", "INFO", file=file).logger.handlers[2] == (
+        handler
+    )
+
+
+def test_rotation_invalid():
+    with pytest.raises(ValueError):
+        LogRotation(max_bytes=-1)
+    with pytest.raises(ValueError):
+        LogRotation(backup_count=-1)
+    with pytest.raises(ValueError):
+        LogRotation(when="weekly")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""Tests for the metrics of the `bgpy.server` module (STATS messages)."""
+
+from bgpy.core.environment import HOST
+from bgpy.core.metrics import Histogram
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import pytest
+
+LOG_FILE = Path("tests/test_metrics.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+
+# Start a server in a thread with a metrics endpoint on a free port
+server = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    metrics_port=0,
+)
+handle = server.start()
+client = Client(
+    host=HOST, port=handle.port, token=TOKEN, log_level=LOG_LEVEL
+)
+
+# Metrics before the initialization, a failing BATCH and some EXEC messages
+res_stats_uninitialized = client.stats()
+client.execute_many([{"command": "get"}])
+client.initialize(init_task, exec_task, exit_task)
+client.execute({"command": "increase", "value_change": 1})
+client.execute({"command": "get"}, await_response=True)
+res_stats = client.stats()
+
+# Scrape the metrics endpoint
+url = f"http://{HOST}:{server.metrics_port}"
+with urlopen(f"{url}/metrics") as response:
+    content_type = response.headers["Content-Type"]
+    prometheus = response.read().decode("utf-8")
+with pytest.raises(HTTPError) as not_found:
+    urlopen(f"{url}/other")
+
+client.terminate()
+handle.join(timeout=5)
+
+# The port of the endpoint of a server in a child process is reported back
+server_process = Server(host=HOST, port=0, token=TOKEN, metrics_port=0)
+handle_process = server_process.start("process")
+url_process = f"http://{HOST}:{server_process.metrics_port}/metrics"
+with urlopen(url_process) as response:
+    status_process = response.status
+handle_process.stop()
+handle_process.join(timeout=5)
+
+
+def test_stats_uninitialized():
+    assert list(res_stats_uninitialized["messages"]) == ["AUTH"]
+    assert res_stats_uninitialized["tasks"]["init_task"]["count"] == 0
+    assert res_stats_uninitialized["connections_active"] == 1
+
+
+def test_stats_messages():
+    messages = res_stats["messages"]
+    assert messages["EXEC"]["count"] == 2
+    assert messages["EXEC"]["errors"] == 0
+    assert messages["BATCH"]["count"] == 1
+    assert messages["BATCH"]["errors"] == 1
+    assert messages["STATS"]["count"] == 1
+    assert messages["AUTH"]["count"] == 6
+    buckets = messages["EXEC"]["buckets"]
+    assert sum(count for _, count in buckets) == 2
+    assert buckets[-1][0] is None
+    assert messages["EXEC"]["sum"] > 0
+
+
+def test_stats_tasks():
+    tasks = res_stats["tasks"]
+    assert tasks["init_task"]["count"] == 1
+    assert tasks["exec_task"]["count"] == 2
+    assert tasks["exit_task"]["count"] == 0
+
+
+def test_stats_connections():
+    assert res_stats["connections_total"] == 6
+    assert res_stats["connections_active"] == 1
+    assert res_stats["bytes_received"] > 0
+    assert res_stats["bytes_sent"] > 0
+
+
+def test_prometheus():
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert 'bgpy_messages_total{type="EXEC"} 2' in prometheus
+    assert 'bgpy_message_errors_total{type="BATCH"} 1' in prometheus
+    assert 'bgpy_task_duration_seconds_count{task="exec_task"} 2' in (
+        prometheus
+    )
+    assert (
+        'bgpy_message_duration_seconds_bucket{type="EXEC",le="+Inf"} 2'
+        in prometheus
+    )
+    assert "# TYPE bgpy_connections_active gauge" in prometheus
+    assert not_found.value.code == 404
+
+
+def test_histogram():
+    histogram = Histogram((0.1, 1.0))
+    for seconds in [0.05, 0.1, 0.5, 2.0]:
+        histogram.observe(seconds)
+    histogram.observe(0.5, error=True)
+    stats = histogram.to_dict()
+    assert stats["count"] == 5
+    assert stats["errors"] == 1
+    assert stats["sum"] == pytest.approx(3.15)
+    assert stats["buckets"] == [(0.1, 2), (1.0, 2), (None, 1)]
+
+
+def test_metrics_process():
+    assert server_process.metrics_port != 0
+    assert status_process == 200
+
+
+def test_metrics_workers():
+    with pytest.raises(ValueError, match="single worker"):
+        Server(HOST, 0, workers=2, metrics_port=0)
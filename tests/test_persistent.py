@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""Tests for persistent connections of the `bgpy.client` module."""
+
+from bgpy.core.environment import PORT, HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+LOG_FILE = Path("tests/test_persistent.log")
+LOG_LEVEL = "DEBUG"
+PORT = PORT + 4
+TOKEN = token_create()
+
+# Create server context
+server = Server(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+
+# Start server in background
+server.run_background()
+
+# Bind client with a pool of two persistent connections to context
+client = Client(
+    host=HOST,
+    port=PORT,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    persistent=True,
+    pool_size=2,
+)
+
+# Send INIT message from client to server, receive OK
+res_init = client.initialize(init_task, exec_task, exit_task)
+
+
+def test_persistent_initialize():
+    assert res_init["message"] == "Initialization successful."
+
+
+# Execute commands from several threads sharing the client
+with ThreadPoolExecutor(max_workers=4) as executor:
+    res_exec = list(
+        executor.map(
+            client.execute,
+            [{"command": "increase", "value_change": 1}] * 8,
+        )
+    )
+
+
+def test_persistent_execution():
+    assert all(res["message"] == "Received 'EXEC'" for res in res_exec)
+
+
+# Terminate and wait for response, receive OK with values
+res_exit = client.terminate(await_response=True)
+
+
+def test_persistent_terminate():
+    assert res_exit["request_count"] == 9
+    assert res_exit["value"] == 1008
+
+
+# Restart the server, the client reconnects on the next request
+server.run_background()
+res_init_reconnect = client.initialize(init_task, exec_task, exit_task)
+res_exit_reconnect = client.terminate(await_response=True)
+client.close()
+
+
+def test_persistent_reconnect():
+    assert res_init_reconnect["message"] == "Initialization successful."
+    assert res_exit_reconnect["request_count"] == 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+"""Tests for pipelined connections of the `bgpy.client` module."""
+
+from bgpy.core.environment import PORT, HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from pathlib import Path
+import pytest
+
+LOG_FILE = Path("tests/test_pipeline.log")
+LOG_LEVEL = "DEBUG"
+PORT = PORT + 8
+TOKEN = token_create()
+
+# Create server context and start server in background
+server = Server(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+server.run_background()
+
+# Bind client to context and initialize server
+client = Client(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+res_init = client.initialize(init_task, exec_task, exit_task)
+
+# Send requests back to back, the responses are matched by request id
+with client.pipeline() as pipe:
+    futures_exec = [
+        pipe.execute({"command": "increase", "value_change": 1})
+        for _ in range(100)
+    ]
+    future_get = pipe.execute({"command": "get"}, await_response=True)
+    futures_exec += [
+        pipe.execute({"command": "decrease", "value_change": 1})
+        for _ in range(10)
+    ]
+    future_get_last = pipe.execute({"command": "get"}, await_response=True)
+res_exec = [future.result() for future in futures_exec]
+res_get = future_get.result()
+res_get_last = future_get_last.result()
+
+# Terminate and wait for response, receive OK with values
+res_exit = client.terminate(await_response=True)
+
+
+def test_pipeline_initialize():
+    assert res_init["message"] == "Initialization successful."
+
+
+def test_pipeline_execution():
+    assert all(res["message"] == "Received 'EXEC'" for res in res_exec)
+
+
+def test_pipeline_response():
+    assert res_get["value"] == 1100
+    assert res_get_last["value"] == 1090
+
+
+def test_pipeline_closed():
+    with pytest.raises(ConnectionError):
+        pipe.execute({"command": "get"})
+
+
+def test_pipeline_terminate():
+    assert res_exit["request_count"] == 113
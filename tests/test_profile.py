@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""Tests for profiling the `exec_task` calls (PROFILE messages)."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.profiler import TaskProfiler
+from bgpy.core.token import token_create
+from os import kill
+from pathlib import Path
+from pstats import Stats
+from signal import SIGUSR1
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import sleep
+
+LOG_FILE = Path("tests/test_profile.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+tmp = TemporaryDirectory()
+PROFILE_FILE = Path(tmp.name) / "exec_task.prof"
+
+# Start a server in a child process, so it can receive signals
+server = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    profile_file=PROFILE_FILE,
+)
+handle = server.start("process")
+client = Client(host=HOST, port=handle.port, token=TOKEN)
+client.initialize(init_task, exec_task, exit_task)
+
+# Profile some calls, stop and dump the statistics
+res_before = client.profile("stats")
+res_start = client.profile("start")
+for _ in range(3):
+    client.execute({"command": "get"}, await_response=True)
+res_stats = client.profile("stats", sort="calls", limit=5)
+res_stop = client.profile("stop")
+client.execute({"command": "get"}, await_response=True)
+res_after = client.profile("stats")
+res_dump = client.profile("dump")
+stats_dumped = Stats(str(PROFILE_FILE))
+res_invalid = client.profile("pause")
+res_invalid_sort = client.profile("stats", sort="unknown")
+
+# Toggle profiling by signals, the statistics are written after stopping
+PROFILE_FILE.unlink()
+kill(handle.pid, SIGUSR1)
+sleep(0.1)
+client.execute({"command": "get"}, await_response=True)
+kill(handle.pid, SIGUSR1)
+for _ in range(100):
+    if PROFILE_FILE.exists():
+        break
+    sleep(0.01)
+res_signal = client.profile("stats")
+stats_signal = Stats(str(PROFILE_FILE))
+
+handle.stop()
+handle.join(timeout=5)
+tmp.cleanup()
+
+
+def test_profile_disabled():
+    assert res_before["enabled"] is False
+    assert res_before["calls"] == 0
+    assert "stats" not in res_before
+
+
+def test_profile_stats():
+    assert res_start["enabled"] is True
+    assert res_stats["calls"] == 3
+    assert "Ordered by: call count" in res_stats["stats"]
+    assert "due to restriction <5>" in res_stats["stats"]
+    assert res_stop["enabled"] is False
+    assert "exec_task" in res_stop["stats"]
+    assert res_after["calls"] == 3
+
+
+def test_profile_dump():
+    assert res_dump["dumped"] is True
+    assert any(key[2] == "exec_task" for key in stats_dumped.stats)
+
+
+def test_profile_invalid():
+    assert res_invalid["message"] == "Invalid profile action: pause"
+    assert "unknown" in res_invalid_sort["message"]
+
+
+def test_profile_signal():
+    assert res_signal["enabled"] is False
+    assert res_signal["calls"] == 1
+    assert any(key[2] == "exec_task" for key in stats_signal.stats)
+
+
+def test_profile_concurrent():
+
+    # One of the concurrent calls is profiled, the other one runs unprofiled
+    profiler = TaskProfiler()
+    results = []
+    threads = [
+        Thread(target=lambda: results.append(profiler.run(sleep, 0.2)))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results == [None, None]
+    assert profiler.calls == 1
+    assert "sleep" in profiler.stats()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+"""Tests for EXEC messages, which are replied once with the result."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.message import Message, MessageType
+from bgpy.core.token import token_create
+from bgpy.core.workers import result_message
+from pathlib import Path
+from pytest import raises
+
+LOG_FILE = Path("tests/test_result.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+
+server = Server(
+    host=HOST, port=0, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+handle = server.start()
+client = Client(
+    host=HOST, port=handle.port, token=TOKEN, log_level=LOG_LEVEL
+)
+res_uninitialized = client.execute({"command": "get"}, await_result=True)
+client.initialize(init_task, exec_task, exit_task)
+
+# Results, a task without response and a failing task
+res_get = client.execute({"command": "get"}, await_result=True)
+res_increase = client.execute(
+    {"command": "increase", "value_change": 10}, await_result=True
+)
+res_failed = client.execute({"command": "increase"}, await_result=True)
+res_after = client.execute({"command": "get"}, await_result=True)
+res_traced = client.execute({"command": "get"}, await_result=True, trace=True)
+
+# The results are also replied on persistent connections
+with Client(
+    host=HOST, port=handle.port, token=TOKEN, persistent=True
+) as persistent:
+    res_persistent = [
+        persistent.execute({"command": "get"}, await_result=True)
+        for _ in range(3)
+    ]
+    res_response = persistent.execute({"command": "get"}, await_response=True)
+
+client.terminate()
+handle.join(timeout=5)
+
+
+def test_result():
+    assert res_get == {"value": 1000}
+    assert res_after["value"] == 1010
+    assert [res["value"] for res in res_persistent] == [1010] * 3
+    assert res_response["value"] == 1010
+
+
+def test_result_without_response():
+    assert res_increase["message"] == "Received 'EXEC'"
+
+
+def test_result_errors():
+    assert res_uninitialized["message"] == "Not yet initialized."
+    assert res_failed["message"] == "KeyError: 'value_change'"
+
+
+def test_result_trace():
+    phases = res_traced["trace"]["phases"]
+    assert res_traced["value"] == 1010
+    assert "server.exec_task" in phases
+    assert "client.response" not in phases
+
+
+def test_result_invalid():
+    with raises(ValueError):
+        client.execute({}, await_response=True, await_result=True)
+
+
+def test_result_message():
+    ok = Message(MessageType.OK, args={"value": 1})
+    error = Message(MessageType.ERROR, args={"message": "failed"})
+    assert result_message([]) is None
+    assert result_message([ok]) is ok
+    assert result_message([error, ok]) is error
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+
+"""Tests for the scheduling of the requests to the `exec_task`."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.scheduler import Scheduler
+from bgpy.core.token import token_create
+from pathlib import Path
+from pytest import raises
+from threading import Thread
+from time import monotonic, sleep
+
+LOG_FILE = Path("tests/test_scheduler.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+GET = {"command": "get"}
+
+
+def sleep_args(seconds: float) -> dict:
+    return {"command": "sleep", "seconds": seconds}
+
+
+def wait_stats(client: Client, running: int, waiting: int) -> dict:
+    """Wait until the scheduler of the server reaches the state."""
+    deadline = monotonic() + 10
+    while monotonic() < deadline:
+        stats = client.stats()["scheduler"]
+        if stats["running"] == running and stats["waiting"] == waiting:
+            return stats
+        sleep(0.01)
+    raise TimeoutError(f"Scheduler not reached: {stats}")
+
+
+def flood(**kwargs) -> dict:
+    """
+    Flood a server, which runs one request at once, with slow requests of
+    several clients and collect the responses.
+    """
+    server = Server(
+        host=HOST,
+        port=0,
+        token=TOKEN,
+        log_level=LOG_LEVEL,
+        log_file=LOG_FILE,
+        queue_size=4,
+        client_queue_size=3,
+        **kwargs,
+    )
+    handle = server.start()
+    clients = {
+        name: Client(host=HOST, port=handle.port, token=TOKEN)
+        for name in ["a", "b", "c", "d"]
+    }
+    res = {"uninitialized": clients["a"].execute(GET, await_response=True)}
+    clients["a"].initialize(init_task, exec_task, exit_task)
+    threads = []
+
+    def send(name: str, key: str, seconds: float, priority: int = 0):
+        def execute() -> None:
+            res[key] = clients[name].execute(
+                sleep_args(seconds), await_result=True, priority=priority
+            )
+
+        threads.append(Thread(target=execute))
+        threads[-1].start()
+
+    # The first request of 'a' runs, its next requests and the ones of the
+    # other clients wait until the queues are full
+    send("a", "running", 0.5)
+    wait_stats(clients["b"], 1, 0)
+    send("a", "a1", 0.01)
+    wait_stats(clients["b"], 1, 1)
+    send("a", "a2", 0.01)
+    wait_stats(clients["b"], 1, 2)
+    res["client_full"] = clients["a"].execute(GET, await_result=True)
+    send("b", "b1", 0.01)
+    wait_stats(clients["b"], 1, 3)
+    send("d", "priority", 0.01, priority=100)
+    res["waiting"] = wait_stats(clients["b"], 1, 4)
+    res["queue_full"] = clients["c"].execute(sleep_args(0.01))
+    res["invalid"] = clients["c"].execute(
+        GET, priority="high"  # type: ignore[arg-type]
+    )
+    for thread in threads:
+        thread.join(timeout=10)
+
+    # A pipelined request is confirmed on receipt, its rejection only logged
+    with clients["c"].pipeline() as pipe:
+        future = pipe.execute({"command": "get", "priority": "high"})
+    res["pipelined"] = future.result()
+    res["stats"] = wait_stats(clients["c"], 0, 0)
+    clients["c"].terminate()
+    handle.join(timeout=10)
+    return res
+
+
+res_thread = flood(concurrency="thread", pool_size=2)
+res_process = flood(concurrency="process", pool_size=1, state="worker")
+
+
+def test_scheduler_reject():
+    for res in [res_thread, res_process]:
+        assert res["client_full"]["message"] == (
+            "Request queue of the client is full (3 requests)"
+        )
+        assert res["queue_full"]["message"] == (
+            "Request queue is full (4 requests)"
+        )
+        assert res["invalid"]["message"] == "Invalid priority: 'high'"
+        assert res["uninitialized"]["message"] == "Not yet initialized."
+        assert res["waiting"]["clients"] == 3
+        assert res["pipelined"]["message"] == "Received 'EXEC'"
+        assert res["stats"]["rejected"] == 2
+        assert res["stats"]["clients"] == 0
+    assert "Rejection of request" in LOG_FILE.read_text()
+
+
+def test_scheduler_order():
+
+    # The request of the highest priority runs first, then 'b' before the
+    # second request of 'a' by the fair share
+    order = ["running", "priority", "a1", "b1", "a2"]
+    for res in [res_thread, res_process]:
+        counts = [res[key]["request_count"] for key in order]
+        assert counts == [1, 2, 3, 4, 5]
+
+
+def test_scheduler_priority():
+    scheduler = Scheduler(slots=1)
+    blocker = scheduler.admit("a")
+    assert scheduler.next() == blocker
+    scheduler.admit("a", "a")
+    scheduler.admit("b", "b", priority=1)
+    scheduler.admit("c", "c", priority=-1)
+    assert scheduler.next() is None
+    scheduler.release(blocker)
+    order = []
+    while True:
+        ticket = scheduler.next()
+        if ticket is None:
+            break
+        order.append(ticket[4])
+        scheduler.release(ticket)
+    assert order == ["b", "a", "c"]
+
+
+def test_scheduler_fair_share():
+    scheduler = Scheduler(slots=2)
+    for key in ["a", "a", "a", "b", "b", "c"]:
+        scheduler.admit(key, key)
+    first, second = scheduler.next(), scheduler.next()
+    assert (first[4], second[4]) == ("a", "b")
+    scheduler.release(first)
+    scheduler.release(second)
+    order = []
+    while True:
+        ticket = scheduler.next()
+        if ticket is None:
+            break
+        order.append(ticket[4])
+        scheduler.release(ticket)
+    assert order == ["c", "a", "b", "a"]
+    assert scheduler.to_dict()["clients"] == 0
+
+
+def test_scheduler_limits():
+    scheduler = Scheduler(slots=1, queue_size=2, client_queue_size=2)
+    scheduler.admit("a")
+    scheduler.next()
+    scheduler.admit("a")
+    with raises(ValueError, match="queue of the client is full"):
+        scheduler.admit("a")
+    scheduler.admit("b")
+    with raises(ValueError, match="Request queue is full"):
+        scheduler.admit("c")
+    scheduler.admit("c", bounded=False)
+    assert scheduler.to_dict() == {
+        "slots": 1,
+        "running": 1,
+        "waiting": 3,
+        "clients": 3,
+        "rejected": 2,
+    }
+    assert [ticket[3] for ticket in scheduler.clear()] == ["a", "b", "c"]
+    assert scheduler.to_dict()["clients"] == 1
+
+
+def test_scheduler_invalid():
+    with raises(ValueError):
+        Scheduler(slots=0)
+    with raises(ValueError):
+        Scheduler(queue_size=-1)
+    with raises(ValueError):
+        Scheduler(client_queue_size=0)
+    with raises(ValueError):
+        Server(HOST, 0, queue_size=-1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""Tests for `bgpy.core.serialize` module."""
+
+from bgpy.core.environment import SHM_THRESHOLD
+from bgpy.core.message import Message, MessageType
+from bgpy.core.serialize import (
+    CODECS,
+    get_codec,
+    negotiate_codec,
+    release_segment,
+    serialize,
+    deserialize,
+)
+from bgpy.example.tasks import exec_task
+from pathlib import Path
+import pytest
+
+ARGS = {"command": "increase", "value_change": 10, "values": [1.5, None]}
+
+
+@pytest.mark.parametrize("codec", list(CODECS))
+def test_serialize_round_trip(codec):
+    msg = deserialize(serialize(Message(MessageType.EXEC, ARGS), codec))
+    assert msg.type is MessageType.EXEC
+    assert msg.get_args() == ARGS
+
+
+def test_serialize_pickle_binary():
+    msg = Message(MessageType.EXEC, ARGS)
+    assert len(serialize(msg, "pickle")) < len(serialize(msg, "base64"))
+
+
+def test_serialize_json_fallback():
+    data = serialize(Message(MessageType.INIT, {"task": exec_task}), "json")
+    assert data[:1] == get_codec("pickle").tag
+    assert deserialize(data).get_args()["task"] is exec_task
+
+
+def test_serialize_json_keys():
+    args = {"values": [{1: "a", (2, 3): "b"}]}
+    data = serialize(Message(MessageType.EXEC, args), "json")
+    assert data[:1] == get_codec("pickle").tag
+    assert deserialize(data).get_args() == args
+
+
+def test_serialize_negotiate():
+    assert negotiate_codec(["msgpack", "json"]) == "json"
+    assert negotiate_codec([]) == "base64"
+    with pytest.raises(ValueError):
+        get_codec("msgpack")
+
+
+def shm_segments() -> set:
+    return {path.name for path in Path("/dev/shm").glob("psm_*")}
+
+
+@pytest.mark.skipif("shm" not in CODECS, reason="No shared memory")
+def test_serialize_shm():
+    before = shm_segments()
+    args = {"payload": bytes(SHM_THRESHOLD)}
+    data = serialize(Message(MessageType.EXEC, args), "shm")
+    assert data[:1] == get_codec("shm").tag
+    assert len(data) < 100
+    assert len(shm_segments() - before) == 1
+    assert deserialize(data).get_args() == args
+    assert shm_segments() == before
+
+    # Small messages are pickled, unreceived segments can be released
+    small = serialize(Message(MessageType.EXEC, ARGS), "shm")
+    assert small[:1] == get_codec("pickle").tag
+    release_segment(serialize(Message(MessageType.EXEC, args), "shm"))
+    assert shm_segments() == before
+
+
+def test_serialize_negotiate_shm():
+    assert negotiate_codec(["shm", "pickle"]) == "pickle"
+    if "shm" in CODECS:
+        assert negotiate_codec(["shm", "pickle"], local=True) == "shm"
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+"""Tests for the shared memory transport ('shm' codec)."""
+
+from bgpy.core.environment import PORT, HOST, SHM_THRESHOLD
+from bgpy.core.serialize import CODECS
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from pathlib import Path
+import pytest
+
+LOG_FILE = Path("tests/test_shm.log")
+LOG_LEVEL = "DEBUG"
+PORT = PORT + 12
+TOKEN = token_create()
+PAYLOAD = bytes(range(256)) * (SHM_THRESHOLD // 128)
+
+pytestmark = pytest.mark.skipif("shm" not in CODECS, reason="No shared memory")
+
+
+def shm_segments() -> set:
+    return {path.name for path in Path("/dev/shm").glob("psm_*")}
+
+
+segments_before = shm_segments()
+
+# Create server context and start server in background
+server = Server(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+server.run_background()
+
+# Bind client to context with the shared memory codec
+client = Client(
+    host=HOST,
+    port=PORT,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    codec="shm",
+)
+res_init = client.initialize(init_task, exec_task, exit_task)
+
+# Negotiated codec of a connection
+cs = client._connect()
+res_auth = client._authenticate(cs)
+cs.close()
+
+# Large arguments are passed through shared memory
+res_exec = client.execute(
+    {"command": "increase", "value_change": 10, "payload": PAYLOAD}
+)
+res_get = client.execute({"command": "get"}, await_response=True)
+
+# Batch results in shared memory, items of a stream via the socket
+res_batch = client.execute_many(
+    [{"command": "increase", "value_change": 1, "payload": PAYLOAD}] * 3
+)
+res_stream = list(client.execute_stream({"command": "count", "stop": 3}))
+res_exit = client.terminate()
+segments_after = shm_segments()
+
+
+def test_shm_negotiation():
+    assert res_auth.get_args()["codec"] == "shm"
+
+
+def test_shm_exec():
+    assert res_exec["message"] == "Received 'EXEC'"
+    assert res_get["value"] == 1010
+
+
+def test_shm_batch():
+    assert len(res_batch["results"]) == 3
+    assert res_batch["errors"] == [None] * 3
+
+
+def test_shm_stream():
+    assert res_stream == [1013, 1014, 1015]
+
+
+def test_shm_segments_released():
+    assert segments_after == segments_before
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""Tests for `bgpy.core.sockets` module."""
+
+from bgpy.core.message import Message, MessageType
+from bgpy.core.sockets import ClientSocket
+from bgpy.server import respond
+from pickle import PickleBuffer
+from socket import socket
+from threading import Thread
+import pytest
+
+LOG_LEVEL = "WARNING"
+CODEC = "pickle"
+BUFFER_SIZE = 1000  # Not a divisor of the message sizes
+
+
+def echo_server(listener: socket) -> None:
+    sock, _ = listener.accept()
+    with ClientSocket(
+        sock=sock, log_level=LOG_LEVEL, buffer_size=BUFFER_SIZE, codec=CODEC
+    ) as remote:
+        while True:
+            msg = remote.recv()
+            if msg is None:
+                return
+            if msg.get_args()["await_response"]:
+                respond(remote, msg.get_args())
+
+
+# Start a remote client socket, which echoes all messages
+listener = socket()
+listener.bind(("127.0.0.1", 0))
+listener.listen(1)
+thread = Thread(target=echo_server, args=(listener,), daemon=True)
+thread.start()
+
+with ClientSocket(
+    log_level=LOG_LEVEL, buffer_size=BUFFER_SIZE, codec=CODEC
+) as cs:
+    cs.connect(*listener.getsockname())
+
+    # Confirmation of a small message
+    res_small = cs.send(Message(MessageType.EXEC, args={"value": 1}))
+
+    # Message spanning many chunks of the network buffer, echoed back
+    payload = bytes(range(256)) * 4096
+    res_large = cs.send(
+        Message(MessageType.EXEC, args={"payload": payload}),
+        await_response=True,
+    )
+
+    # Out-of-band buffer, received into a preallocated bytearray
+    blob = bytearray(payload)
+    res_oob = cs.send(
+        Message(MessageType.EXEC, args={"blob": PickleBuffer(blob)}),
+        await_response=True,
+    )
+thread.join()
+listener.close()
+
+
+def test_sockets_confirmation():
+    assert res_small.get_args()["message"] == "Received 'EXEC'"
+
+
+def test_sockets_large_message():
+    assert res_large.get_args()["payload"] == payload
+
+
+def test_sockets_out_of_band_buffer():
+    assert isinstance(res_oob.get_args()["blob"], bytearray)
+    assert res_oob.get_args()["blob"] == blob
+
+
+def test_sockets_invalid_buffer_size():
+    with pytest.raises(ValueError):
+        ClientSocket(buffer_size=0)
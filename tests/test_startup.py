@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""Tests for the readiness signal of the `bgpy.server` module."""
+
+from bgpy.core.environment import PORT, HOST, STARTUP_TIME
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from pathlib import Path
+from time import perf_counter
+
+LOG_FILE = Path("tests/test_startup.log")
+LOG_LEVEL = "DEBUG"
+PORT = PORT + 14
+TOKEN = token_create()
+
+# Start server in background, returns as soon as the server is listening
+server = Server(
+    host=HOST, port=PORT, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+start = perf_counter()
+server.run_background()
+time_startup = perf_counter() - start
+
+# A second server on the same port fails immediately
+server_conflict = Server(host=HOST, port=PORT, token=TOKEN)
+error_conflict = None
+start = perf_counter()
+try:
+    server_conflict.run_background()
+except RuntimeError as e:
+    error_conflict = e
+time_conflict = perf_counter() - start
+
+# Server on a port chosen by the operating system
+server_any = Server(host=HOST, port=0, token=TOKEN)
+server_any.run_background()
+
+# Requests and termination without waiting for a fixed time
+client = Client(host=HOST, port=PORT, token=TOKEN)
+res_init = client.initialize(init_task, exec_task, exit_task)
+start = perf_counter()
+res_exit = client.terminate()
+time_exit = perf_counter() - start
+client_any = Client(host=HOST, port=server_any.port, token=TOKEN)
+res_init_any = client_any.initialize(init_task, exec_task, exit_task)
+res_exit_any = client_any.terminate()
+
+
+def test_startup_ready():
+    assert time_startup < STARTUP_TIME
+    assert res_init["message"] == "Initialization successful."
+
+
+def test_startup_failure():
+    assert "exit code 1" in str(error_conflict)
+    assert time_conflict < STARTUP_TIME
+
+
+def test_startup_any_port():
+    assert server_any.port > 0
+    assert res_init_any["message"] == "Initialization successful."
+
+
+def test_startup_terminate():
+    assert res_exit["message"] == "Received 'EXIT'"
+    assert time_exit < STARTUP_TIME
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+"""Tests for streamed responses of the `bgpy.client` module."""
+
+from bgpy.core.environment import PORT, HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from itertools import islice
+from pathlib import Path
+import pytest
+
+LOG_FILE = Path("tests/test_stream.log")
+LOG_LEVEL = "DEBUG"
+PORT_NONE = PORT + 10
+PORT_PROCESS = PORT + 11
+TOKEN = token_create()
+
+# Start a server and a process pool server in background
+server = Server(
+    host=HOST,
+    port=PORT_NONE,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+)
+server.run_background()
+server_process = Server(
+    host=HOST,
+    port=PORT_PROCESS,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    concurrency="process",
+    pool_size=1,
+    state="worker",
+)
+server_process.run_background()
+
+# Bind clients to context and initialize servers
+client = Client(
+    host=HOST,
+    port=PORT_NONE,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+)
+client_process = Client(
+    host=HOST,
+    port=PORT_PROCESS,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+)
+
+# Stream before initialization, raises an error
+with pytest.raises(RuntimeError, match="Not yet initialized"):
+    list(client.execute_stream({"command": "count", "stop": 3}))
+
+res_init = client.initialize(init_task, exec_task, exit_task)
+res_init_process = client_process.initialize(init_task, exec_task, exit_task)
+
+# Consume the items of a stream incrementally, stop after the first items
+res_stream = list(client.execute_stream({"command": "count", "stop": 5}))
+res_stream_large = sum(
+    client.execute_stream({"command": "count", "stop": 10_000})
+)
+res_stream_partial = list(
+    islice(client.execute_stream({"command": "count", "stop": 10_000}), 3)
+)
+
+# Stream of a task without generator
+res_stream_empty = list(client.execute_stream({"command": "get"}))
+
+# Generator drained when executed without stream
+res_exec = client.execute({"command": "count", "stop": 5})
+res_get = client.execute({"command": "get"}, await_response=True)
+
+# Task raising an exception
+with pytest.raises(RuntimeError, match="KeyError"):
+    list(client.execute_stream({"command": "count"}))
+
+# Stream from a worker process
+res_stream_process = list(
+    client_process.execute_stream({"command": "count", "stop": 5})
+)
+res_stream_process_partial = list(
+    islice(
+        client_process.execute_stream(
+            {"command": "count", "stop": 1_000_000_000}
+        ),
+        3,
+    )
+)
+res_stream_process_after = list(
+    client_process.execute_stream({"command": "count", "stop": 2})
+)
+
+# Terminate and wait for response, receive OK with values
+res_exit = client.terminate(await_response=True)
+res_exit_process = client_process.terminate(await_response=True)
+
+
+def test_stream_items():
+    assert res_init["message"] == "Initialization successful."
+    assert res_stream == [1000, 1001, 1002, 1003, 1004]
+    assert res_stream_large == 10_000 * 1000 + sum(range(10_000))
+    assert res_stream_partial == [1000, 1001, 1002]
+    assert res_stream_empty == []
+
+
+def test_stream_drained():
+    assert res_exec["message"] == "Received 'EXEC'"
+    assert res_get["value"] == 1000
+
+
+def test_stream_process():
+    assert res_init_process["message"] == "Initialization successful."
+    assert res_stream_process == [1000, 1001, 1002, 1003, 1004]
+    assert res_stream_process_partial == [1000, 1001, 1002]
+    assert res_stream_process_after == [1000, 1001]
+
+
+def test_stream_terminate():
+    assert res_exit["request_count"] == 8
+    assert res_exit_process["request_count"] == 1
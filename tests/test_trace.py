@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+"""Tests for tracing requests with per-phase timing."""
+
+from bgpy.core.environment import HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.message import Message, MessageType
+from bgpy.core.serialize import serialize, deserialize
+from bgpy.core.token import token_create
+from bgpy.core.tracing import Trace, Tracer
+from json import loads
+from pathlib import Path
+from pytest import raises
+from tempfile import TemporaryDirectory
+
+LOG_FILE = Path("tests/test_trace.log")
+LOG_LEVEL = "DEBUG"
+TOKEN = token_create()
+tmp = TemporaryDirectory()
+TRACE_FILE = Path(tmp.name) / "server.jsonl"
+
+server = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    concurrency="thread",
+    trace_file=TRACE_FILE,
+)
+handle = server.start()
+client = Client(host=HOST, port=handle.port, token=TOKEN)
+client.initialize(init_task, exec_task, exit_task)
+
+# Trace single requests, awaiting the response and not
+res_await = client.execute(
+    {"command": "get"}, await_response=True, trace=True
+)
+res_confirm = client.execute(
+    {"command": "increase", "value_change": 1}, trace=True
+)
+res_untraced = client.execute({"command": "get"}, await_response=True)
+
+# Collect the traces of all requests of a persistent client
+tracer = Tracer()
+traced = Client(
+    host=HOST, port=handle.port, token=TOKEN, persistent=True, tracer=tracer
+)
+for _ in range(3):
+    traced.execute({"command": "get"}, await_response=True)
+traced.close()
+tracer.export(Path(tmp.name) / "client.jsonl")
+tracer.export(Path(tmp.name) / "client.json", format="chrome")
+traces_jsonl = Tracer.load(Path(tmp.name) / "client.jsonl")
+with open(Path(tmp.name) / "client.json") as f:
+    chrome = loads(f.read())
+
+client.terminate()
+handle.join(timeout=5)
+traces_server = Tracer.load(TRACE_FILE)
+tmp.cleanup()
+
+
+def test_trace_breakdown():
+    phases = res_await["trace"]["phases"]
+    assert res_await["value"] == 1000
+    for name in [
+        "client.connect",
+        "client.auth",
+        "client.serialize",
+        "client.send",
+        "client.confirm",
+        "client.response",
+        "server.queue",
+        "server.recv",
+        "server.exec_task",
+    ]:
+        assert phases[name] >= 0
+    assert res_await["trace"]["total"] >= phases["client.response"]
+
+
+def test_trace_confirmation():
+    phases = res_confirm["trace"]["phases"]
+    assert "server.recv" in phases
+    assert "server.exec_task" not in phases
+    assert "client.response" not in phases
+    assert "trace" not in res_untraced
+
+
+def test_trace_tracer():
+    assert len(tracer) == 3
+    first = list(tracer)[0].breakdown()["phases"]
+    second = list(tracer)[1].breakdown()["phases"]
+    assert "client.connect" in first
+    assert "client.connect" not in second
+    assert [t.id for t in traces_jsonl] == [t.id for t in tracer]
+
+
+def test_trace_chrome():
+    events = chrome["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    assert {event["tid"] for event in events} == {1, 2, 3}
+    assert any(event["name"] == "server.exec_task" for event in events)
+
+
+def test_trace_server_file():
+    ids = {t.id for t in traces_server}
+    assert res_await["trace"]["id"] in ids
+    assert {t.id for t in tracer} <= ids
+    spans = [span[0] for t in traces_server for span in t.spans]
+    assert all(name.startswith("server.") for name in spans)
+
+
+def test_trace_message():
+    msg = Message(MessageType.EXEC, args={}, trace={"id": "abc"})
+    for codec in ["pickle", "json"]:
+        assert deserialize(serialize(msg, codec)).trace == {"id": "abc"}
+    untraced = Message(MessageType.EXEC, args={})
+    assert untraced.__reduce__()[1] == (MessageType.EXEC, {})
+
+
+def test_trace_merge():
+    trace = Trace("abc")
+    remote = Trace("abc", side="server")
+    with remote.span("exec_task"):
+        trace.merge(remote.context())
+    trace.merge(remote.context())
+    assert len(trace.spans) == 1
+    assert trace.spans[0][2] == remote.spans[0][2]
+
+
+def test_trace_invalid():
+    with raises(ValueError):
+        Trace(side="proxy")
+    with raises(ValueError):
+        Tracer(limit=-1)
+    with raises(ValueError):
+        tracer.export(Path("unused"), format="csv")
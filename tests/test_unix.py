@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+"""Tests for the Unix domain socket transport."""
+
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.aio import AsyncClient, AsyncServer
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from asyncio import Event, gather, run
+from os import getpid
+from pathlib import Path
+from stat import S_IMODE
+from subprocess import run as run_process
+from tempfile import gettempdir
+from time import sleep
+from typing import Optional
+
+LOG_FILE = Path("tests/test_unix.log")
+LOG_LEVEL = "DEBUG"
+PATH = Path(gettempdir()) / f"bgpy-test-{getpid()}.sock"
+HOST = f"unix://{PATH}"
+TOKEN = token_create()
+
+# Start server on a socket file in background
+server = Server(
+    host=HOST, port=0, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+server.run_background()
+mode = S_IMODE(PATH.stat().st_mode)
+
+# Bind client to context
+client = Client(
+    host=HOST, port=0, token=TOKEN, log_level=LOG_LEVEL, log_file=LOG_FILE
+)
+
+# Initialize, execute and get the value
+res_init = client.initialize(init_task, exec_task, exit_task)
+res_exec = client.execute({"command": "increase", "value_change": 10})
+res_get = client.execute({"command": "get"}, await_response=True)
+
+# Terminate using the CLI, with the token set in the environment
+res_cli = run_process(
+    ["bgpy", "terminate", HOST, f"--log-level={LOG_LEVEL}"], timeout=30
+)
+sleep(1)
+exists_after_exit = PATH.exists()
+
+
+# Serve coroutine clients on the same socket file
+def async_exit_task(stream, init_args: dict, exit_args: dict) -> None:
+    return None
+
+
+async def async_session() -> Optional[dict]:
+    async_server = AsyncServer(HOST, 0, token=TOKEN, log_level=LOG_LEVEL)
+    async_client = AsyncClient(HOST, 0, token=TOKEN, log_level=LOG_LEVEL)
+    ready = Event()
+
+    async def requests() -> Optional[dict]:
+        await ready.wait()
+        await async_client.initialize(init_task, exec_task, async_exit_task)
+        await gather(
+            *[
+                async_client.execute(
+                    {"command": "increase", "value_change": 1}
+                )
+                for _ in range(10)
+            ]
+        )
+        return await async_client.terminate()
+
+    results = await gather(async_server.serve(ready), requests())
+    return results[1]
+
+
+res_async = run(async_session())
+exists_after_async_exit = PATH.exists()
+
+
+def test_unix_socket_file():
+    assert mode == 0o600
+    assert not exists_after_exit
+
+
+def test_unix_client_server():
+    assert res_init["message"] == "Initialization successful."
+    assert res_exec["message"] == "Received 'EXEC'"
+    assert res_get["value"] == 1010
+
+
+def test_unix_cli():
+    assert res_cli.returncode == 0
+
+
+def test_unix_async():
+    assert res_async["message"] == "Received 'EXIT'"
+    assert not exists_after_async_exit
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""Tests for the pre-forked workers of the `bgpy.server` module."""
+
+from bgpy.core.environment import PORT, HOST
+from bgpy.client import Client
+from bgpy.server import Server
+from bgpy.example.tasks import init_task, exec_task, exit_task
+from bgpy.core.token import token_create
+from concurrent.futures import ThreadPoolExecutor
+from os import kill
+from pathlib import Path
+from re import findall
+from signal import SIGKILL
+from tempfile import mkdtemp
+from time import sleep
+import pytest
+
+LOG_FILE = Path("tests/test_workers.log")
+LOG_LEVEL = "DEBUG"
+PORT = PORT + 13
+TOKEN = token_create()
+WORKERS = 3
+CHILD_TASKS = '''
+from bgpy.example.tasks import exec_task, exit_task
+from subprocess import Popen
+
+children = []
+
+
+def init_task():
+    children.append(Popen(["sleep", "0.2"]))
+    return {"request_count": 0, "value": 1000}
+'''
+
+
+def worker_pids() -> dict:
+    pattern = r"Worker (\d+) started \(pid (\d+)\)"
+    started = findall(pattern, LOG_FILE.read_text())
+    return {int(index): int(pid) for index, pid in started}
+
+
+def is_running(pid: int) -> bool:
+    try:
+        kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+# Start a server with pre-forked workers in the background
+server = Server(
+    host=HOST,
+    port=PORT,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    workers=WORKERS,
+)
+server.run_background()
+
+# The workers are forked after the initialization
+client = Client(host=HOST, port=PORT, token=TOKEN)
+res_init = client.initialize(init_task, exec_task, exit_task)
+sleep(0.5)
+pids_init = worker_pids()
+
+# Connections are accepted by all workers, each has its own state
+with ThreadPoolExecutor(max_workers=8) as executor:
+    res_exec = list(
+        executor.map(
+            lambda _: client.execute(
+                {"command": "increase", "value_change": 1}
+            ),
+            range(60),
+        )
+    )
+
+# A killed worker is restarted by the supervisor
+kill(pids_init[1], SIGKILL)
+sleep(1)
+pids_restart = worker_pids()
+res_get = [
+    client.execute({"command": "get"}, await_response=True)
+    for _ in range(10)
+]
+
+# Exit on one worker stops the other workers
+res_exit = client.terminate()
+sleep(1)
+running_after_exit = [pid for pid in pids_restart.values() if is_running(pid)]
+
+# A child process of a task exits in the supervisor, the workers keep running
+init_file = Path(mkdtemp()) / "tasks.py"
+init_file.write_text(CHILD_TASKS)
+server_child = Server(
+    host=HOST,
+    port=0,
+    token=TOKEN,
+    log_level=LOG_LEVEL,
+    log_file=LOG_FILE,
+    init_file=init_file,
+    workers=2,
+)
+server_child.run_background()
+sleep(0.5)
+client_child = Client(host=HOST, port=server_child.port, token=TOKEN)
+res_child = client_child.execute({"command": "get"}, await_response=True)
+client_child.terminate()
+
+
+def test_workers_started():
+    assert res_init["message"] == "Initialization successful."
+    assert len(pids_init) == WORKERS
+
+
+def test_workers_exec():
+    assert all(res["message"] == "Received 'EXEC'" for res in res_exec)
+
+
+def test_workers_restart():
+    assert pids_restart[1] != pids_init[1]
+    assert pids_restart[0] == pids_init[0]
+    assert all(res["value"] >= 1000 for res in res_get)
+
+
+def test_workers_exit():
+    assert running_after_exit == []
+
+
+def test_workers_child_process():
+    assert res_child["value"] == 1000
+
+
+def test_workers_invalid():
+    with pytest.raises(ValueError):
+        Server(host=HOST, port=PORT, workers=0)
+    with pytest.raises(ValueError):
+        Server(host=HOST, port=PORT, workers=2, concurrency="thread")